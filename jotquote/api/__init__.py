@@ -2,6 +2,8 @@
 #  This file is licensed under the terms of the MIT License.  See the LICENSE
 # file in the root of this repository for complete details.
 
+import importlib
+
 from jotquote.api.config import (
     APP_NAME,
     CONFIG_FILE,
@@ -9,6 +11,7 @@ from jotquote.api.config import (
     SECTION_LINT,
     SECTION_WEB,
     get_config,
+    get_config_dir,
     get_filename,
 )
 from jotquote.api.exceptions import (
@@ -20,15 +23,23 @@ from jotquote.api.exceptions import (
     QuoteValidationError,
     StorageError,
 )
-from jotquote.api.lint import ALL_CHECKS, LintIssue, apply_fixes, lint_quotes
 from jotquote.api.quote import (
     INVALID_CHARS,
     INVALID_CHARS_QUOTE,
+    LazyQuote,
     Quote,
+    compute_hashes,
     parse_quote,
     parse_tags,
 )
-from jotquote.api.selection import get_first_match, get_random_choice
+from jotquote.api.selection import (
+    get_channel_choice,
+    get_channel_random_choice,
+    get_first_match,
+    get_random_choice,
+    get_rotation_choice,
+    get_star_weighted_choice,
+)
 from jotquote.api.store import (
     add_quote,
     add_quotes,
@@ -36,48 +47,129 @@ from jotquote.api.store import (
     get_sha256,
     parse_quotes,
     read_quotes,
+    read_quotes_lazy,
     read_quotes_with_hash,
     read_tags,
+    restore_backup,
     set_quote,
     settags,
     write_quotes,
 )
 
+# Names re-exported from modules that only some commands need.  They are
+# imported on first use by __getattr__ below so that starting the CLI does not
+# pay for the lint checks, schedules, similarity search, backups or QuoteTable.
+_LAZY_NAMES = {
+    'Backup': 'backup',
+    'list_backups': 'backup',
+    'ALL_CHECKS': 'lint',
+    'DEFAULT_CHECKS': 'lint',
+    'LintIssue': 'lint',
+    'apply_fixes': 'lint',
+    'available_checks': 'lint',
+    'get_near_duplicate_settings': 'lint',
+    'iter_lint_issues': 'lint',
+    'lint_quotes': 'lint',
+    'read_lint_cache': 'lint',
+    'write_lint_cache': 'lint',
+    'write_near_duplicate_signatures': 'lint',
+    'SCHEDULE_FORMATS': 'schedule',
+    'ScheduleEntry': 'schedule',
+    'build_schedule': 'schedule',
+    'get_quote_date': 'schedule',
+    'is_entry_current': 'schedule',
+    'load_resolver': 'schedule',
+    'load_schedule': 'schedule',
+    'write_schedule': 'schedule',
+    'NearDuplicate': 'similarity',
+    'find_author_variants': 'similarity',
+    'find_near_duplicates': 'similarity',
+    'read_signatures': 'similarity',
+    'write_signatures': 'similarity',
+    'QuoteTable': 'table',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_NAMES.get(name)
+    if module is None:
+        raise AttributeError('module {0!r} has no attribute {1!r}'.format(__name__, name))
+    value = getattr(importlib.import_module('jotquote.api.' + module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_NAMES))
+
+
 __all__ = [
     'ALL_CHECKS',
     'APP_NAME',
     'ApiException',
+    'Backup',
     'CONFIG_FILE',
     'ConcurrentModificationError',
     'ConfigError',
+    'DEFAULT_CHECKS',
     'DuplicateQuoteError',
     'INVALID_CHARS',
     'INVALID_CHARS_QUOTE',
+    'LazyQuote',
     'LintIssue',
+    'NearDuplicate',
     'Quote',
     'QuoteNotFoundError',
+    'QuoteTable',
     'QuoteValidationError',
+    'SCHEDULE_FORMATS',
     'SECTION_GENERAL',
     'SECTION_LINT',
     'SECTION_WEB',
+    'ScheduleEntry',
     'StorageError',
     'add_quote',
     'add_quotes',
     'apply_fixes',
+    'available_checks',
+    'build_schedule',
+    'compute_hashes',
+    'find_author_variants',
+    'find_near_duplicates',
     'format_quote',
+    'get_channel_choice',
+    'get_channel_random_choice',
     'get_config',
+    'get_config_dir',
     'get_filename',
     'get_first_match',
+    'get_near_duplicate_settings',
+    'get_quote_date',
     'get_random_choice',
+    'get_rotation_choice',
     'get_sha256',
+    'get_star_weighted_choice',
+    'is_entry_current',
+    'iter_lint_issues',
     'lint_quotes',
+    'list_backups',
+    'load_resolver',
+    'load_schedule',
     'parse_quote',
     'parse_quotes',
     'parse_tags',
+    'read_lint_cache',
     'read_quotes',
+    'read_quotes_lazy',
     'read_quotes_with_hash',
+    'read_signatures',
     'read_tags',
+    'restore_backup',
     'set_quote',
     'settags',
+    'write_lint_cache',
+    'write_near_duplicate_signatures',
     'write_quotes',
+    'write_schedule',
+    'write_signatures',
 ]
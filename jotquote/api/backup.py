@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+#  This file is licensed under the terms of the MIT License.  See the LICENSE
+# file in the root of this repository for complete details.
+
+import os
+import shutil
+from dataclasses import dataclass
+
+from jotquote.api import config as _config
+from jotquote.api.exceptions import ConfigError, StorageError
+
+# Number of backup generations kept when backup_count is not set in settings.conf.
+DEFAULT_BACKUP_COUNT = 5
+
+
+@dataclass
+class Backup:
+    """A single backup generation of a quote file.
+
+    Attributes:
+        generation (int): 1 for the most recent backup, 2 for the one before
+            it, and so on.
+        path (str): Absolute path of the backup file.
+        mtime (float): Modification time of the backup, in seconds since the
+            epoch.  Because backups are hardlinks to the replaced file, this
+            is the time the backed-up content was last written.
+        size (int): Size of the backup file in bytes.
+    """
+
+    generation: int
+    path: str
+    mtime: float
+    size: int
+
+
+def list_backups(quote_path):
+    """Return the backup generations that exist for the given quote file.
+
+    Args:
+        quote_path (str): Path to the quote file whose backups to list.  The
+            quote file itself does not need to exist.
+
+    Returns:
+        list[Backup]: Existing backups ordered from newest (generation 1) to
+            oldest.
+    """
+    backups = []
+    for generation, path in _existing_generations(quote_path):
+        stat = os.stat(path)
+        backups.append(Backup(generation=generation, path=path, mtime=stat.st_mtime, size=stat.st_size))
+    return backups
+
+
+def get_backup(quote_path, generation):
+    """Return the :class:`Backup` with the given generation number.
+
+    Args:
+        quote_path (str): Path to the quote file whose backup to find.
+        generation (int): Backup generation, 1 being the most recent.
+
+    Returns:
+        Backup: The matching backup.
+
+    Raises:
+        StorageError: If no backup with that generation exists.
+    """
+    for backup in list_backups(quote_path):
+        if backup.generation == generation:
+            return backup
+    raise StorageError("no backup generation {0} exists for the quote file '{1}'.".format(generation, quote_path))
+
+
+def rotate_backups(quote_path, count):
+    """Shift existing backups down one generation and back up ``quote_path``.
+
+    Older generations are renamed (``.bak`` -> ``.bak.2`` -> ``.bak.3`` ...)
+    and the oldest is dropped once ``count`` generations exist.  The current
+    quote file then becomes generation 1 via a hardlink, which copies no data:
+    :func:`jotquote.api.write_quotes` swaps in a new inode with
+    ``os.replace`` and never writes to the old one, so the linked content
+    stays frozen.  On filesystems that do not support hardlinks the file is
+    copied instead.
+
+    Args:
+        quote_path (str): Path to the quote file about to be replaced.
+        count (int): Number of generations to keep.  ``0`` disables backups.
+    """
+    if count <= 0:
+        return
+
+    # Drop every generation that would fall off the end after the shift
+    for generation, path in _existing_generations(quote_path):
+        if generation >= count:
+            os.remove(path)
+
+    for generation in range(count - 1, 0, -1):
+        path = _backup_path(quote_path, generation)
+        if os.path.exists(path):
+            os.replace(path, _backup_path(quote_path, generation + 1))
+
+    _link_or_copy(quote_path, _backup_path(quote_path, 1))
+
+
+def get_backup_count():
+    """Return the number of backup generations to keep, from ``[general] backup_count``.
+
+    Returns:
+        int: The configured count, or :data:`DEFAULT_BACKUP_COUNT` if unset.
+
+    Raises:
+        ConfigError: If the property is not a non-negative integer.
+    """
+    config = _config.get_config()
+    raw = config.get(_config.SECTION_GENERAL, 'backup_count', fallback='')
+    if not raw or not raw.strip():
+        return DEFAULT_BACKUP_COUNT
+    try:
+        count = int(raw)
+    except ValueError:
+        count = -1
+    if count < 0:
+        raise ConfigError(
+            "the value '{0}' is not valid value for the backup_count property."
+            '  The value must be zero or a positive integer.'.format(raw)
+        )
+    return count
+
+
+def _backup_path(quote_path, generation):
+    """Return the path of the given backup generation for ``quote_path``.
+
+    Generation 1 keeps the historical ``.<name>.jotquote.bak`` name so
+    existing tooling that looks for it still finds the latest backup.
+    """
+    parent_path = os.path.abspath(os.path.join(quote_path, os.pardir))
+    backup_file = '.' + os.path.basename(quote_path) + '.jotquote.bak'
+    if generation > 1:
+        backup_file += '.' + str(generation)
+    return os.path.join(parent_path, backup_file)
+
+
+def _existing_generations(quote_path):
+    """Return ``(generation, path)`` for each backup on disk, newest first."""
+    parent_path = os.path.abspath(os.path.join(quote_path, os.pardir))
+    prefix = '.' + os.path.basename(quote_path) + '.jotquote.bak'
+    try:
+        names = os.listdir(parent_path)
+    except OSError:
+        return []
+
+    found = []
+    for name in names:
+        if name == prefix:
+            found.append((1, os.path.join(parent_path, name)))
+        elif name.startswith(prefix + '.'):
+            suffix = name[len(prefix) + 1 :]
+            if suffix.isdigit() and int(suffix) > 1:
+                found.append((int(suffix), os.path.join(parent_path, name)))
+    return sorted(found)
+
+
+def _link_or_copy(source, target):
+    """Hardlink ``source`` to ``target``, falling back to a copy if links are unsupported."""
+    if os.path.exists(target):
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except (OSError, NotImplementedError, AttributeError):
+        try:
+            shutil.copy2(source, target)
+        except OSError as e:
+            raise StorageError("unable to create backup file '{0}': {1}".format(target, e)) from e
@@ -57,6 +57,8 @@ _WEB_KEYS = frozenset(
 # single-section layout.
 _KNOWN_GENERAL_KEYS = frozenset(
     {
+        'backup_count',
+        'durability',
         'quote_file',
         'line_separator',
         'show_author_count',
@@ -69,6 +71,8 @@ _KNOWN_LINT_KEYS = frozenset(
         'enabled_checks',
         'lint_on_add',
         'max_quote_length',
+        'near_duplicate_threshold',
+        'spelling_word_list',
     }
 )
 
@@ -79,6 +83,10 @@ _KNOWN_WEB_KEYS = frozenset(
         'about_content_provider_extension',
         'header_provider_extension',
         'quote_resolver_extension',
+        'random_weighting',
+        'rotation_scope',
+        'rotation_state_file',
+        'schedule_file',
         'port',
         'ip',
         'editor_port',
@@ -117,7 +125,7 @@ def get_config():
             section of the loaded config file.
     """
     config_file = os.environ.get('JOTQUOTE_CONFIG') or CONFIG_FILE
-    config_dir = os.path.dirname(os.path.abspath(config_file))
+    config_dir = get_config_dir()
 
     if not os.path.exists(config_file):
         os.makedirs(config_dir, exist_ok=True)
@@ -169,15 +177,27 @@ def get_config():
     # Add lint defaults in memory if not present. Lazy-imported to avoid the
     # import cycle (lint imports this module for SECTION_LINT).
     if not config.has_option(SECTION_LINT, 'enabled_checks'):
-        from jotquote.api.lint import ALL_CHECKS as _ALL_CHECKS
+        from jotquote.api.lint import DEFAULT_CHECKS as _DEFAULT_CHECKS
 
-        config[SECTION_LINT]['enabled_checks'] = ', '.join(sorted(_ALL_CHECKS))
+        config[SECTION_LINT]['enabled_checks'] = ', '.join(sorted(_DEFAULT_CHECKS))
 
     _warn_unknown_keys(config)
 
     return config
 
 
+def get_config_dir():
+    """Return the directory containing settings.conf.
+
+    The settings file is located as in :func:`get_config`; files that
+    jotquote keeps beside it, like the lint cache, go in this directory.
+
+    Returns:
+        str: Absolute path of the settings.conf directory.
+    """
+    return os.path.dirname(os.path.abspath(os.environ.get('JOTQUOTE_CONFIG') or CONFIG_FILE))
+
+
 def get_filename():
     """Return the resolved quote file path from the loaded config.
 
@@ -260,7 +280,10 @@ def _resolve_config_paths(config, config_dir):
     """Resolve relative path values in config in-place, relative to config_dir."""
     path_lookups = [
         (SECTION_GENERAL, 'quote_file'),
+        (SECTION_LINT, 'spelling_word_list'),
         (SECTION_WEB, 'favicon_file'),
+        (SECTION_WEB, 'schedule_file'),
+        (SECTION_WEB, 'rotation_state_file'),
     ]
     for section, key in path_lookups:
         if config.has_option(section, key):
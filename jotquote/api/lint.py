@@ -2,11 +2,26 @@
 #  This file is licensed under the terms of the MIT License.  See the LICENSE
 # file in the root of this repository for complete details.
 
+import collections
+import configparser
+import contextlib
+import dataclasses
+import functools
+import hashlib
+import importlib.metadata
+import itertools
+import marshal
+import math
+import operator
+import os
 import re
-from dataclasses import dataclass
+import threading
+from array import array
 from typing import ClassVar, Optional
 
 from jotquote.api import config as _config
+from jotquote.api.exceptions import ConfigError, StorageError
+from jotquote.api.quote import Quote, _shared_tags, compute_hashes
 
 # Smart/typographic quote characters and their ASCII replacements
 _SMART_QUOTE_CHARS = '‘’“”‹›«»'
@@ -34,6 +49,9 @@ _SMART_DASH_MAP = str.maketrans(_SMART_DASH_CHARS, '-' * len(_SMART_DASH_CHARS))
 # Unicode horizontal ellipsis (U+2026); auto-fixed to three ASCII periods.
 _UNICODE_ELLIPSIS = '…'
 
+# Runs of two or more spaces; auto-fixed to a single space.
+_MULTIPLE_SPACES_RE = re.compile(r'  +')
+
 # Trailing closing-punctuation characters that are stripped before checking for
 # terminal punctuation (e.g. a quote ending in `."` is considered terminated).
 _TRAILING_CLOSE_CHARS = '"\'”’)]'
@@ -42,8 +60,34 @@ _END_PUNCTUATION = '.!?'
 # Fields a per-quote check may attach issues to.
 _TEXT_FIELDS = ('quote', 'author', 'publication')
 
+# Smallest number of quotes worth sending to a worker process, and the
+# number of chunks per worker, so that a slow chunk does not hold up the rest.
+_MIN_CHUNK_QUOTES = 5000
+_CHUNKS_PER_WORKER = 4
+
+# Number of quotes checked at a time in this process, so that issues are ready before the whole file is checked.
+_BATCH_QUOTES = 1000
+
+# Version of the lint cache layout; part of every fingerprint, so a change discards old results.
+_CACHE_FORMAT = 2
+
+# First line of a lint cache file, which tells it apart from other files before it is unmarshalled
+_LINT_CACHE_HEADER = 'jotquote-lint {0}\n'.format(_CACHE_FORMAT).encode('ascii')
+
+# Words for the spelling check: runs of letters, with apostrophes inside words such as "don't"
+_WORD_RE = re.compile(r"[^\W\d_]+(?:['\u2019][^\W\d_]+)*")
+
+# First line of a spelling word cache file, before the word list's size and modification time
+_WORD_CACHE_HEADER = 'jotquote-words 1'
+
+# Number of tokens, and of words, the spelling check remembers the answers for before starting over
+_WORD_MEMO_LIMIT = 1 << 16
+
+# Similarity reported by the near-duplicate check when near_duplicate_threshold is not set
+_NEAR_DUPLICATE_THRESHOLD = 0.7
+
 
-@dataclass
+@dataclasses.dataclass
 class LintIssue:
     """A single lint finding attached to a specific quote.
 
@@ -73,37 +117,467 @@ class LintIssue:
     fix_value: Optional[str] = None
 
 
-def lint_quotes(quotes, checks, config):
+def lint_quotes(quotes, checks, config, workers=None, cache=None):
     """Run the enabled lint checks against a list of quotes.
 
     Args:
         quotes (list[Quote]): The quotes to check.
-        checks (Iterable[str]): Names of the checks to run.  Unknown names
-            are silently ignored.
+        checks (Iterable[str]): Names of the checks to run.  A check
+            installed as a plugin is imported the first time it is named
+            here.  Unknown names are silently ignored.
         config (configparser.ConfigParser): Application config.  Used to
             look up per-check configuration in the ``[lint]`` section.
+        workers (int | None): Number of worker processes to spread the
+            per-quote checks over; ``0`` uses one per CPU.  ``None`` or
+            ``1`` runs every check in this process, as does a quote list too
+            short to be worth splitting.  File-scope checks always run once,
+            in this process.  The issues returned are the same either way.
+        cache (dict | None): Results to reuse, from an earlier call given
+            the same dict or from :func:`read_lint_cache`.  A quote is only
+            checked again when its fields, the checks or their versions, or
+            the ``[lint]`` settings have changed since; file-scope checks run
+            again whenever any quote or line number has changed.  The dict is
+            updated in place to hold the results for ``quotes``.
 
     Returns:
         list[LintIssue]: All issues found, in the order produced by the
             checks.
+
+    Raises:
+        ConfigError: If a plugin check cannot be loaded.
     """
-    lint_cfg = config[_config.SECTION_LINT]
+    selected = [check_obj for check_obj in map(_get_check, checks) if check_obj is not None]
+    found = {check_obj: [] for check_obj in selected}
+    for _, block in _iter_found(quotes, selected, config, workers, cache):
+        for check_obj, check_issues in block:
+            found[check_obj].extend(check_issues)
+
     issues = []
+    for check_obj in selected:
+        issues.extend(found[check_obj])
+    return issues
 
-    # Dispatch each enabled check against the appropriate target (per-quote
-    # or whole-file). The check registry knows its own scope and config
-    # requirements, so this loop is shape-agnostic.
-    for name in checks:
-        check_obj = CHECKS.get(name)
-        if check_obj is None:
+
+def iter_lint_issues(quotes, checks, config, workers=None, cache=None):
+    """Run the enabled lint checks against a list of quotes, yielding the issues as they are found.
+
+    Quotes are checked a batch at a time, so the first issues are ready
+    long before a large file has been checked, and a caller that stops
+    iterating early saves the rest of the work.  Each check is run once,
+    even if it is named more than once.
+
+    Args:
+        quotes (list[Quote]): The quotes to check.
+        checks (Iterable[str]): Names of the checks to run, as for
+            :func:`lint_quotes`.
+        config (configparser.ConfigParser): Application config.
+        workers (int | None): Number of worker processes, as for
+            :func:`lint_quotes`.
+        cache (dict | None): Results to reuse, as for :func:`lint_quotes`.
+            If iteration stops early, the results of the quotes checked so
+            far are added to the dict without dropping the others.
+
+    Yields:
+        LintIssue: The issues of the per-quote checks, quote by quote and,
+            for each quote, in order of check name; then the issues of the
+            file-scope checks, which only run once every quote has been
+            checked.
+
+    Raises:
+        ConfigError: If a plugin check cannot be loaded.
+    """
+    selected = [check_obj for check_obj in map(_get_check, checks) if check_obj is not None]
+    for batch, block in _iter_found(quotes, selected, config, workers, cache):
+        block_issues = [check_issues for _, check_issues in block if check_issues]
+        if batch is None or len(block_issues) <= 1:
+            for check_issues in block_issues:
+                yield from check_issues
             continue
-        cfg = lint_cfg if check_obj.needs_config else None
-        if check_obj.scope == 'file':
-            issues.extend(check_obj.check(quotes, config=cfg))
-        else:
-            for quote in quotes:
-                issues.extend(check_obj.check(quote, config=cfg))
-    return issues
+        # Checks are run over the whole batch, so their issues are put back in quote order
+        position = {quote.line_number: index for index, quote in enumerate(batch)}
+        yield from sorted(itertools.chain(*block_issues), key=lambda issue: position.get(issue.line_number, len(batch)))
+
+
+def _iter_found(quotes, selected, config, workers, cache):
+    """Run the ``selected`` checks over ``quotes``, yielding their issues a batch of quotes at a time.
+
+    Checks are taken in order of name, which is also how the cache stores
+    their results.
+
+    Yields:
+        tuple[list[Quote] | None, list[tuple[Check, list[LintIssue]]]]: A
+            batch of consecutive quotes and the issues each per-quote check
+            found in it; then ``None`` and the issues of each file-scope
+            check.
+    """
+    lint_cfg = config[_config.SECTION_LINT]
+    if workers == 0:
+        workers = os.cpu_count() or 1
+
+    unique = sorted(set(selected), key=lambda check_obj: check_obj.name)
+    per_quote = [check_obj for check_obj in unique if check_obj.scope != 'file']
+    file_checks = [check_obj for check_obj in unique if check_obj.scope == 'file']
+
+    # Settings are read once per run, not once per quote
+    run_cfg = _get_run_section(lint_cfg, unique)
+    rules = {check_obj: check_obj.prepare(run_cfg) for check_obj in unique}
+    if cache is not None:
+        yield from _iter_cached(quotes, per_quote, file_checks, lint_cfg, rules, workers, cache)
+        return
+
+    with contextlib.closing(_check_in_batches(quotes, per_quote, rules, workers)) as batches:
+        for batch, batch_issues in batches:
+            yield batch, list(zip(per_quote, batch_issues))
+    if file_checks:
+        yield None, list(_lint_whole_file(quotes, file_checks, rules).items())
+
+
+def _get_run_section(lint_cfg, checks):
+    """Return a copy of the ``[lint]`` section whose ``enabled_checks`` names the ``checks`` of this run."""
+    parser = configparser.ConfigParser(interpolation=None)
+    parser[_config.SECTION_LINT] = dict(lint_cfg)
+    parser[_config.SECTION_LINT]['enabled_checks'] = ', '.join(check_obj.name for check_obj in checks)
+    return parser[_config.SECTION_LINT]
+
+
+def _check_in_batches(quotes, checks, rules, workers):
+    """Run the per-quote ``checks`` over ``quotes`` a batch at a time, in worker processes when ``workers`` allows.
+
+    ``rules`` maps each check to what its :meth:`Check.prepare` returned.
+    Closing the generator early drops the batches not yet started.
+
+    Yields:
+        tuple[list[Quote], list[list[LintIssue]]]: A batch of consecutive
+            quotes and the issues of each check over it, in the order of
+            ``checks``.
+    """
+    if not checks:
+        if quotes:
+            yield quotes, []
+        return
+
+    chunk_count = min((workers or 1) * _CHUNKS_PER_WORKER, len(quotes) // _MIN_CHUNK_QUOTES)
+    if not workers or workers <= 1 or chunk_count <= 1:
+        for start in range(0, len(quotes), _BATCH_QUOTES):
+            batch = quotes[start : start + _BATCH_QUOTES]
+            found = _lint_each_quote(batch, checks, rules)
+            yield batch, [found[check_obj] for check_obj in checks]
+        return
+
+    # Imported only when worker processes are used; it is slow to import
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunk_size = math.ceil(len(quotes) / chunk_count)
+    chunks = [quotes[i : i + chunk_size] for i in range(0, len(quotes), chunk_size)]
+    # Checks are copied into each worker, so their rules travel in the same order rather than keyed by check
+    check_rules = [rules[check_obj] for check_obj in checks]
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        packed = map(_pack_quotes, chunks)
+        yield from zip(
+            chunks, executor.map(_lint_chunk, packed, itertools.repeat(checks), itertools.repeat(check_rules))
+        )
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _iter_cached(quotes, per_quote, file_checks, lint_cfg, rules, workers, cache):
+    """Run the ``per_quote`` and ``file_checks`` over ``quotes`` like :func:`_iter_found`, reusing the results in ``cache``.
+
+    ``cache`` maps a fingerprint of the checks and the ``[lint]`` settings to
+    a record of earlier results:
+
+    - ``'quotes'``: the issues of each quote, keyed by :func:`_quote_digest`.
+      Per-quote checks look at nothing else, so a quote with the same
+      fields has the same issues wherever it is in the file, apart from
+      their line numbers.  A quote without issues has ``()``; otherwise
+      each check has a tuple of :func:`_issue_details`, which leave out
+      the line number and check name.
+    - ``'file'``: a digest of the whole quote list, in order and with line
+      numbers, and the issues the file-scope checks found in that list.
+
+    When anything had to be checked, the fingerprint's record is replaced
+    with one holding only the results for ``quotes``, so the cache does not
+    grow as quotes are edited.  If the caller stops early, the results of
+    the quotes checked so far are added to the record instead.  Otherwise
+    ``cache`` is left as it was.
+    """
+    fingerprint = _fingerprint(per_quote + file_checks, lint_cfg, rules)
+    record = cache.get(fingerprint) or {'quotes': {}, 'file': None}
+    previous = record['quotes']
+    keys = list(map(_quote_digest, quotes))
+    entries = list(map(previous.get, keys))
+    missed = [quote for quote, entry in zip(quotes, entries) if entry is None]
+    checked = 0
+    names = [check_obj.name for check_obj in per_quote]
+    file_result = record['file']
+    finished = False
+    try:
+        with contextlib.closing(_check_in_batches(missed, per_quote, rules, workers)) as batches:
+            fresh = itertools.chain.from_iterable(
+                _split_by_quote(batch, batch_issues, per_quote, rules) for batch, batch_issues in batches
+            )
+            for start in range(0, len(quotes), _BATCH_QUOTES):
+                found = tuple([] for _ in per_quote)
+                for index in range(start, min(start + _BATCH_QUOTES, len(quotes))):
+                    entry = entries[index]
+                    if entry is None:
+                        # A quote just checked has its issues already, so only the cache gets their details
+                        entries[index], quote_issues = next(fresh)
+                        checked += 1
+                        for check_issues, issues in zip(found, quote_issues):
+                            check_issues.extend(issues)
+                        continue
+                    if not entry:
+                        continue
+                    line_number = quotes[index].line_number
+                    for check_issues, name, details in zip(found, names, entry):
+                        if details:
+                            check_issues.extend([LintIssue(line_number, name, *fields) for fields in details])
+                yield quotes[start : start + _BATCH_QUOTES], list(zip(per_quote, found))
+
+        # File-scope checks see the whole list, so their results only carry over to an identical list
+        if file_checks:
+            line_numbers = array('q', [quote.line_number for quote in quotes]).tobytes()
+            sequence = hashlib.blake2b(line_numbers + b''.join(keys), digest_size=16).digest()
+            if file_result is None or file_result[0] != sequence:
+                whole_file = _lint_whole_file(quotes, file_checks, rules)
+                file_result = (sequence, tuple(whole_file[check_obj] for check_obj in file_checks))
+            yield None, list(zip(file_checks, file_result[1]))
+        finished = True
+    finally:
+        if finished:
+            # Keep only the entries of these quotes, unless nothing has changed
+            if missed or file_result is not record['file'] or len(previous) > len(keys):
+                cache.clear()
+                cache[fingerprint] = {'quotes': dict(zip(keys, entries)), 'file': file_result}
+        elif checked or file_result is not record['file']:
+            saved = dict(previous)
+            saved.update((key, entry) for key, entry in zip(keys, entries) if entry is not None)
+            cache.clear()
+            cache[fingerprint] = {'quotes': saved, 'file': file_result}
+
+
+def _split_by_quote(batch, batch_issues, checks, rules):
+    """Return the issues of each quote of ``batch`` from ``batch_issues``, those of each of ``checks`` over the batch.
+
+    Returns:
+        list[tuple[tuple, tuple]]: The cache entry of each quote, as
+            described in :func:`_iter_cached`, and its issues, as one tuple
+            per check or ``()`` for a quote without any.
+    """
+    if not any(batch_issues):
+        return [((), ())] * len(batch)
+
+    # Issues are told apart by line number, so quotes sharing one are checked again one at a time
+    if len({quote.line_number for quote in batch}) != len(batch):
+        entries = []
+        for quote in batch:
+            found = _lint_each_quote([quote], checks, rules)
+            if any(found.values()):
+                issues = tuple(tuple(found[check_obj]) for check_obj in checks)
+                entries.append((tuple(tuple(map(_issue_details, check_issues)) for check_issues in issues), issues))
+            else:
+                entries.append(((), ()))
+        return entries
+
+    # Most quotes have issues from few checks, so their lists start out sharing one empty tuple per check
+    by_line = {}
+    no_issues = ((),) * len(checks)
+    for position, check_issues in enumerate(batch_issues):
+        for issue in check_issues:
+            found = by_line.get(issue.line_number)
+            if found is None:
+                found = by_line[issue.line_number] = (list(no_issues), list(no_issues))
+            details, issues = found
+            details[position] += (_issue_details(issue),)
+            issues[position] += (issue,)
+    entries = []
+    for quote in batch:
+        found = by_line.get(quote.line_number)
+        entries.append((tuple(found[0]), found[1]) if found else ((), ()))
+    return entries
+
+
+def _fingerprint(checks, lint_cfg, rules):
+    """Return a digest of the names, versions and cache keys of ``checks`` and of the ``[lint]`` settings."""
+    state = (
+        _CACHE_FORMAT,
+        [(check_obj.name, check_obj.version, check_obj.cache_key(rules[check_obj])) for check_obj in checks],
+        sorted(lint_cfg.items()),
+    )
+    return hashlib.blake2b(repr(state).encode('utf-8'), digest_size=16).hexdigest()
+
+
+# What the cache keeps of a LintIssue: its fields after the line number and check name
+_issue_details = operator.attrgetter(*(field.name for field in dataclasses.fields(LintIssue)[2:]))
+
+# The fields of a LintIssue, in the order its constructor takes them
+_issue_fields = operator.attrgetter(*(field.name for field in dataclasses.fields(LintIssue)))
+
+
+def _quote_digest(quote):
+    """Return a digest of the fields a per-quote check looks at, which identifies its results for ``quote``."""
+    # No field can contain '|', and a quote without a publication has one field fewer
+    if quote.publication is None:
+        record = '{0}|{1}|{2}'.format(quote.quote, quote.author, ','.join(quote._tags))
+    else:
+        record = '{0}|{1}|{2}|{3}'.format(quote.quote, quote.author, quote.publication, ','.join(quote._tags))
+    return hashlib.blake2b(record.encode('utf-8'), digest_size=16).digest()
+
+
+def read_lint_cache(path):
+    """Load lint results saved by :func:`write_lint_cache`, for the ``cache`` of :func:`lint_quotes`.
+
+    Args:
+        path (str): Path of the cache file.
+
+    Returns:
+        dict: The saved results, or an empty cache if the file is missing,
+            unreadable, or was written by an incompatible version.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        if not data.startswith(_LINT_CACHE_HEADER):
+            return {}
+        # Unmarshalling the bytes at once is several times faster than reading from the file object
+        saved = marshal.loads(memoryview(data)[len(_LINT_CACHE_HEADER) :])
+        file_result = saved['file']
+        if file_result is not None:
+            file_result = (
+                file_result[0],
+                tuple([LintIssue(*fields) for fields in issues] for issues in file_result[1]),
+            )
+        return {saved['fingerprint']: {'quotes': saved['quotes'], 'file': file_result}}
+    except (OSError, EOFError, ValueError, KeyError, TypeError, AttributeError):
+        return {}
+
+
+def write_lint_cache(path, cache):
+    """Save the ``cache`` of :func:`lint_quotes` to ``path``, replacing the file atomically.
+
+    The file is written with :mod:`marshal`, which loads much faster than
+    JSON; one written by another Python version may be unreadable, and is
+    then ignored by :func:`read_lint_cache`.
+
+    Args:
+        path (str): Path of the cache file.  Missing directories are created.
+        cache (dict): The cache passed to :func:`lint_quotes`.
+
+    Raises:
+        StorageError: If the file cannot be written.
+    """
+    if not cache:
+        return
+    (fingerprint, record), *_ = cache.items()
+    file_result = record['file']
+    if file_result is not None:
+        file_result = (file_result[0], tuple([_issue_fields(issue) for issue in issues] for issues in file_result[1]))
+    saved = {'fingerprint': fingerprint, 'quotes': record['quotes'], 'file': file_result}
+
+    temp_path = '{0}.{1}.tmp'.format(path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            f.write(_LINT_CACHE_HEADER)
+            marshal.dump(saved, f)
+        os.replace(temp_path, path)
+    except OSError as e:
+        raise StorageError("unable to write the lint cache '{0}': {1}".format(path, e)) from e
+
+
+def _lint_whole_file(quotes, checks, rules):
+    """Run the file-scope ``checks`` over ``quotes``, returning each check's issues."""
+    return {check_obj: _with_rules(check_obj, rules[check_obj])(quotes) for check_obj in checks}
+
+
+def _pack_quotes(quotes):
+    """Return the fields of ``quotes`` as plain tuples, to send to a worker process.
+
+    Quote objects are not sent as they are: a parsed quote's tags carry a
+    bitmask that is only meaningful in this process, and an unparsed
+    :class:`LazyQuote` holds its parser.
+    """
+    return [(q.line_number, q.quote, q.author, q.publication, tuple(q._tags)) for q in quotes]
+
+
+def _lint_chunk(rows, checks, check_rules):
+    """Run the per-quote ``checks`` over quotes packed by :func:`_pack_quotes`, in a worker process.
+
+    ``check_rules`` holds what each check's :meth:`Check.prepare` returned, in the order of ``checks``.
+
+    Returns:
+        list[list[LintIssue]]: The issues of each check, in the order of ``checks``.
+    """
+    quotes = []
+    for line_number, text, author, publication, tags in rows:
+        quote = Quote._from_valid_fields(text, author, publication, _shared_tags(tags))
+        quote.line_number = line_number
+        quotes.append(quote)
+    found = _lint_each_quote(quotes, checks, dict(zip(checks, check_rules)))
+    return [found[check_obj] for check_obj in checks]
+
+
+def _lint_each_quote(quotes, checks, rules):
+    """Run the per-quote ``checks`` over ``quotes`` in a single pass, passing each its ``rules``.
+
+    The patterns of the :class:`PatternCheck` instances are joined into one
+    regular expression, so each text field is scanned once for all of them.
+    Most fields match none, and those cost nothing more; a field that does
+    match is handed to every pattern check to build its issue.
+
+    Returns:
+        dict[Check, list[LintIssue]]: The issues of each check, in quote order.
+    """
+    found = {check_obj: [] for check_obj in checks}
+    pattern_checks = tuple(check_obj for check_obj in checks if isinstance(check_obj, PatternCheck))
+    other_checks = [
+        (found[check_obj].extend, _with_rules(check_obj, rules[check_obj]))
+        for check_obj in checks
+        if not isinstance(check_obj, PatternCheck)
+    ]
+    search = _fuse_patterns(pattern_checks).search if pattern_checks else None
+
+    for quote in quotes:
+        if search is not None:
+            author, publication = quote.author, quote.publication
+            if search(quote.quote) or (author and search(author)) or (publication and search(publication)):
+                for field_name in _TEXT_FIELDS:
+                    value = getattr(quote, field_name)
+                    if value is None or search(value) is None:
+                        continue
+                    for check_obj in pattern_checks:
+                        issue = check_obj.check_field(quote, field_name, value)
+                        if issue is not None:
+                            found[check_obj].append(issue)
+        for extend, check in other_checks:
+            extend(check(quote))
+    return found
+
+
+def _with_rules(check_obj, rules):
+    """Return :meth:`Check.check` of ``check_obj`` with its ``rules`` from :meth:`Check.prepare` bound."""
+    if type(check_obj).prepare is Check.prepare:
+        # Checks that keep the default prepare() take the [lint] section as config, as they did before it existed
+        return functools.partial(check_obj.check, config=rules)
+    return functools.partial(check_obj.check, rules=rules)
+
+
+@functools.lru_cache(maxsize=8)
+def _fuse_patterns(pattern_checks):
+    """Return a compiled regular expression matching wherever any of ``pattern_checks`` matches.
+
+    The characters of every :class:`CharacterCheck` go into a single
+    character class, which the regular expression engine scans for much
+    faster than an alternation of one class per check.
+    """
+    characters = ''.join(check_obj.characters for check_obj in pattern_checks if isinstance(check_obj, CharacterCheck))
+    alternatives = ['[{}]'.format(re.escape(characters))] if characters else []
+    alternatives.extend(
+        '(?:{})'.format(check_obj.pattern) for check_obj in pattern_checks if not isinstance(check_obj, CharacterCheck)
+    )
+    return re.compile('|'.join(alternatives))
 
 
 def apply_fixes(quotes, issues):
@@ -156,17 +630,28 @@ class Check:
             subclasses must declare this.
         scope (str): ``'quote'`` for per-quote checks (the default) or
             ``'file'`` for whole-file checks.
-        needs_config (bool): If ``True``, :meth:`check` is called with the
-            ``[lint]`` config section. Default ``False``.
+        needs_config (bool): If ``True``, the default :meth:`prepare` passes
+            the ``[lint]`` config section on to :meth:`check`. Default
+            ``False``.
         fixable (bool): If ``True``, instances of this check produce
             :class:`LintIssue` records with ``fixable=True`` and
             :func:`apply_fixes` will invoke :meth:`fix` on them.
+        opt_in (bool): If ``True``, the check is left out of
+            :data:`DEFAULT_CHECKS` and only runs when it is named, for
+            instance in ``enabled_checks``.  Set for checks that are slow
+            or need extra setup.  Default ``False``.
+        version (int): Revision of the check's logic.  Lint results cached
+            by :func:`lint_quotes` are only reused for the same version, so
+            increment it whenever a change to the check can change its
+            issues for the same quotes.  Default ``1``.
     """
 
     name: ClassVar[str]
     scope: ClassVar[str] = 'quote'
     needs_config: ClassVar[bool] = False
     fixable: ClassVar[bool] = False
+    opt_in: ClassVar[bool] = False
+    version: ClassVar[int] = 1
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
@@ -175,14 +660,53 @@ class Check:
         if 'name' in cls.__dict__:
             CHECKS[cls.name] = cls()
 
-    def check(self, target, *, config=None):
+    def prepare(self, config):
+        """Return the rules :meth:`check` applies, read from the ``[lint]`` config section.
+
+        :func:`lint_quotes` calls this once per run and passes the result to
+        every :meth:`check` call as ``rules``, so a check that depends on
+        settings should parse them here, into an immutable value such as an
+        int or a tuple, rather than once per quote.  With ``--jobs``, the
+        result is sent to the worker processes, so it must be picklable.
+
+        In a :func:`lint_quotes` run, ``enabled_checks`` in ``config`` names
+        every check of the run, whatever the settings file says, so a check
+        can tell which other checks run with it.
+
+        The default returns ``config`` itself if :attr:`needs_config` is set,
+        and ``None`` otherwise.  A check that keeps the default is passed the
+        result as ``config`` instead, as :meth:`check` took the ``[lint]``
+        section before this method existed.
+        """
+        return config if self.needs_config else None
+
+    def check(self, target, *, config=None, rules=None):
         """Return zero or more LintIssues for ``target``.
 
         When ``scope == 'quote'``, ``target`` is a single ``Quote``.  When
         ``scope == 'file'``, ``target`` is the full ``list[Quote]``.
+        ``rules`` is the value returned by :meth:`prepare`.  Checks that
+        override :meth:`prepare` also accept the ``[lint]`` section itself
+        as ``config``, as ``check()`` took it before :meth:`prepare`
+        existed, and prepare it on each call.
         """
         raise NotImplementedError
 
+    def _rules(self, config, rules):
+        """Return the ``rules`` passed to :meth:`check`, or those of the ``[lint]`` section passed as ``config``."""
+        return self.prepare(config) if config is not None else rules
+
+    def cache_key(self, rules):
+        """Return what, besides the ``[lint]`` settings, the results for the same quotes depend on.
+
+        :func:`lint_quotes` only reuses cached results while this value, for
+        the ``rules`` returned by :meth:`prepare`, is unchanged.  A check that
+        reads a file should return something that changes with the file,
+        such as its size and modification time.  It must have the same
+        ``repr()`` in every process.  The default is ``None``.
+        """
+        return None
+
     def fix(self, quote, issue):
         """Mutate ``quote`` in place to resolve ``issue``.
 
@@ -198,11 +722,24 @@ class Check:
 # ---------------------------------------------------------------------------
 
 
-class SmartQuotesCheck(Check):
-    """Flag and fix typographic/smart quote characters in any text field."""
+class PatternCheck(Check):
+    """Base class for checks that flag text fields matching a regular expression.
 
-    name = 'smart-quotes'
-    fixable = True
+    A pattern check looks at each of a quote's text fields and reports one
+    issue per field that :attr:`pattern` matches.  :func:`lint_quotes` joins
+    the patterns of every enabled pattern check into one regular expression
+    and scans each field once for all of them.
+
+    Class attributes:
+        pattern (str): Regular expression for the text the check flags.
+            Concrete subclasses must declare this, along with
+            :meth:`make_issue`.
+    """
+
+    pattern: ClassVar[str]
+
+    def __init__(self):
+        self._regex = re.compile(self.pattern)
 
     def check(self, quote, *, config=None):
         issues = []
@@ -210,114 +747,126 @@ class SmartQuotesCheck(Check):
             value = getattr(quote, field_name)
             if value is None:
                 continue
-            if any(c in _SMART_QUOTE_CHARS for c in value):
-                issues.append(
-                    LintIssue(
-                        line_number=quote.line_number,
-                        check=self.name,
-                        field=field_name,
-                        message='Smart quotes in {}'.format(field_name),
-                        fixable=True,
-                        fix_value=value.translate(_SMART_QUOTE_MAP),
-                    )
-                )
+            issue = self.check_field(quote, field_name, value)
+            if issue is not None:
+                issues.append(issue)
         return issues
 
+    def check_field(self, quote, field_name, value):
+        """Return the issue for the text field ``field_name`` holding ``value``, or ``None``."""
+        found = [match.group() for match in self._regex.finditer(value)]
+        if not found:
+            return None
+        return self.make_issue(quote, field_name, value, found)
+
+    def make_issue(self, quote, field_name, value, found):
+        """Return the :class:`LintIssue` for a field whose ``value`` contains the matches ``found``."""
+        raise NotImplementedError
+
+
+class CharacterCheck(PatternCheck):
+    """Base class for pattern checks that flag any of a set of characters.
+
+    Class attributes:
+        characters (str): The characters the check flags; :attr:`pattern`
+            is the character class of these.  Concrete subclasses must
+            declare this.
+    """
+
+    characters: ClassVar[str]
+
+    def __init__(self):
+        self.pattern = '[{}]'.format(re.escape(self.characters))
+        super().__init__()
+
+
+class SmartQuotesCheck(CharacterCheck):
+    """Flag and fix typographic/smart quote characters in any text field."""
+
+    name = 'smart-quotes'
+    fixable = True
+    characters = _SMART_QUOTE_CHARS
+
+    def make_issue(self, quote, field_name, value, found):
+        return LintIssue(
+            line_number=quote.line_number,
+            check=self.name,
+            field=field_name,
+            message='Smart quotes in {}'.format(field_name),
+            fixable=True,
+            fix_value=value.translate(_SMART_QUOTE_MAP),
+        )
+
     def fix(self, quote, issue):
         current = getattr(quote, issue.field) or ''
         setattr(quote, issue.field, current.translate(_SMART_QUOTE_MAP))
 
 
-class SmartDashesCheck(Check):
+class SmartDashesCheck(CharacterCheck):
     """Flag and fix unicode dash/hyphen variants in any text field."""
 
     name = 'smart-dashes'
     fixable = True
-
-    def check(self, quote, *, config=None):
-        issues = []
-        for field_name in _TEXT_FIELDS:
-            value = getattr(quote, field_name)
-            if value is None:
-                continue
-            found = [c for c in value if c in _SMART_DASH_CHARS]
-            if found:
-                names = sorted({_SMART_DASH_NAMES[c] for c in found})
-                issues.append(
-                    LintIssue(
-                        line_number=quote.line_number,
-                        check=self.name,
-                        field=field_name,
-                        message='Non-standard {} in {} (use ASCII hyphen)'.format(', '.join(names), field_name),
-                        fixable=True,
-                        fix_value=value.translate(_SMART_DASH_MAP),
-                    )
-                )
-        return issues
+    characters = _SMART_DASH_CHARS
+
+    def make_issue(self, quote, field_name, value, found):
+        names = sorted({_SMART_DASH_NAMES[c] for c in found})
+        return LintIssue(
+            line_number=quote.line_number,
+            check=self.name,
+            field=field_name,
+            message='Non-standard {} in {} (use ASCII hyphen)'.format(', '.join(names), field_name),
+            fixable=True,
+            fix_value=value.translate(_SMART_DASH_MAP),
+        )
 
     def fix(self, quote, issue):
         current = getattr(quote, issue.field) or ''
         setattr(quote, issue.field, current.translate(_SMART_DASH_MAP))
 
 
-class UnicodeEllipsisCheck(Check):
+class UnicodeEllipsisCheck(CharacterCheck):
     """Flag and fix the Unicode horizontal ellipsis (U+2026) in any text field."""
 
     name = 'unicode-ellipsis'
     fixable = True
-
-    def check(self, quote, *, config=None):
-        issues = []
-        for field_name in _TEXT_FIELDS:
-            value = getattr(quote, field_name)
-            if value is None:
-                continue
-            if _UNICODE_ELLIPSIS in value:
-                issues.append(
-                    LintIssue(
-                        line_number=quote.line_number,
-                        check=self.name,
-                        field=field_name,
-                        message='Unicode ellipsis in {}'.format(field_name),
-                        fixable=True,
-                        fix_value=value.replace(_UNICODE_ELLIPSIS, '...'),
-                    )
-                )
-        return issues
+    characters = _UNICODE_ELLIPSIS
+
+    def make_issue(self, quote, field_name, value, found):
+        return LintIssue(
+            line_number=quote.line_number,
+            check=self.name,
+            field=field_name,
+            message='Unicode ellipsis in {}'.format(field_name),
+            fixable=True,
+            fix_value=value.replace(_UNICODE_ELLIPSIS, '...'),
+        )
 
     def fix(self, quote, issue):
         current = getattr(quote, issue.field) or ''
         setattr(quote, issue.field, current.replace(_UNICODE_ELLIPSIS, '...'))
 
 
-class DoubleSpacesCheck(Check):
+class DoubleSpacesCheck(PatternCheck):
     """Flag and fix runs of multiple consecutive spaces in any text field."""
 
     name = 'double-spaces'
     fixable = True
-
-    def check(self, quote, *, config=None):
-        issues = []
-        for field_name in _TEXT_FIELDS:
-            value = getattr(quote, field_name)
-            if value is None:
-                continue
-            if '  ' in value:
-                issues.append(
-                    LintIssue(
-                        line_number=quote.line_number,
-                        check=self.name,
-                        field=field_name,
-                        message='Multiple consecutive spaces in {}'.format(field_name),
-                        fixable=True,
-                        fix_value=re.sub(r'  +', ' ', value),
-                    )
-                )
-        return issues
+    pattern = _MULTIPLE_SPACES_RE.pattern
+
+    def make_issue(self, quote, field_name, value, found):
+        return LintIssue(
+            line_number=quote.line_number,
+            check=self.name,
+            field=field_name,
+            message='Multiple consecutive spaces in {}'.format(field_name),
+            fixable=True,
+            fix_value=_MULTIPLE_SPACES_RE.sub(' ', value),
+        )
 
     def fix(self, quote, issue):
         current = getattr(quote, issue.field) or ''
-        setattr(quote, issue.field, re.sub(r'  +', ' ', current))
+        setattr(quote, issue.field, _MULTIPLE_SPACES_RE.sub(' ', current))
 
 
 class QuoteLengthCheck(Check):
@@ -326,8 +875,11 @@ class QuoteLengthCheck(Check):
     name = 'quote-too-long'
     needs_config = True
 
-    def check(self, quote, *, config=None):
-        max_len = int(config.get('max_quote_length', '0'))
+    def prepare(self, config):
+        return int(config.get('max_quote_length', '0'))
+
+    def check(self, quote, *, config=None, rules=None):
+        max_len = self._rules(config, rules)
         if max_len <= 0:
             return []
         length = len(quote.quote)
@@ -391,28 +943,213 @@ class RequiredTagGroupCheck(Check):
     name = 'required-tag-group'
     needs_config = True
 
-    def check(self, quote, *, config=None):
-        issues = []
+    def prepare(self, config):
+        """Return a ``(tags, message)`` pair for each non-empty ``required_group_*`` setting."""
+        groups = []
         for key, value in config.items():
             if not key.startswith('required_group_'):
                 continue
-            required_tags = {t.strip() for t in value.split(',') if t.strip()}
-            if not required_tags:
-                continue
-            if not any(tag in required_tags for tag in quote.tags):
-                issues.append(
-                    LintIssue(
-                        line_number=quote.line_number,
-                        check=self.name,
-                        field='tags',
-                        message='Quote must have one of the following tags: {}'.format(
-                            ', '.join(sorted(required_tags))
-                        ),
-                    )
-                )
+            required_tags = frozenset(t.strip() for t in value.split(',') if t.strip())
+            if required_tags:
+                message = 'Quote must have one of the following tags: {}'.format(', '.join(sorted(required_tags)))
+                groups.append((required_tags, message))
+        return tuple(groups)
+
+    def check(self, quote, *, config=None, rules=None):
+        issues = []
+        for required_tags, message in self._rules(config, rules):
+            if required_tags.isdisjoint(quote._tags):
+                issues.append(LintIssue(line_number=quote.line_number, check=self.name, field='tags', message=message))
         return issues
 
 
+class SpellingCheck(Check):
+    """Flag words in the quote text that are missing from the word list in spelling_word_list.
+
+    The word list is a UTF-8 text file with one word per line, compared
+    without regard to case; a word followed by ``'s`` is accepted when the
+    word itself is listed.  The first run sorts it into a word cache file
+    in ``lint_cache`` next to ``settings.conf``, which later runs map into
+    memory and search by bisection, so a large word list costs little
+    memory or start-up time.  The answers for the most recent tokens and
+    words are remembered, up to :data:`_WORD_MEMO_LIMIT` of each, so common
+    words are looked up once.  The check does nothing when no word list is
+    configured.
+    """
+
+    name = 'spelling'
+    needs_config = True
+    opt_in = True
+
+    def prepare(self, config):
+        path = config.get('spelling_word_list', '')
+        if not path:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            raise ConfigError("unable to read the spelling word list '{0}': {1}".format(path, e)) from e
+        return (path, stat.st_size, stat.st_mtime_ns)
+
+    def cache_key(self, rules):
+        return rules
+
+    def check(self, quote, *, config=None, rules=None):
+        rules = self._rules(config, rules)
+        if rules is None:
+            return []
+        tokens = quote.quote.split()
+        with _word_list_lock:
+            word_list = _get_word_list(rules)
+
+            # Words never span whitespace, so most quotes are settled by a set difference of their tokens
+            unknown = set(tokens) - word_list.known
+            if not unknown:
+                return []
+            word_list.look_up(unknown)
+            misspelled = word_list.misspelled
+            words = [word for token in tokens if token in misspelled for word in misspelled[token]]
+        if not words:
+            return []
+        return [
+            LintIssue(
+                line_number=quote.line_number,
+                check=self.name,
+                field='quote',
+                message='Possibly misspelled: {}'.format(', '.join(dict.fromkeys(words))),
+            )
+        ]
+
+
+class _WordList:
+    """A sorted word list searched in place, with the answers for the tokens already looked up.
+
+    ``buffer`` holds lowercase words, each followed by a newline and sorted
+    by their UTF-8 bytes, from offset ``start`` on.  It is usually a memory
+    map of a word cache file, so a search only reads the pages it touches.
+
+    The answers are forgotten once :data:`_WORD_MEMO_LIMIT` tokens or
+    words have been looked up, so they take a bounded amount of memory
+    however many distinct words a process checks.
+
+    Attributes:
+        known (set[str]): Whitespace-separated tokens whose words are all listed.
+        misspelled (dict[str, tuple[str, ...]]): Tokens with unlisted words,
+            and those words.
+    """
+
+    def __init__(self, buffer, start):
+        self.buffer = buffer
+        self.start = start
+        self.known = set()
+        self.misspelled = {}
+        self._listed = {}
+
+    def look_up(self, tokens):
+        """Add each of ``tokens`` that was not looked up before to :attr:`known` or :attr:`misspelled`."""
+        if len(self.known) + len(self.misspelled) + len(tokens) > _WORD_MEMO_LIMIT:
+            self.known.clear()
+            self.misspelled.clear()
+        if len(self._listed) > _WORD_MEMO_LIMIT:
+            self._listed.clear()
+        for token in tokens:
+            if token in self.misspelled:
+                continue
+            unlisted = tuple(word for word in _WORD_RE.findall(token) if not self._is_listed(word))
+            if unlisted:
+                self.misspelled[token] = unlisted
+            else:
+                self.known.add(token)
+
+    def _is_listed(self, word):
+        """Return True if ``word``, ignoring case and a trailing ``'s``, is in the word list."""
+        listed = self._listed.get(word)
+        if listed is None:
+            key = word.lower().replace('\u2019', "'")
+            listed = self._contains(key) or (key.endswith("'s") and self._contains(key[:-2]))
+            self._listed[word] = listed
+        return listed
+
+    def _contains(self, word):
+        """Return True if the lowercase ``word`` is in the buffer."""
+        key = word.encode('utf-8')
+        buffer = self.buffer
+        low, high = self.start, len(buffer)
+        while low < high:
+            # Compare against the whole line around the midpoint
+            middle = (low + high) // 2
+            line_start = buffer.rfind(b'\n', 0, middle) + 1
+            line_end = buffer.find(b'\n', middle)
+            line = buffer[line_start:line_end]
+            if line == key:
+                return True
+            if line < key:
+                low = line_end + 1
+            else:
+                high = line_start
+        return False
+
+
+# Rules of the most recently used word list, and the word list
+_word_list = (None, None)
+
+# Serializes use of _word_list and of the answers it remembers across threads such as web requests
+_word_list_lock = threading.Lock()
+
+
+def _get_word_list(rules):
+    """Return the :class:`_WordList` of the spelling check's ``rules``, loading it for new rules.
+
+    Called with :data:`_word_list_lock` held.
+    """
+    global _word_list
+    cached_rules, word_list = _word_list
+    if cached_rules != rules:
+        word_list = _load_word_list(*rules)
+        _word_list = (rules, word_list)
+    return word_list
+
+
+def _load_word_list(path, size, mtime_ns):
+    """Map the word cache of the word list at ``path`` into memory, building the cache first if it is stale.
+
+    The cache file is named after the word list's path and starts with a
+    header line holding the word list's size and modification time.  If
+    the cache cannot be written, the sorted words are kept in memory.
+    """
+    import mmap
+
+    header = '{0} {1} {2}\n'.format(_WORD_CACHE_HEADER, size, mtime_ns).encode('ascii')
+    digest = hashlib.blake2b(os.path.abspath(path).encode('utf-8'), digest_size=8).hexdigest()
+    cache_path = os.path.join(_get_lint_cache_dir(), 'words-{0}.txt'.format(digest))
+
+    try:
+        with open(cache_path, 'rb') as f:
+            if f.read(len(header)) == header:
+                return _WordList(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), len(header))
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            words = {line.strip().lower().replace('\u2019', "'") for line in f}
+    except (OSError, UnicodeDecodeError) as e:
+        raise ConfigError("unable to read the spelling word list '{0}': {1}".format(path, e)) from e
+    words.discard('')
+    content = header + b''.join(sorted(word.encode('utf-8') + b'\n' for word in words))
+
+    temp_path = '{0}.{1}.tmp'.format(cache_path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, cache_path)
+        with open(cache_path, 'rb') as f:
+            return _WordList(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), len(header))
+    except (OSError, ValueError):
+        return _WordList(content, len(header))
+
+
 class DuplicateHashCheck(Check):
     """Flag quotes whose fuzzy hash collides with an earlier quote in the file."""
 
@@ -422,8 +1159,7 @@ class DuplicateHashCheck(Check):
     def check(self, quotes, *, config=None):
         issues = []
         seen = {}
-        for quote in quotes:
-            h = quote.get_hash()
+        for quote, h in zip(quotes, compute_hashes(quotes)):
             if h in seen:
                 issues.append(
                     LintIssue(
@@ -438,6 +1174,182 @@ class DuplicateHashCheck(Check):
         return issues
 
 
+class AuthorVariantsCheck(Check):
+    """Flag quotes whose author looks like another way of writing a more common author's name.
+
+    "R. W. Emerson" and "Emerson, Ralph Waldo" are flagged when more quotes
+    are by "Ralph Waldo Emerson"; see :func:`find_author_variants` for which
+    names are variants.  Authors are compared within groups that share a
+    surname or a similar one, so the check stays fast for many authors.
+    """
+
+    name = 'author-variants'
+    scope = 'file'
+    opt_in = True
+
+    def check(self, quotes, *, config=None):
+        from jotquote.api.similarity import find_author_variants
+
+        variants = find_author_variants(quotes)
+        if not variants:
+            return []
+        counts = collections.Counter(quote.author for quote in quotes)
+        issues = []
+        for quote in quotes:
+            preferred = variants.get(quote.author)
+            if preferred is not None:
+                count = counts[preferred]
+                issues.append(
+                    LintIssue(
+                        line_number=quote.line_number,
+                        check=self.name,
+                        field='author',
+                        message="Author may be the same as '{0}' ({1} quote{2})".format(
+                            preferred, count, '' if count == 1 else 's'
+                        ),
+                    )
+                )
+        return issues
+
+
+class NearDuplicateCheck(Check):
+    """Flag quotes whose text is nearly the same as an earlier quote's.
+
+    Similarity is the share of adjacent word pairs two quote texts have in
+    common; quotes at or above near_duplicate_threshold (0.7 by default)
+    are reported against the earlier quote.  Quotes under four words are
+    skipped, and so are quotes with the same fuzzy hash when duplicate-hash
+    is in ``enabled_checks``, which :func:`lint_quotes` sets to the checks
+    of the run, since it reports those already.  The MinHash signatures of
+    the quotes are read from ``lint_cache`` next to ``settings.conf`` and
+    kept in memory, so only new or edited quotes are hashed again; the
+    check never writes them back, which is left to the caller through
+    :func:`write_near_duplicate_signatures`.
+    """
+
+    name = 'near-duplicate'
+    scope = 'file'
+    needs_config = True
+    opt_in = True
+
+    def prepare(self, config):
+        """Return ``(threshold, skip_hashed)``, ``skip_hashed`` being set when duplicate-hash is enabled too."""
+        enabled = {name.strip() for name in config.get('enabled_checks', '').split(',')}
+        return (_get_near_duplicate_threshold(config), 'duplicate-hash' in enabled)
+
+    def check(self, quotes, *, config=None, rules=None):
+        threshold, skip_hashed = self._rules(config, rules)
+        hashes = compute_hashes(quotes) if skip_hashed else None
+        issues = []
+        for found in _find_near_duplicates(quotes, threshold):
+            if skip_hashed and hashes[found.index] == hashes[found.original]:
+                continue
+            issues.append(
+                LintIssue(
+                    line_number=quotes[found.index].line_number,
+                    check=self.name,
+                    field='quote',
+                    message='Quote is {0:.0%} similar to the quote on line {1}'.format(
+                        found.similarity, quotes[found.original].line_number
+                    ),
+                )
+            )
+        return issues
+
+
+def _get_near_duplicate_threshold(lint_cfg):
+    """Return ``near_duplicate_threshold`` from the ``[lint]`` section, or the default when it is not set."""
+    value = lint_cfg.get('near_duplicate_threshold', '')
+    if not value:
+        return _NEAR_DUPLICATE_THRESHOLD
+    try:
+        threshold = float(value)
+    except ValueError:
+        threshold = math.nan
+    if not 0.0 < threshold <= 1.0:
+        raise ConfigError(
+            'near_duplicate_threshold in [lint] section of settings.conf must be a number greater than 0 '
+            "and at most 1, not '{0}'.".format(value)
+        )
+    return threshold
+
+
+# Signatures of the near-duplicate check's most recent quotes, loaded from the signature file on first use
+_signatures = None
+
+# Whether _signatures has changed since it was read or last written
+_signatures_changed = False
+
+# Serializes use of _signatures, which find_near_duplicates() updates, across threads such as web requests
+_signatures_lock = threading.Lock()
+
+
+def _find_near_duplicates(quotes, threshold):
+    """Return :func:`find_near_duplicates` for ``quotes``, reusing the signatures read from the signature file."""
+    from jotquote.api.similarity import find_near_duplicates, read_signatures
+
+    global _signatures, _signatures_changed
+    with _signatures_lock:
+        if _signatures is None:
+            _signatures = read_signatures(_get_signature_path())
+        saved = dict(_signatures)
+        found = find_near_duplicates(quotes, threshold, _signatures)
+        if _signatures != saved:
+            _signatures_changed = True
+    return found
+
+
+def get_near_duplicate_settings(config):
+    """Return the similarity threshold and the signature file of the near-duplicate check.
+
+    Args:
+        config (configparser.ConfigParser): Application config.
+
+    Returns:
+        tuple[float, str]: ``near_duplicate_threshold`` from the ``[lint]``
+            section, or 0.7 when it is not set, and the path of the file of
+            MinHash signatures that the check reads, for use with
+            :func:`~jotquote.api.similarity.read_signatures` and
+            :func:`~jotquote.api.similarity.write_signatures`.
+
+    Raises:
+        ConfigError: If ``near_duplicate_threshold`` is not a number greater
+            than 0 and at most 1.
+    """
+    return _get_near_duplicate_threshold(config[_config.SECTION_LINT]), _get_signature_path()
+
+
+def write_near_duplicate_signatures():
+    """Save the signatures the near-duplicate check computed in this process to its signature file.
+
+    The check reads the signature file the first time it runs but never
+    writes it, so a caller that wants later runs to reuse the signatures,
+    as ``jotquote lint`` does, calls this after :func:`lint_quotes`.  Does
+    nothing if the signatures have not changed since they were read.
+
+    Raises:
+        StorageError: If the file cannot be written.
+    """
+    from jotquote.api.similarity import write_signatures
+
+    global _signatures_changed
+    with _signatures_lock:
+        if not _signatures_changed:
+            return
+        write_signatures(_get_signature_path(), _signatures)
+        _signatures_changed = False
+
+
+def _get_signature_path():
+    """Return the path of the signature file of the near-duplicate check, which ``jotquote dedupe`` shares."""
+    return os.path.join(_get_lint_cache_dir(), 'near-duplicate.bin')
+
+
+def _get_lint_cache_dir():
+    """Return the ``lint_cache`` directory next to settings.conf, where checks keep their caches."""
+    return os.path.join(_config.get_config_dir(), 'lint_cache')
+
+
 class MissingEndPunctuationCheck(Check):
     """Flag and fix quotes whose text does not end with terminal punctuation."""
 
@@ -502,3 +1414,72 @@ class LowercaseStartCheck(Check):
 # after every concrete subclass above has self-registered, so adding a new
 # check (or removing one) requires no edits here.
 ALL_CHECKS = frozenset(CHECKS)
+
+# The built-in checks that run when none are named, leaving out the opt-in ones
+DEFAULT_CHECKS = frozenset(name for name, check_obj in CHECKS.items() if not check_obj.opt_in)
+
+
+# ---------------------------------------------------------------------------
+# Plugin checks
+# ---------------------------------------------------------------------------
+
+
+# Entry-point group through which other packages provide checks
+ENTRY_POINT_GROUP = 'jotquote.lint_checks'
+
+
+def available_checks():
+    """Return the names of the built-in checks and of the checks installed as plugins.
+
+    A package provides a check by declaring an entry point in the
+    ``jotquote.lint_checks`` group, named after the check and pointing to its
+    :class:`Check` subclass::
+
+        [project.entry-points.'jotquote.lint_checks']
+        house-style = 'jotquote_house_style:HouseStyleCheck'
+
+    Plugins are found from the installed package metadata, without being
+    imported; :func:`lint_quotes` imports a plugin the first time its check
+    is run.  Like the opt-in built-in checks, which :data:`DEFAULT_CHECKS`
+    leaves out, plugin checks only run when they are named, for instance in
+    ``enabled_checks``.  An entry point named after a built-in check is
+    ignored, so the built-in check always runs under its own name.
+
+    Returns:
+        frozenset[str]: The check names.
+    """
+    return ALL_CHECKS | frozenset(_plugin_entry_points())
+
+
+@functools.lru_cache(maxsize=1)
+def _plugin_entry_points():
+    """Return the entry points of :data:`ENTRY_POINT_GROUP` by name, leaving out built-in names."""
+    try:
+        entry_points = importlib.metadata.entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:
+        # Python 3.9 returns every group in a dict
+        entry_points = importlib.metadata.entry_points().get(ENTRY_POINT_GROUP, ())
+    return {entry_point.name: entry_point for entry_point in entry_points if entry_point.name not in ALL_CHECKS}
+
+
+def _get_check(name):
+    """Return the registered check called ``name``, importing it from its plugin if needed, or None."""
+    check_obj = CHECKS.get(name)
+    if check_obj is not None:
+        return check_obj
+    entry_point = _plugin_entry_points().get(name)
+    if entry_point is None:
+        return None
+    try:
+        check_class = entry_point.load()
+    except (ImportError, AttributeError) as e:
+        raise ConfigError("unable to load lint check '{0}' from '{1}': {2}".format(name, entry_point.value, e)) from e
+    if (
+        not (isinstance(check_class, type) and issubclass(check_class, Check))
+        or check_class.__dict__.get('name') != name
+    ):
+        raise ConfigError(
+            "lint check plugin '{0}' ('{1}') is not a Check subclass named '{0}'".format(name, entry_point.value)
+        )
+    # Defining the subclass registered it, unless the module was imported under another name before
+    return CHECKS.setdefault(name, check_class())
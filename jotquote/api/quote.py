@@ -2,29 +2,77 @@
 #  This file is licensed under the terms of the MIT License.  See the LICENSE
 # file in the root of this repository for complete details.
 
+import contextlib
+import gc
 import hashlib
+import operator
 import re
-from string import ascii_letters
+import sys
+import threading
 
 from jotquote.api.exceptions import QuoteValidationError
 
 INVALID_CHARS_QUOTE = re.compile('[|"\n\r]')
 INVALID_CHARS = re.compile('[|\n\r]')
 
+# A valid tag: ASCII letters, digits, and underscores only.
+_TAG_CHARS = re.compile('[A-Za-z0-9_]*')
+
+# One shared tuple for each distinct tag sequence, see _shared_tags(); cleared
+# when it reaches the limit, so a long-running server does not grow it forever.
+_tag_tuples = {}
+_TAG_TUPLES_LIMIT = 1 << 16
+
+# Bit of each tag in the current tag snapshot, see _tag_mask().  Every read of a
+# quote file starts a new, empty table, so the bits, and the masks built from
+# them, only cover the tags in use rather than every tag the process has seen.
+_tag_bits = {}
+
+# Held while a bit is assigned, so that two threads cannot give two tags the same bit.
+_tag_bits_lock = threading.Lock()
+
+# Whether a table that masks were built from has been replaced, so that quotes
+# of an earlier snapshot may hold tag tuples not yet masked in the current one.
+_stale_masks_possible = False
+
+# Star tags, in the order get_num_stars() checks them.
+_STAR_TAGS = ('1star', '2stars', '3stars', '4stars', '5stars')
+
+# Fuzzy hashes by quote text, shared by every read in the process so an
+# unchanged quote is hashed once; cleared when it reaches the limit.
+_hash_memo = {}
+_HASH_MEMO_LIMIT = 1 << 20
+
+# Byte translation table for compute_hashes(): ASCII letters are kept, the
+# newline separating quotes becomes '0', and everything else a space.
+_ACRONYM_TABLE = bytes(
+    c if chr(c).isascii() and chr(c).isalpha() else ord('0') if c == ord('\n') else ord(' ') for c in range(256)
+)
+
 
 class Quote:
     """A quote with author, optional publication, and tags.
 
+    Quotes use ``__slots__``, author and publication strings are interned,
+    and tags are stored as a tuple shared by every quote with the same tags,
+    so a large quote file costs far less memory than one object dictionary
+    and tag list per quote.
+
     Attributes:
         quote (str): The quote text.
         author (str): Name of the person to whom the quote is attributed.
         publication (str | None): Publication containing the quote, or ``None``
             if not recorded.
-        tags (list[str]): Zero or more tags associated with the quote.
+        tags (list[str]): Zero or more tags associated with the quote.  Each
+            access returns a new list; changing it in place, as with
+            ``quote.tags.append(tag)``, sets the quote's tags through
+            :meth:`set_tags`.
         line_number (int): 1-based line number of the quote in the quote file
             it was read from; 0 for quotes that were not read from a file.
     """
 
+    __slots__ = ('_quote', '_hash', 'author', 'publication', '_tags', 'line_number')
+
     def __init__(self, quote, author, publication, tags):
         """Construct a Quote after validating the input fields.
 
@@ -45,11 +93,11 @@ class Quote:
             TypeError: If ``tags`` is not a list.
         """
         self.quote = quote.strip()
-        self.author = author.strip()
+        self.author = sys.intern(author.strip())
         if publication is None:
             self.publication = None
         else:
-            self.publication = publication.strip()
+            self.publication = sys.intern(publication.strip())
 
         _assert_no_invalid_chars_quote(self._quote, 'quote')
         _assert_no_invalid_chars(self.author, 'author')
@@ -57,10 +105,27 @@ class Quote:
         if self.publication is not None:
             _assert_no_invalid_chars(self.publication, 'publication')
 
-        self.tags = []
         self.set_tags(tags)
         self.line_number = 0
 
+    @classmethod
+    def _from_valid_fields(cls, quote, author, publication, tags, line_number=0):
+        """Construct a Quote from fields that are already stripped and validated.
+
+        Used by the batch parser to skip the re-validation done in
+        :meth:`__init__`.  Callers are responsible for passing exactly what
+        ``__init__`` would have stored, with ``tags`` already shared through
+        :func:`_shared_tags`.
+        """
+        self = cls.__new__(cls)
+        self._quote = quote
+        self._hash = None
+        self.author = sys.intern(author)
+        self.publication = None if publication is None else sys.intern(publication)
+        self._tags = tags
+        self.line_number = line_number
+        return self
+
     @property
     def quote(self):
         return self._quote
@@ -71,13 +136,21 @@ class Quote:
         self._quote = value
         self._hash = None
 
+    @property
+    def tags(self):
+        return _TagList(self)
+
+    @tags.setter
+    def tags(self, value):
+        self.set_tags(value)
+
     def __eq__(self, other):
         """Return True if two quotes have the same quote, author, publication, and tags."""
         if (
             (self.quote == other.quote)
             and (self.author == other.author)
             and (self.publication == other.publication)
-            and (self.tags == other.tags)
+            and (self._tags == other._tags)
         ):
             return True
         else:
@@ -96,7 +169,8 @@ class Quote:
         Returns:
             bool: ``True`` if ``tag`` is in this quote's tags.
         """
-        if tag in self.tags:
+        table = _tag_bits
+        if _tag_mask(self._tags, table) & table.get(tag, 0):
             return True
         return False
 
@@ -109,10 +183,11 @@ class Quote:
         Returns:
             bool: ``True`` if every tag in ``tags`` is present on this quote.
         """
-        for tag in tags:
-            if tag not in self.tags:
-                return False
-        return True
+        # Mask the quote first, which gives its own tags their bits
+        table = _tag_bits
+        mask = _tag_mask(self._tags, table)
+        required = _required_tag_mask(tags, table)
+        return required is not None and mask & required == required
 
     def has_keyword(self, keyword):
         """Return True if the keyword appears in the quote, author, publication, or tags.
@@ -137,11 +212,11 @@ class Quote:
             TypeError: If ``tags`` is not ``None`` and not a list.
         """
         if tags is None:
-            self.tags = []
+            self._tags = _shared_tags(())
         else:
-            if type(tags) is not list:
+            if not isinstance(tags, list):
                 raise TypeError('The quote object was not given a list for tags parameter.')
-            self.tags = tags
+            self._tags = _shared_tags(tags)
 
     def get_hash(self):
         """Return a 16-character hex hash for this quote.
@@ -161,23 +236,11 @@ class Quote:
         Returns:
             str: The first 16 hex characters of the MD5 digest.
         """
-        if self._hash is not None:
-            return self._hash
-
-        # Single pass: record the first lowercase letter of every alphabetic word.
-        first_letters = []
-        in_word = False
-        for ch in self._quote:
-            if ch.isalpha():
-                if not in_word:
-                    first_letters.append(ch.lower())
-                    in_word = True
-            else:
-                in_word = False
-        acronym = ''.join(first_letters)
-        m = hashlib.md5()
-        m.update(acronym.encode('utf-8'))
-        self._hash = m.hexdigest()[0:16]
+        if self._hash is None:
+            self._hash = _hash_memo.get(self._quote)
+            if self._hash is None:
+                self._hash = _fuzzy_hash(self._quote)
+                _memoize_hashes([(self._quote, self._hash)], 1)
         return self._hash
 
     def get_num_stars(self):
@@ -185,15 +248,13 @@ class Quote:
 
         The star tags are ``1star``, ``2stars``, ``3stars``, ``4stars``, and
         ``5stars``.  If more than one star tag is present, the lowest one
-        wins.
+        wins.  The rating is computed once per distinct set of tags, when
+        the tags are set.
 
         Returns:
             int: A rating between 0 and 5, inclusive.
         """
-        for i, label in enumerate(['1star', '2stars', '3stars', '4stars', '5stars'], 1):
-            if self.has_tag(label):
-                return i
-        return 0
+        return self._tags.num_stars
 
     def get_line_number(self):
         """Return the line number of this quote in the quote file.
@@ -205,6 +266,167 @@ class Quote:
         return self.line_number
 
 
+class LazyQuote(Quote):
+    """A :class:`Quote` that keeps its raw quote-file line until a field is used.
+
+    The line is split and validated the first time ``quote``, ``author``,
+    ``publication``, ``tags``, or ``get_hash()`` is accessed, so reading a
+    large file and showing one quote only pays for the quote shown.  A
+    malformed line therefore raises :class:`QuoteValidationError` on first
+    access rather than when the file is read.  ``line_number`` is available
+    without parsing.  Fields assigned before the line is parsed are kept.
+
+    Several threads may read the same LazyQuote at once: the line is parsed
+    by one of them, under a lock, while the others wait for its fields.
+    Changing a quote while other threads read it is not safe, as for
+    :class:`Quote`.
+    """
+
+    __slots__ = ('_line', '_parse')
+
+    def __init__(self, line, line_number, parse):
+        """Construct a LazyQuote for one stripped, non-comment line.
+
+        Args:
+            line (str): The stripped line from the quote file.
+            line_number (int): 1-based line number of ``line``.
+            parse (Callable[[str, int], Quote]): Parses and validates a line;
+                receives ``line`` and ``line_number`` and returns a Quote or
+                raises :class:`QuoteValidationError`.
+        """
+        self._line = line
+        self._parse = parse
+        self.line_number = line_number
+
+    def __getattr__(self, name):
+        # Only called for slots that are not set, i.e. fields not yet parsed or being parsed by another thread
+        if name not in _LAZY_FIELDS:
+            raise AttributeError("'{0}' object has no attribute '{1}'".format(type(self).__name__, name))
+        with _materialize_lock:
+            self._materialize()
+        return object.__getattribute__(self, name)
+
+    def is_parsed(self):
+        """Return True once the raw line has been parsed into fields."""
+        return self._line is None
+
+    def _materialize(self):
+        """Parse the line into the fields not yet set; called with :data:`_materialize_lock` held."""
+        line, parse = self._line, self._parse
+        if parse is None:
+            return
+        parsed = parse(line, self.line_number)
+        for name in _LAZY_FIELDS:
+            try:
+                object.__getattribute__(self, name)
+            except AttributeError:
+                setattr(self, name, getattr(parsed, name))
+        # Cleared after every field is set, so readers that find no line (like _peek_tags) see a whole quote
+        self._parse = None
+        self._line = None
+
+
+# Slots of Quote that a LazyQuote fills in when it is parsed.
+_LAZY_FIELDS = ('_quote', '_hash', 'author', 'publication', '_tags')
+
+# Held while a LazyQuote is parsed, so that each line is parsed once even when several threads read it.
+# Reentrant in case a parse function reads another LazyQuote.
+_materialize_lock = threading.RLock()
+
+
+def compute_hashes(quotes):
+    """Return the :meth:`Quote.get_hash` value of every quote, computed in bulk.
+
+    Hashes are cached on each quote and in a process-wide table keyed by the
+    quote text, so quotes whose text was already hashed by an earlier read
+    are not hashed again.  Quotes with ASCII text are hashed together: their
+    texts are joined into one byte string, reduced to word initials with a
+    byte translation table and a split, and only the MD5 step runs per quote.
+    Other quotes take the per-character path of :meth:`Quote.get_hash`.
+
+    Args:
+        quotes (Iterable[Quote]): The quotes to hash.
+
+    Returns:
+        list[str]: The 16-character hash of each quote, in order.
+    """
+    quotes = list(quotes)
+    memo = _hash_memo
+    pending = []
+    for quote in quotes:
+        if quote._hash is None:
+            quote._hash = memo.get(quote._quote)
+            if quote._hash is None:
+                pending.append(quote)
+
+    with _gc_paused():
+        batched = [quote for quote in pending if quote._quote.isascii() and '\n' not in quote._quote]
+        texts = [quote._quote for quote in batched]
+        hashes = _fuzzy_hashes_ascii(texts)
+        for quote, quote_hash in zip(batched, hashes):
+            quote._hash = quote_hash
+        _memoize_hashes(zip(texts, hashes), len(texts))
+        for quote in pending:
+            if quote._hash is None:
+                quote._hash = _fuzzy_hash(quote._quote)
+                _memoize_hashes([(quote._quote, quote._hash)], 1)
+
+    return [quote._hash for quote in quotes]
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    """Pause the cyclic garbage collector while the block allocates many objects.
+
+    Quotes, their tag tuples and the bytes hashed for them hold no reference
+    cycles, so while a large file is read the collector would only rescan
+    the growing list of quotes again and again.  It is resumed afterwards
+    only if it was running before.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _fuzzy_hash(text):
+    """Hash the lowercased first letter of each alphabetic word in ``text``, one character at a time."""
+    first_letters = []
+    in_word = False
+    for ch in text:
+        if ch.isalpha():
+            if not in_word:
+                first_letters.append(ch.lower())
+                in_word = True
+        else:
+            in_word = False
+    acronym = ''.join(first_letters)
+    return hashlib.md5(acronym.encode('utf-8')).hexdigest()[0:16]
+
+
+def _fuzzy_hashes_ascii(texts):
+    """Return :func:`_fuzzy_hash` of each ASCII, newline-free text, working on all texts at once."""
+    if not texts:
+        return []
+    # Surround each separator with spaces so it splits out as its own '0' word
+    words = ' \n '.join(texts).encode('ascii').translate(_ACRONYM_TABLE).split()
+    acronyms = bytes(map(operator.itemgetter(0), words)).lower().split(b'0')
+    md5 = hashlib.md5
+    return [md5(acronym).hexdigest()[0:16] for acronym in acronyms]
+
+
+def _memoize_hashes(pairs, count):
+    """Remember the ``(text, hash)`` pairs, clearing the memo first if it would exceed its limit."""
+    if count > _HASH_MEMO_LIMIT:
+        return
+    if len(_hash_memo) + count > _HASH_MEMO_LIMIT:
+        _hash_memo.clear()
+    _hash_memo.update(pairs)
+
+
 def parse_quote(new_quote, simple_format=True):
     """Parse a single quote string into a :class:`Quote`.
 
@@ -359,13 +581,278 @@ def _parse_quote_extended(quote_line):
     return quote, author, publication, tags
 
 
+def _parse_quotes_extended_fast(lines, on_slow_line, first_line=1):
+    """Batch-parse pipe-delimited lines, skipping validation that cannot fail.
+
+    ``lines`` must come from ``str.splitlines()``, so no line contains a
+    newline or carriage return.  Well-formed lines are split and stripped
+    with C-level string methods, parsed tag strings are memoized since the
+    same combination of tags repeats across many quotes, and quotes are
+    built without the re-validation done in :meth:`Quote.__init__`.  Every
+    line accepted here yields a :class:`Quote` equal to
+    ``_parse_quote(line, simple_format=False)``.  Any other non-blank,
+    non-comment line is handed to ``on_slow_line``, which must parse it with
+    the validating parser, so error messages are exactly those of
+    :func:`_parse_quote`.
+
+    Args:
+        lines (Iterable[str]): Raw lines, not yet stripped.
+        on_slow_line (Callable[[str, int], Quote]): Fallback for lines the
+            fast path declines; receives the stripped line and its 1-based
+            line number, and returns the parsed quote or raises.
+        first_line (int): Line number of the first element of ``lines``;
+            used when parsing one chunk of a larger file.
+
+    Returns:
+        list[Quote]: Parsed quotes with ``line_number`` set.
+    """
+    quotes = []
+    append = quotes.append
+    strip = str.strip
+    new_quote = Quote._from_valid_fields
+    tag_cache = {}
+
+    with _gc_paused():
+        for linenum, rawline in enumerate(lines, first_line):
+            fields = rawline.split('|')
+            if len(fields) == 4:
+                text, author, publication, tags_field = fields
+                text = strip(text)
+
+                # A stripped first field starting with '#' means the whole line is a comment
+                if text[:1] == '#':
+                    continue
+
+                # Tags are stripped one by one, so the unstripped field can key the memo
+                tags = tag_cache.get(tags_field)
+                if tags is None:
+                    tags = tag_cache[tags_field] = _parse_tags_fast(tags_field)
+                author = strip(author)
+                if text and author and tags is not False and '"' not in text:
+                    append(new_quote(text, author, strip(publication), tags, linenum))
+                    continue
+
+            # Blank, comment, or invalid: let the validating parser decide
+            line = rawline.strip()
+            if not line or line[0] == '#':
+                continue
+            quote = on_slow_line(line, linenum)
+            quote.line_number = linenum
+            append(quote)
+
+    return quotes
+
+
+def _parse_tags_fast(tag_string):
+    """Return the sorted tags in ``tag_string`` as a shared tuple, or ``False`` if any tag is invalid."""
+    tagset = {tag.strip() for tag in tag_string.split(',')}
+    tagset.discard('')
+    if not all(map(_TAG_CHARS.fullmatch, tagset)):
+        return False
+    return _shared_tags(sorted(tagset))
+
+
+def _peek_tags(quotes):
+    """Return the shared tag tuple of each quote, without parsing lazily read quotes.
+
+    The tags are the last field of a quote-file line, so an unparsed
+    :class:`LazyQuote` is tagged from that field alone, once per distinct
+    field, unless its tags were set before it was parsed.  A line that fails
+    to parse later is tagged as if its other fields were valid, and with no
+    tags if its tag field is invalid.
+    """
+    tags_by_field = {}
+    result = []
+    for quote in quotes:
+        line = getattr(quote, '_line', None)
+        if line is None:
+            result.append(quote._tags)
+            continue
+        try:
+            result.append(object.__getattribute__(quote, '_tags'))
+            continue
+        except AttributeError:
+            pass
+        field = line.rpartition('|')[2]
+        tags = tags_by_field.get(field)
+        if tags is None:
+            tags = tags_by_field[field] = _parse_tags_fast(field) or _shared_tags(())
+        result.append(tags)
+    return result
+
+
+class _TagList(list):
+    """The list returned by :attr:`Quote.tags`.
+
+    The quote stores its tags as a shared :class:`_TagTuple`, so this list is
+    a copy; every change made to it in place is written back to the quote
+    through :meth:`Quote.set_tags`.  Once the quote's tags are replaced some
+    other way, for instance by assigning ``tags``, the list is detached and
+    later changes to it only change the list, as with the plain list an older
+    ``tags`` value used to be.
+    """
+
+    __slots__ = ('_quote', '_source')
+
+    def __init__(self, quote):
+        super().__init__(quote._tags)
+        self._quote = quote
+        self._source = quote._tags
+
+    def _write_back(self):
+        """Store the list's contents as the quote's tags, unless the list is detached."""
+        quote = self._quote
+        if quote is None or quote._tags is not self._source:
+            self._quote = None
+            return
+        quote.set_tags(self)
+        self._source = quote._tags
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _writes_back(name):
+    """Return list method ``name`` wrapped to write the changed list back to its quote."""
+    method = getattr(list, name)
+
+    def write_back(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._write_back()
+        return result
+
+    write_back.__name__ = name
+    write_back.__doc__ = method.__doc__
+    return write_back
+
+
+for _name in (
+    'append',
+    'extend',
+    'insert',
+    'remove',
+    'pop',
+    'clear',
+    'sort',
+    'reverse',
+    '__setitem__',
+    '__delitem__',
+    '__iadd__',
+    '__imul__',
+):
+    setattr(_TagList, _name, _writes_back(_name))
+del _name
+
+
+class _TagTuple(tuple):
+    """A shared tag sequence with its star rating precomputed and its tag bitmask cached.
+
+    Attributes:
+        masked (tuple[dict | None, int]): The bit table the mask was built
+            from and the mask, the bitwise OR of the bits of every tag in
+            that table; see :func:`_tag_mask`.
+        num_stars (int): The :meth:`Quote.get_num_stars` value for these tags.
+    """
+
+
+def _shared_tags(tags):
+    """Return the interned tuple holding ``tags``, in order.
+
+    Quote files use a small number of distinct tag combinations, so every
+    quote with the same tags shares one tuple of interned strings.  The
+    tuple also carries the tags' star rating and their bitmask in the
+    current tag snapshot, so tag tests on a quote are a single AND and need
+    no scan of its tags.
+    """
+    key = tuple(tags)
+    shared = _tag_tuples.get(key)
+    if shared is None:
+        shared = _TagTuple(map(sys.intern, key))
+        shared.masked = (None, 0)
+        shared.num_stars = next((i for i, star in enumerate(_STAR_TAGS, 1) if star in shared), 0)
+        # Quotes keep the tuples they already hold; later reads share new ones
+        if len(_tag_tuples) >= _TAG_TUPLES_LIMIT:
+            _tag_tuples.clear()
+        _tag_tuples[key] = shared
+    _tag_mask(shared, _tag_bits)
+    return shared
+
+
+def _new_tag_snapshot():
+    """Start a new, empty tag bit table; called each time a quote file is read.
+
+    Tag tuples are masked again, against the new table, when they are next
+    tested, so the bits of tags that are no longer used go with the old
+    table instead of widening every mask for the life of the process.
+    """
+    global _tag_bits, _stale_masks_possible
+    if _tag_bits:
+        _stale_masks_possible = True
+    _tag_bits = {}
+
+
+def _get_tag_table():
+    """Return the current tag bit table, for a caller that tests many quotes against one table."""
+    return _tag_bits
+
+
+def _tag_mask(tags, table):
+    """Return the bitmask of the :class:`_TagTuple` ``tags`` in ``table``, giving its new tags the next free bits.
+
+    The mask is cached on the tuple along with ``table``, so it is only
+    built again once a new snapshot has replaced the table.
+    """
+    masked_table, mask = tags.masked
+    if masked_table is table:
+        return mask
+    mask = 0
+    for tag in tags:
+        bit = table.get(tag)
+        if bit is None:
+            with _tag_bits_lock:
+                bit = table.setdefault(tag, 1 << len(table))
+        mask |= bit
+    tags.masked = (table, mask)
+    return mask
+
+
+def _required_tag_mask(tags, table):
+    """Return the mask in ``table`` of a quote having every tag in ``tags``, or ``None`` if no quote has them all."""
+    mask = 0
+    for tag in tags:
+        bit = table.get(tag)
+        if bit is None:
+            return None
+        mask |= bit
+    return mask
+
+
+def _query_tag_bits(tags, quotes, table):
+    """Return the bit in ``table`` of each of ``tags``, or 0 for a tag that none of ``quotes`` has.
+
+    A query never assigns a bit, so arbitrary query strings cannot grow the
+    bit table.  An unparsed :class:`LazyQuote`, or a quote read before the
+    current snapshot, has not given its tags bits in ``table``, so when a
+    tag has no bit yet the tags of ``quotes`` are peeked at, without
+    parsing them, and masked in ``table`` before the tag is taken to be
+    unused.
+    """
+    if any(tag not in table for tag in tags):
+        peeked = _peek_tags(quotes)
+        if _stale_masks_possible or table is not _tag_bits:
+            for shared in peeked:
+                if shared.masked[0] is not table:
+                    _tag_mask(shared, table)
+    return [table.get(tag, 0) for tag in tags]
+
+
 def _parse_tags(tag_string):
     """An internal function to parse tags, its error messages are not complete sentence."""
     rawtags = tag_string.split(',')
     tagset = set()
     for rawtag in rawtags:
         tag = rawtag.strip()
-        if not all(c in ascii_letters + '0123456789_' for c in tag):
+        if not _TAG_CHARS.fullmatch(tag):
             raise QuoteValidationError(
                 "invalid tag '{0}': only numbers, letters, and commas are allowed in tags".format(tag),
                 field='tags',
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+#  This file is licensed under the terms of the MIT License.  See the LICENSE
+# file in the root of this repository for complete details.
+
+import csv
+import datetime
+import importlib
+import io
+import json
+import os
+import zoneinfo
+from dataclasses import asdict, dataclass
+
+from jotquote.api import config as _config
+from jotquote.api.exceptions import ConfigError, StorageError
+from jotquote.api.quote import compute_hashes
+from jotquote.api.selection import _EPOCH_DATE, _get_permutation, _get_random_value
+
+# Schedule formats understood by write_schedule() and load_schedule().
+SCHEDULE_FORMATS = ('csv', 'json')
+
+# Columns written for each day; load_schedule() only needs the first four.
+_SCHEDULE_FIELDS = ('date', 'number', 'hash', 'source', 'author', 'quote')
+
+# Time of day from which the quote of the day is the next day's
+_ROLLOVER_TIME = datetime.time(23, 45)
+
+
+@dataclass
+class ScheduleEntry:
+    """The quote of the day for one date.
+
+    Attributes:
+        date (str): The date, as ``YYYYMMDD``.
+        number (int): 1-based position of the quote in the quote file.
+        hash (str): The quote's :meth:`~jotquote.api.Quote.get_hash` value,
+            used to detect that the quote file changed since the schedule
+            was built.
+        source (str): ``'random'`` for the date-seeded selection, or
+            ``'resolver'`` when a quote resolver chose the quote.
+        author (str): The quote's author.
+        quote (str): The quote text.
+    """
+
+    date: str
+    number: int
+    hash: str
+    source: str
+    author: str = ''
+    quote: str = ''
+
+
+def get_quote_date(timezone=None, now=None):
+    """Return the date whose quote of the day is shown now.
+
+    From 11:45 PM on this is the next day, so that pages cached until
+    midnight already hold the next day's quote.  ``jotquote today``,
+    ``jotquote schedule`` and the web viewer all take the day from here.
+
+    Args:
+        timezone (str | None): IANA timezone name (e.g. ``'America/Chicago'``)
+            of the clock.  When ``None``, the system's local time is used.
+        now (datetime.datetime | None): The current time in ``timezone``,
+            for a caller that has already read the clock.
+
+    Returns:
+        datetime.date: The date of the quote of the day.
+
+    Raises:
+        ConfigError: If ``timezone`` is not a known IANA timezone name.
+    """
+    if now is None:
+        if timezone:
+            try:
+                tz = zoneinfo.ZoneInfo(timezone)
+            except zoneinfo.ZoneInfoNotFoundError as e:
+                raise ConfigError(f"Invalid timezone '{timezone}' in [general] section of settings.conf.") from e
+            now = datetime.datetime.now(tz)
+        else:
+            now = datetime.datetime.now()
+    if now.time() >= _ROLLOVER_TIME:
+        return now.date() + datetime.timedelta(days=1)
+    return now.date()
+
+
+def build_schedule(quotes, start_date, days, resolver=None):
+    """Return the quote of the day for each of ``days`` dates starting at ``start_date``.
+
+    The date-seeded permutation behind :func:`jotquote.api.get_random_choice`
+    is computed once and indexed for every date, instead of being rebuilt
+    for each day.  When ``resolver`` is given it is called for every date,
+    and a hash it returns that matches a quote overrides the random choice,
+    as in the web viewer.
+
+    Args:
+        quotes (list[Quote]): The quotes, in file order.
+        start_date (datetime.date): The first date of the schedule.
+        days (int): Number of consecutive dates.
+        resolver (Callable[[str], str | None] | None): Optional quote
+            resolver; receives a ``YYYYMMDD`` date and returns a quote hash
+            or ``None``.  Exceptions it raises propagate.
+
+    Returns:
+        list[ScheduleEntry]: One entry per date, in date order.  Empty if
+            ``quotes`` is empty.
+    """
+    if not quotes or days <= 0:
+        return []
+
+    hashes = compute_hashes(quotes)
+    index_by_hash = {}
+    for index, quote_hash in enumerate(hashes):
+        index_by_hash.setdefault(quote_hash, index)
+
+    permutation = _get_permutation(len(quotes))
+    first_day = (start_date - _EPOCH_DATE).days
+    entries = []
+    for offset in range(days):
+        date = start_date + datetime.timedelta(days=offset)
+        date_string = date.strftime('%Y%m%d')
+        index = permutation[(first_day + offset) % len(quotes)]
+        source = 'random'
+        if resolver is not None:
+            resolved = resolver(date_string)
+            if resolved in index_by_hash:
+                index = index_by_hash[resolved]
+                source = 'resolver'
+        quote = quotes[index]
+        entries.append(ScheduleEntry(date_string, index + 1, hashes[index], source, quote.author, quote.quote))
+    return entries
+
+
+def write_schedule(entries, stream, format='csv'):
+    """Write schedule entries to a text stream.
+
+    Args:
+        entries (list[ScheduleEntry]): The entries to write.
+        stream (TextIO): Destination stream.
+        format (str): ``'csv'`` (with a header row) or ``'json'`` (a list of
+            objects).
+
+    Raises:
+        ValueError: If ``format`` is not one of :data:`SCHEDULE_FORMATS`.
+    """
+    if format == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=_SCHEDULE_FIELDS, lineterminator='\n')
+        writer.writeheader()
+        for entry in entries:
+            writer.writerow(asdict(entry))
+    elif format == 'json':
+        json.dump([asdict(entry) for entry in entries], stream, indent=2, ensure_ascii=False)
+        stream.write('\n')
+    else:
+        raise ValueError('unknown schedule format {0!r}; expected one of {1}'.format(format, SCHEDULE_FORMATS))
+
+
+def load_resolver(config):
+    """Import the quote resolver named by ``quote_resolver_extension`` in the ``[web]`` section.
+
+    The resolver module must define a ``resolve`` function that takes a date
+    as ``YYYYMMDD`` and returns the hash of the quote for that date, or
+    ``None``.
+
+    Args:
+        config (configparser.ConfigParser): Application config.
+
+    Returns:
+        Callable[[str], str | None] | None: The module's ``resolve``
+            function, or ``None`` if no resolver is configured.
+
+    Raises:
+        ConfigError: If the module cannot be imported or has no ``resolve``
+            function.
+    """
+    module_path = config[_config.SECTION_WEB].get('quote_resolver_extension', '')
+    if not module_path:
+        return None
+    try:
+        return getattr(importlib.import_module(module_path), 'resolve')
+    except (ImportError, AttributeError) as e:
+        raise ConfigError("unable to load quote resolver '{0}': {1}".format(module_path, e)) from e
+
+
+def is_entry_current(quotes, entry):
+    """Return True if ``entry`` still names the quote :func:`build_schedule` would choose from ``quotes``.
+
+    The quote at the entry's position must still have the entry's hash.  A
+    ``'random'`` entry must also still be the date-seeded choice for its
+    date, which depends on the number of quotes: once quotes are added or
+    removed, the day's choice moves even if the quote at the old position
+    is unchanged.  A ``'resolver'`` entry stands as long as its quote does,
+    since the resolver is not called again.
+
+    Args:
+        quotes (list[Quote]): The quotes, in file order.
+        entry (ScheduleEntry): An entry loaded by :func:`load_schedule`.
+
+    Returns:
+        bool: Whether the entry can be served in place of choosing again.
+    """
+    if not 1 <= entry.number <= len(quotes) or quotes[entry.number - 1].get_hash() != entry.hash:
+        return False
+    if entry.source == 'random':
+        try:
+            date = datetime.datetime.strptime(entry.date, '%Y%m%d').date()
+        except ValueError:
+            return False
+        return _get_random_value((date - _EPOCH_DATE).days, len(quotes)) == entry.number - 1
+    return True
+
+
+def load_schedule(path):
+    """Load a schedule written by :func:`write_schedule` into a date lookup table.
+
+    The format is taken from the file extension: ``.json`` for JSON,
+    anything else for CSV.
+
+    Args:
+        path (str): Path to the schedule file.
+
+    Returns:
+        dict[str, ScheduleEntry]: Entries keyed by ``YYYYMMDD`` date.
+
+    Raises:
+        StorageError: If the file cannot be read or is not a valid schedule.
+    """
+    try:
+        with open(path, encoding='utf-8', newline='') as f:
+            content = f.read()
+        if os.path.splitext(path)[1].lower() == '.json':
+            rows = json.loads(content)
+        else:
+            rows = list(csv.DictReader(io.StringIO(content)))
+        entries = [
+            ScheduleEntry(
+                str(row['date']),
+                int(row['number']),
+                row['hash'],
+                row['source'],
+                row.get('author', ''),
+                row.get('quote', ''),
+            )
+            for row in rows
+        ]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise StorageError("unable to read the schedule file '{0}': {1}".format(path, e)) from e
+    return {entry.date: entry for entry in entries}
@@ -3,11 +3,25 @@
 # file in the root of this repository for complete details.
 
 import datetime
+import functools
+import hashlib
+import itertools
+import math
+import operator
 import random as randomlib
-import zoneinfo
+import sys
+from array import array
 
-from jotquote.api.exceptions import ConfigError
-from jotquote.api.quote import parse_tags
+from jotquote.api.quote import _get_tag_table, _peek_tags, _query_tag_bits, _tag_mask, compute_hashes, parse_tags
+
+# Day 0 of the daily quote rotation
+_EPOCH_DATE = datetime.date(2016, 1, 1)
+
+# Marks an exhausted iterator in _sample_one(), since None can be an element.
+_NOTHING = object()
+
+# Number of quotes get_first_match() hashes at a time when looking for a hash.
+_HASH_BATCH_QUOTES = 1000
 
 
 def get_first_match(quotes, tags=None, keyword=None, number=None, hash_arg=None, rand=False, excluded_tags=None):
@@ -34,21 +48,91 @@ def get_first_match(quotes, tags=None, keyword=None, number=None, hash_arg=None,
     taglist = parse_tags(tags) if tags is not None else []
     excluded_taglist = parse_tags(excluded_tags) if excluded_tags is not None else []
 
-    matched = [
-        quote
-        for index, quote in enumerate(quotes)
-        if (keyword is None or quote.has_keyword(keyword))
-        and (tags is None or quote.has_tags(taglist))
-        and (number is None or number == index + 1)
-        and (hash_arg is None or hash_arg == quote.get_hash())
-        and not any(t in quote.tags for t in excluded_taglist)
-    ]
-
-    if not matched:
+    # A position leaves at most one candidate
+    candidates = quotes
+    if number is not None:
+        candidates = quotes[number - 1 : number] if number >= 1 else []
+
+    # Tag tests are one AND against each quote's tag bitmask; a required tag no quote has matches nothing
+    table = _get_tag_table()
+    required_bits = _query_tag_bits(taglist, candidates, table)
+    if 0 in required_bits:
         return None
+    required_mask = functools.reduce(operator.or_, required_bits, 0)
+    excluded_mask = functools.reduce(operator.or_, _query_tag_bits(excluded_taglist, candidates, table), 0)
+
+    # Without other criteria every candidate matches, so pick directly
+    if tags is None and keyword is None and hash_arg is None and not excluded_mask:
+        if not candidates:
+            return None
+        return randomlib.choice(candidates) if rand else candidates[0]
+
+    # Matches are generated lazily, cheapest tests first, so nothing is collected
+    matched = candidates
+    if tags is not None or excluded_mask:
+        matched = _match_tags(candidates, table, required_mask, excluded_mask)
+    if hash_arg is not None:
+        matched = _match_hash(matched, hash_arg)
+    if keyword is not None:
+        matched = (quote for quote in matched if quote.has_keyword(keyword))
     if rand:
-        return randomlib.choice(matched)
-    return matched[0]
+        return _sample_one(matched)
+    return next(matched, None)
+
+
+def _match_tags(quotes, table, required_mask, excluded_mask):
+    """Yield the quotes of ``quotes`` whose tag mask in ``table`` has every bit of ``required_mask`` and none of ``excluded_mask``."""
+    for quote in quotes:
+        tags = quote._tags
+        masked_table, mask = tags.masked
+        if masked_table is not table:
+            mask = _tag_mask(tags, table)
+        if mask & required_mask == required_mask and not mask & excluded_mask:
+            yield quote
+
+
+def _match_hash(quotes, hash_arg):
+    """Yield the quotes of the iterable ``quotes`` whose hash is ``hash_arg``.
+
+    Quotes are hashed with :func:`compute_hashes` a batch at a time as they
+    are consumed, so a caller that stops at the first match does not hash,
+    or parse, the quotes after that match's batch.
+    """
+    quotes = iter(quotes)
+    while True:
+        batch = list(itertools.islice(quotes, _HASH_BATCH_QUOTES))
+        if not batch:
+            return
+        for quote, quote_hash in zip(batch, compute_hashes(batch)):
+            if quote_hash == hash_arg:
+                yield quote
+
+
+def _sample_one(items):
+    """Return a uniformly random element of the iterable ``items``, or None if it is empty.
+
+    This is reservoir sampling for a sample of one, with the geometric skips
+    of Li's Algorithm L: each element replaces the current choice with
+    probability 1/i, but instead of drawing a random number per element the
+    number of elements to pass over is drawn directly, so a single pass over
+    n elements uses O(log n) random numbers and the skipped elements are
+    consumed by :func:`itertools.islice`.
+    """
+    items = iter(items)
+    chosen = next(items, _NOTHING)
+    if chosen is _NOTHING:
+        return None
+
+    # The current choice's key; a later element replaces it when its uniform key is smaller
+    weight = randomlib.random()
+    while weight > 0.0:
+        skip = min(math.floor(math.log(1.0 - randomlib.random()) / math.log1p(-weight)), sys.maxsize)
+        candidate = next(itertools.islice(items, skip, None), _NOTHING)
+        if candidate is _NOTHING:
+            break
+        chosen = candidate
+        weight *= randomlib.random()
+    return chosen
 
 
 def get_random_choice(numquotes, timezone=None):
@@ -70,35 +154,244 @@ def get_random_choice(numquotes, timezone=None):
     Raises:
         ConfigError: If ``timezone`` is not a known IANA timezone name.
     """
+    return _get_random_value(_get_days_since_epoch(timezone), numquotes)
+
+
+def get_channel_choice(quotes, tag, timezone=None):
+    """Return the position of today's quote in the daily channel of ``tag``.
+
+    Each tag is a channel with its own deterministic quote of the day, chosen
+    from the quotes that have the tag the same way :func:`get_random_choice`
+    chooses from all quotes, and changing at the same time.
+
+    The positions of every tag are collected in one pass over ``quotes``, and
+    each channel's rotation order is computed the first time it is used.
+    Both are cached for the list object passed: they are reused while the
+    same list (of the same length) is passed again and rebuilt for any
+    other list.  A caller must therefore keep its quote list between calls,
+    as the web viewer does until the quote file changes, to pay for them
+    once per quote file version rather than once per call.
+
+    Args:
+        quotes (list[Quote]): All quotes, in file order.
+        tag (str): The channel's tag.
+        timezone (str | None): IANA timezone name used to determine "today",
+            as for :func:`get_random_choice`.
+
+    Returns:
+        int | None: A 0-based position in ``quotes``, or ``None`` if no quote
+            has ``tag``.
+
+    Raises:
+        ConfigError: If ``timezone`` is not a known IANA timezone name.
+    """
+    channels = _get_channels(quotes)
+    order = channels.orders.get(tag)
+    if order is None:
+        positions = channels.positions.get(tag)
+        if positions is None:
+            return None
+        permutation = _get_permutation(len(positions))
+        order = channels.orders[tag] = tuple(positions[i] for i in permutation)
+    return order[_get_days_since_epoch(timezone) % len(order)]
+
+
+def get_channel_random_choice(quotes, tag, rng=None):
+    """Return the position of a random quote with ``tag``.
+
+    The quote is drawn from the channel positions cached by
+    :func:`get_channel_choice`, so no quote is parsed or scanned once they
+    have been collected for ``quotes``.
+
+    Args:
+        quotes (list[Quote]): All quotes, in file order.
+        tag (str): The channel's tag.
+        rng (random.Random | None): Source of randomness; defaults to the
+            :mod:`random` module's shared generator.
+
+    Returns:
+        int | None: A 0-based position in ``quotes``, or ``None`` if no quote
+            has ``tag``.
+    """
+    positions = _get_channels(quotes).positions.get(tag)
+    if positions is None:
+        return None
+    return positions[(randomlib if rng is None else rng).randrange(len(positions))]
 
-    # Get days since epoch, advancing to next day after 11:45 PM so caches
-    # expiring at midnight will already contain the next day's quote
-    if timezone:
-        try:
-            tz = zoneinfo.ZoneInfo(timezone)
-        except zoneinfo.ZoneInfoNotFoundError as e:
-            raise ConfigError(f"Invalid timezone '{timezone}' in [general] section of settings.conf.") from e
-        now = datetime.datetime.now(tz)
-    else:
-        now = datetime.datetime.now()
-    if now.hour == 23 and now.minute >= 45:
-        endday = (now + datetime.timedelta(days=1)).date()
-    else:
-        endday = now.date()
-    beginday = datetime.date(2016, 1, 1)
-    days_since_epoch = (endday - beginday).days
-
-    # Get quote index
-    index = _get_random_value(days_since_epoch, numquotes)
-    return index
+
+def get_rotation_choice(numquotes, cursor):
+    """Return the quote position at step ``cursor`` of the no-repeat rotation.
+
+    The rotation walks a seeded shuffle of all positions, so successive
+    cursors show every quote once before any quote is shown again.  Each
+    pass uses a different shuffle; only the last quote of one pass can
+    come up again first in the next.  A caller keeps just the cursor, an
+    integer it increments after each quote shown.  The shuffle is computed
+    for the one step asked for, so the cost does not depend on the number
+    of quotes or on how many passes are in use at once.
+
+    Args:
+        numquotes (int): Total number of quotes.
+        cursor (int): Non-negative step in the rotation.
+
+    Returns:
+        int: A value in ``[0, numquotes - 1]``.
+    """
+    rotation, step = divmod(cursor, numquotes)
+    return _permute(step, numquotes, rotation)
+
+
+def get_star_weighted_choice(quotes, rng=None):
+    """Return the position of a random quote, weighted by star rating.
+
+    A quote with N stars is N times as likely to be chosen as a quote with
+    one star; quotes without a star tag count as one star.  Draws use an
+    alias table built from the ratings of ``quotes``, so each one costs two
+    random numbers regardless of the number of quotes.  The table is cached
+    for the list object passed and rebuilt for any other list (or the same
+    list with a different length), so a caller must keep its quote list
+    between calls, as the web viewer does, to build it once per quote file
+    version.
+
+    Args:
+        quotes (list[Quote]): The quotes to choose from.
+        rng (random.Random | None): Source of randomness; defaults to the
+            :mod:`random` module's shared generator.
+
+    Returns:
+        int | None: A 0-based position in ``quotes``, or ``None`` if
+            ``quotes`` is empty.
+    """
+    if not quotes:
+        return None
+    return _get_star_table(quotes).sample(randomlib if rng is None else rng)
+
+
+class _AliasTable:
+    """Vose's alias method for drawing indexes in proportion to integer weights.
+
+    Each index ``i`` keeps ``i`` itself with probability ``prob[i] / total``
+    and otherwise yields ``alias[i]``.  Integer weights keep the table exact.
+    """
+
+    def __init__(self, weights):
+        count = len(weights)
+        total = sum(weights)
+        scaled = [weight * count for weight in weights]
+        self.total = total
+        self.prob = array('q', [total]) * count
+        self.alias = array('I', range(count))
+
+        small = [i for i, weight in enumerate(scaled) if weight < total]
+        large = [i for i, weight in enumerate(scaled) if weight >= total]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= total - scaled[less]
+            (small if scaled[more] < total else large).append(more)
+
+    def sample(self, rng):
+        """Return a random index, using ``rng.randrange``."""
+        index = rng.randrange(len(self.prob))
+        if rng.randrange(self.total) < self.prob[index]:
+            return index
+        return self.alias[index]
+
+
+class _Channels:
+    """Per-tag quote positions and rotation orders for one quote list."""
+
+    def __init__(self, quotes):
+        self.quotes = quotes
+        self.length = len(quotes)
+        self.orders = {}
+
+        # Quotes share tag tuples, so group positions by tuple before fanning out to tags
+        positions_by_tags = {}
+        for index, tags in enumerate(_peek_tags(quotes)):
+            positions_by_tags.setdefault(tags, []).append(index)
+        self.positions = {}
+        for tags, positions in positions_by_tags.items():
+            for tag in tags:
+                self.positions.setdefault(tag, []).extend(positions)
+        for positions in self.positions.values():
+            positions.sort()
+
+
+# Channels of the most recently used quote list
+_channels = None
+
+
+def _get_channels(quotes):
+    """Return the cached :class:`_Channels` for ``quotes``, rebuilding them for a new list."""
+    global _channels
+    channels = _channels
+    if channels is None or channels.quotes is not quotes or channels.length != len(quotes):
+        channels = _channels = _Channels(quotes)
+    return channels
+
+
+# Star-weighted alias table of the most recently used quote list, with that list and its length
+_star_table = (None, 0, None)
+
+
+def _get_star_table(quotes):
+    """Return the cached star-weighted :class:`_AliasTable` for ``quotes``, rebuilding it for a new list."""
+    global _star_table
+    cached_quotes, length, table = _star_table
+    if cached_quotes is not quotes or length != len(quotes):
+        table = _AliasTable([tags.num_stars or 1 for tags in _peek_tags(quotes)])
+        _star_table = (quotes, len(quotes), table)
+    return table
+
+
+def _get_days_since_epoch(timezone):
+    """Return the day number of "today" in the daily rotation."""
+    # Imported here, as the schedule module imports this one
+    from jotquote.api.schedule import get_quote_date
+
+    return (get_quote_date(timezone) - _EPOCH_DATE).days
 
 
 def _get_random_value(days_since_epoch, numquotes):
     """This function returns a random value between 0 and numquotes - 1.  For a given
     days_since_epoch and numquotes, it will always return the same value.
     """
-    numlist = list(range(0, numquotes))
-    randomlib.seed(0)
-    randomlib.shuffle(numlist)
-    index = days_since_epoch % numquotes
-    return numlist[index]
+    permutation = _get_permutation(numquotes)
+    return permutation[days_since_epoch % numquotes]
+
+
+@functools.lru_cache(maxsize=4)
+def _get_permutation(numquotes):
+    """Return the fixed shuffle of ``range(numquotes)`` that the daily rotation walks through.
+
+    The shuffle is seeded with 0 so it is the same in every process.  It is
+    cached per quote count, so picking the quote for a day is an index into
+    this tuple once it has been built.
+    """
+    numlist = list(range(numquotes))
+    randomlib.Random(0).shuffle(numlist)
+    return tuple(numlist)
+
+
+def _permute(index, size, key):
+    """Return the image of ``index`` under a keyed pseudo-random permutation of ``range(size)``.
+
+    A four-round Feistel network is a permutation of the integers with an
+    even number of bits; applying it repeatedly until the result is below
+    ``size`` (cycle walking) restricts it to ``range(size)``.  The network
+    covers at most four times ``size`` values, so few walks are needed on
+    average, and nothing is stored.
+    """
+    half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+    mask = (1 << half_bits) - 1
+    value = index
+    while True:
+        left, right = value >> half_bits, value & mask
+        for round_number in range(4):
+            digest = hashlib.blake2b(b'%d:%d:%d' % (key, round_number, right), digest_size=8).digest()
+            left, right = right, left ^ (int.from_bytes(digest, 'big') & mask)
+        value = (left << half_bits) | right
+        if value < size:
+            return value
@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+#  This file is licensed under the terms of the MIT License.  See the LICENSE
+# file in the root of this repository for complete details.
+
+import collections
+import functools
+import hashlib
+import itertools
+import os
+import re
+import struct
+import unicodedata
+from dataclasses import dataclass
+
+from jotquote.api.exceptions import StorageError
+
+# Words of a quote's text, compared in lowercase; each pair of adjacent words is one shingle.
+_WORD_RE = re.compile(r'\w+')
+
+# Quotes with fewer words are too short to call near duplicates; duplicate-hash covers them.
+_MIN_WORDS = 4
+
+# LSH bands of MinHash rows.  Two quotes become candidates when all rows of
+# any band agree, which happens with probability 1 - (1 - s**4)**8 for word
+# pair similarity s: 0.99 at 0.8, 0.89 at 0.7, 0.06 at 0.3.
+_BANDS = 8
+_ROWS = 4
+_HASHES = _BANDS * _ROWS
+
+# The 16-bit MinHash rows of a signature are packed into one int, each
+# followed by a guard bit so all rows can be compared at once.
+_LANE_BITS = 17
+_GUARDS = sum(1 << (lane * _LANE_BITS + 16) for lane in range(_HASHES))
+_BAND_BITS = _ROWS * _LANE_BITS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+_unpack_rows = struct.Struct('<{0}H'.format(_HASHES)).unpack
+
+# Signature file layout: a header line, then an 8-byte text digest and a signature per quote.
+_SIGNATURE_HEADER = b'jotquote-minhash 1\n'
+_DIGEST_SIZE = 8
+_SIGNATURE_SIZE = (_HASHES * _LANE_BITS + 7) // 8
+
+# Signature of a quote too short to compare
+_NO_SIGNATURE = 0
+
+# Parts of an author's name: runs of letters, with apostrophes inside names such as "O'Brien"
+_NAME_PART_RE = re.compile(r"[^\W\d_]+(?:['\u2019][^\W\d_]+)*")
+
+# Name parts left out when comparing authors
+_NAME_TITLES = frozenset({'dr', 'mr', 'mrs', 'ms', 'prof', 'rev', 'sir', 'dame'})
+_NAME_SUFFIXES = frozenset({'jr', 'sr', 'ii', 'iii', 'iv'})
+
+# Shortest surname compared with surnames spelled one letter differently
+_MIN_MISSPELLED_SURNAME = 6
+
+
+@dataclass(frozen=True)
+class NearDuplicate:
+    """A quote whose text is nearly the same as an earlier quote's.
+
+    Attributes:
+        index (int): 0-based position of the quote in the list.
+        original (int): 0-based position of the earlier quote.
+        similarity (float): The share of adjacent word pairs the two quote
+            texts have in common (their Jaccard similarity), from 0 to 1.
+    """
+
+    index: int
+    original: int
+    similarity: float
+
+
+def find_near_duplicates(quotes, threshold, signatures=None):
+    """Return the pairs of quotes in ``quotes`` whose texts are at least ``threshold`` similar.
+
+    Texts are compared by the sets of adjacent word pairs they contain,
+    ignoring case and punctuation, so a quote with a word added, removed or
+    changed is still similar to the original.  Comparing every pair would
+    take time proportional to the square of the number of quotes.  Instead,
+    each quote gets a MinHash signature, and locality-sensitive hashing
+    of its bands pairs up quotes that are likely to be similar in one pass.
+    Only those pairs are compared exactly.  A pair below about 0.6 is
+    rarely paired up, so lower thresholds find only some of them.
+
+    Args:
+        quotes (list[Quote]): The quotes to compare.
+        threshold (float): Smallest similarity reported, from 0 to 1.
+        signatures (dict | None): Signatures to reuse, from an earlier
+            call given the same dict or from :func:`read_signatures`.  The
+            dict is keyed by a digest of the quote text and updated in
+            place to hold the signatures of ``quotes``.
+
+    Returns:
+        list[NearDuplicate]: For each quote similar to an earlier one, the
+            most similar of the earliest candidates found, in quote order.
+    """
+    texts = [quote.quote for quote in quotes]
+    word_hashes = {}
+    if signatures is None:
+        by_text = {text: _signature(text, word_hashes) for text in dict.fromkeys(texts)}
+        signature_list = [by_text[text] for text in texts]
+    else:
+        signature_list = _cached_signatures(texts, word_hashes, signatures)
+
+    # A quote with the same signature as an earlier quote, usually the same text, is paired with it directly
+    candidates = {}
+    firsts = {}
+    for index, signature in enumerate(signature_list):
+        if signature != _NO_SIGNATURE:
+            original = firsts.setdefault(signature, index)
+            if original != index:
+                candidates[index] = {original}
+
+    # Each band pairs a quote with the first earlier quote that has the same band key
+    for band in range(_BANDS):
+        shift = band * _BAND_BITS
+        first = {}
+        for signature, index in firsts.items():
+            original = first.setdefault((signature >> shift) & _BAND_MASK, index)
+            if original != index:
+                candidates.setdefault(index, set()).add(original)
+
+    found = []
+    shingles = {}
+    for index in sorted(candidates):
+        text = texts[index]
+        best = None
+        for original in sorted(candidates[index]):
+            original_text = texts[original]
+            if original_text == text:
+                similarity = 1.0
+            else:
+                for key in (text, original_text):
+                    if key not in shingles:
+                        shingles[key] = _shingles(key)
+                a, b = shingles[text], shingles[original_text]
+                similarity = len(a & b) / len(a | b)
+            if similarity >= threshold and (best is None or similarity > best.similarity):
+                best = NearDuplicate(index, original, similarity)
+        if best is not None:
+            found.append(best)
+    return found
+
+
+def _cached_signatures(texts, word_hashes, signatures):
+    """Return the signatures of ``texts``, computing only those missing from ``signatures``."""
+    digests = [
+        int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=_DIGEST_SIZE).digest(), 'little')
+        for text in texts
+    ]
+    signature_list = list(map(signatures.get, digests))
+    missed = False
+    for index, signature in enumerate(signature_list):
+        if signature is None:
+            signature = signatures[digests[index]] = _signature(texts[index], word_hashes)
+            signature_list[index] = signature
+            missed = True
+
+    # Keep only the signatures of these quotes, unless nothing has changed
+    distinct = dict.fromkeys(digests)
+    if missed or len(signatures) != len(distinct):
+        current = {digest: signatures[digest] for digest in distinct}
+        signatures.clear()
+        signatures.update(current)
+    return signature_list
+
+
+def _shingles(text):
+    """Return the set of adjacent word pairs of ``text``."""
+    words = _WORD_RE.findall(text.lower())
+    return set(zip(words, words[1:]))
+
+
+def _signature(text, word_hashes):
+    """Return the MinHash signature of ``text``, with its rows packed into one int.
+
+    Each of the rows is the minimum, over the word pairs of the text, of a
+    16-bit hash of the pair.  A pair's hashes are those of its first word
+    as a first word XORed with those of its second word as a second word
+    (simple tabulation hashing, with words as the characters).  So only
+    words are ever hashed, and ``word_hashes`` keeps their packed hashes.
+    The rows of two packed values are compared all at once: subtracting
+    one from the other with every guard bit set leaves a guard bit set
+    where the first value's row is not smaller.
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < _MIN_WORDS:
+        return _NO_SIGNATURE
+    signature = None
+    previous = None
+    for word in words:
+        hashes = word_hashes.get(word)
+        if hashes is None:
+            hashes = word_hashes[word] = _word_hashes(word)
+        if previous is not None:
+            pair = previous ^ hashes[1]
+            if signature is None:
+                signature = pair
+            else:
+                not_smaller = ((signature | _GUARDS) - pair) & _GUARDS
+                signature ^= (signature ^ pair) & (not_smaller - (not_smaller >> 16))
+        previous = hashes[0]
+    return signature
+
+
+def _word_hashes(word):
+    """Return the packed hashes of ``word`` as the first and as the second word of a pair."""
+    encoded = word.encode('utf-8')
+    return tuple(
+        sum(row << (lane * _LANE_BITS) for lane, row in enumerate(_unpack_rows(digest)))
+        for digest in (
+            hashlib.blake2b(encoded, digest_size=2 * _HASHES, person=b'first').digest(),
+            hashlib.blake2b(encoded, digest_size=2 * _HASHES, person=b'second').digest(),
+        )
+    )
+
+
+def find_author_variants(quotes):
+    """Return the authors of ``quotes`` that look like another way of writing another author's name.
+
+    Two names are variants when they have the same surname and their other
+    names agree in order, where an initial agrees with any name starting
+    with that letter: "R. W. Emerson", "Ralph Emerson" and "Emerson, Ralph
+    Waldo" are all variants of "Ralph Waldo Emerson", but "Jane Smith" is
+    not a variant of "John Smith".  Names with the same first name whose
+    surnames, of six letters or more, differ by one letter other than the
+    first ("Emmerson") are variants too.
+    Case, accents, titles such as "Dr." and suffixes such as "Jr." are
+    ignored, and names of a single word are never variants.
+
+    Comparing every pair of authors would take time proportional to the
+    square of their number.  Instead, authors are grouped by cheap keys:
+    their surname and first initial, with full first names kept apart, and
+    their first name with each one-letter deletion of their surname.  Only
+    authors in the same group are compared.  The keys of each author name
+    are cached.
+
+    Args:
+        quotes (list[Quote]): The quotes whose authors are compared.
+
+    Returns:
+        dict[str, str]: Each author that has a variant with more quotes
+            (or, with as many quotes, a longer name), mapped to the variant
+            with the most quotes, in order of author.
+    """
+    counts = collections.Counter(quote.author for quote in quotes)
+    keys = {}
+    blocks = {}
+    for author in counts:
+        key = _author_key(author)
+        if key is not None:
+            keys[author] = key
+            given, surname = key
+            blocks.setdefault((surname, given[0][0]), {}).setdefault(given[0], []).append(author)
+
+    # Authors with the same surname and first name, or with an initial for the first name
+    candidates = []
+    for by_first_name in blocks.values():
+        initialed = by_first_name.get(next(iter(by_first_name))[0])
+        for first_name, authors in by_first_name.items():
+            if len(authors) > 1:
+                candidates.append(itertools.combinations(authors, 2))
+            if initialed and len(first_name) > 1:
+                candidates.append(itertools.product(initialed, authors))
+
+    # Authors with the same first name whose surnames share a deletion of one letter after the first
+    by_surname = {}
+    for author, (given, surname) in keys.items():
+        if len(given[0]) > 1 and len(surname) >= _MIN_MISSPELLED_SURNAME:
+            by_surname.setdefault(surname, {}).setdefault(given[0], []).append(author)
+    deletions = {}
+    for surname in by_surname:
+        for deleted in {surname} | {surname[:i] + surname[i + 1 :] for i in range(1, len(surname))}:
+            deletions.setdefault(deleted, []).append(surname)
+    misspelled = {pair for surnames in deletions.values() for pair in itertools.combinations(sorted(surnames), 2)}
+    for first, second in misspelled:
+        first_names, second_names = by_surname[first], by_surname[second]
+        for first_name in first_names.keys() & second_names.keys():
+            candidates.append(itertools.product(first_names[first_name], second_names[first_name]))
+
+    def rank(author):
+        return (counts[author], len(author), author)
+
+    preferred = {}
+    for first, second in itertools.chain.from_iterable(candidates):
+        if not _given_names_agree(keys[first][0], keys[second][0]):
+            continue
+        variant, better = (first, second) if rank(first) < rank(second) else (second, first)
+        current = preferred.get(variant)
+        if current is None or rank(better) > rank(current):
+            preferred[variant] = better
+    return dict(sorted(preferred.items()))
+
+
+@functools.lru_cache(maxsize=1 << 20)
+def _author_key(author):
+    """Return the other names and the surname of ``author``, normalized for comparison, or None for a single name.
+
+    The other names are a tuple of lowercase names and single-letter
+    initials.  "Last, First" is read as "First Last", and a short
+    uppercase name before the surname, as in "RW Emerson", as initials.
+    """
+    text = ''.join(c for c in unicodedata.normalize('NFKD', author) if not unicodedata.combining(c))
+    if text.count(',') == 1:
+        last, first = text.split(',')
+        if first.strip(' .').lower() not in _NAME_SUFFIXES:
+            text = '{0} {1}'.format(first, last)
+    parts = [
+        part
+        for part in _NAME_PART_RE.findall(text)
+        if part.lower() not in _NAME_TITLES and part.lower() not in _NAME_SUFFIXES
+    ]
+    if len(parts) < 2 or len(parts[-1]) < 2:
+        return None
+    given = []
+    for part in parts[:-1]:
+        if part.isupper() and 1 < len(part) <= 3:
+            given.extend(part.lower())
+        else:
+            given.append(part.lower().replace('\u2019', "'"))
+    return tuple(given), parts[-1].lower().replace('\u2019', "'")
+
+
+def _given_names_agree(first, second):
+    """Return True if the names of ``first`` agree, in order, with the first and some later names of ``second``.
+
+    The shorter of the two tuples is matched against the longer.  A name
+    agrees with itself, and an initial agrees with any name that starts
+    with it.
+    """
+    if len(first) > len(second):
+        first, second = second, first
+    if not _names_agree(first[0], second[0]):
+        return False
+    position = 1
+    for name in first[1:]:
+        while position < len(second) and not _names_agree(name, second[position]):
+            position += 1
+        if position == len(second):
+            return False
+        position += 1
+    return True
+
+
+def _names_agree(first, second):
+    """Return True if the names are equal, or one is the initial of the other."""
+    return first == second or ((len(first) == 1 or len(second) == 1) and first[0] == second[0])
+
+
+def read_signatures(path):
+    """Load signatures saved by :func:`write_signatures`, for :func:`find_near_duplicates`.
+
+    Args:
+        path (str): Path of the signature file.
+
+    Returns:
+        dict[int, int]: The saved signatures, or an empty dict if the file is
+            missing, unreadable, or was written by an incompatible version.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return {}
+    record_size = _DIGEST_SIZE + _SIGNATURE_SIZE
+    if not data.startswith(_SIGNATURE_HEADER) or (len(data) - len(_SIGNATURE_HEADER)) % record_size:
+        return {}
+    view = memoryview(data)
+    return {
+        int.from_bytes(view[start : start + _DIGEST_SIZE], 'little'): int.from_bytes(
+            view[start + _DIGEST_SIZE : start + record_size], 'little'
+        )
+        for start in range(len(_SIGNATURE_HEADER), len(data), record_size)
+    }
+
+
+def write_signatures(path, signatures):
+    """Save the ``signatures`` of :func:`find_near_duplicates` to ``path``, replacing the file atomically.
+
+    Args:
+        path (str): Path of the signature file.  Missing directories are created.
+        signatures (dict[int, int]): The signatures to save.
+
+    Raises:
+        StorageError: If the file cannot be written.
+    """
+    content = _SIGNATURE_HEADER + b''.join(
+        digest.to_bytes(_DIGEST_SIZE, 'little') + signature.to_bytes(_SIGNATURE_SIZE, 'little')
+        for digest, signature in signatures.items()
+    )
+    temp_path = '{0}.{1}.tmp'.format(path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+    except OSError as e:
+        raise StorageError("unable to write the signature file '{0}': {1}".format(path, e)) from e
@@ -2,10 +2,14 @@
 #  This file is licensed under the terms of the MIT License.  See the LICENSE
 # file in the root of this repository for complete details.
 
+import contextlib
 import hashlib
+import io
 import os
 import random as randomlib
 import shutil
+import sys
+import time
 
 from jotquote.api import config as _config
 from jotquote.api.exceptions import (
@@ -17,14 +21,35 @@ from jotquote.api.exceptions import (
     QuoteValidationError,
     StorageError,
 )
-from jotquote.api.quote import Quote, _parse_quote
+from jotquote.api.quote import (
+    LazyQuote,
+    Quote,
+    _gc_paused,
+    _new_tag_snapshot,
+    _parse_quote,
+    _parse_quotes_extended_fast,
+    _shared_tags,
+    compute_hashes,
+)
+
+# Valid values of the [general] durability property, from weakest to strongest.
+DURABILITY_MODES = ('none', 'file', 'full')
+
+# Quote file extensions that are transparently decompressed on read and compressed on write.
+COMPRESSED_EXTENSIONS = ('.gz', '.xz')
 
+# Files smaller than this are always parsed serially by read_quotes(workers=N);
+# below it, starting the worker pool costs more than it saves.
+_MIN_PARALLEL_PARSE_CHARS = 1024 * 1024
 
-def read_quotes(filename):
+
+def read_quotes(filename, workers=None):
     """Read all quotes from the given quote file.
 
     Args:
         filename (str): Path to the quote file to read.
+        workers (int | None): Number of CPU cores to parse with.  See
+            :func:`read_quotes_with_hash`.
 
     Returns:
         list[Quote]: The parsed quotes, in file order.
@@ -33,15 +58,27 @@ def read_quotes(filename):
         StorageError: If the file does not exist.
         QuoteValidationError: If the file has a malformed line.
     """
-    quotes, _ = read_quotes_with_hash(filename)
+    quotes, _ = read_quotes_with_hash(filename, workers=workers)
     return quotes
 
 
-def read_quotes_with_hash(filename):
+def read_quotes_with_hash(filename, workers=None):
     """Read quotes and compute the SHA-256 hash of the file in a single pass.
 
+    Quote files whose name ends in ``.gz`` or ``.xz`` are decompressed while
+    they are parsed.  The returned hash is always of the bytes on disk, so
+    for compressed files it is the hash of the compressed data.
+
+    With ``workers`` greater than 1, files of a megabyte or more are split
+    on line boundaries and the chunks are parsed in a process pool (or a
+    thread pool on free-threaded Python builds).  The result, including the
+    line number reported for a syntax error, is identical to the serial
+    path.
+
     Args:
         filename (str): Path to the quote file to read.
+        workers (int | None): Number of parallel workers; ``None`` or ``1``
+            parses serially.
 
     Returns:
         tuple[list[Quote], str]: The parsed quotes and the hex SHA-256 digest
@@ -51,21 +88,86 @@ def read_quotes_with_hash(filename):
         StorageError: If the file does not exist.
         QuoteValidationError: If the file has a malformed line.
     """
+    if workers is not None and workers < 1:
+        raise ValueError('workers must be a positive integer.')
+
     if not os.path.exists(filename):
         raise StorageError("The quote file '{0}' was not found.".format(filename))
 
     with open(filename, 'rb') as f:
         raw = f.read()
+    _new_tag_snapshot()
 
     # Get the SHA-256 hash of the file contents while we have it in memory, to avoid a second pass over the file.
     sha256_hex = _sha256_hex(raw)
 
-    lines = raw.decode('utf-8').splitlines()
-    quotes = parse_quotes(lines, filename, simple_format=False)
+    if workers is not None and workers > 1:
+        if _get_compression(filename) is None:
+            text = raw.decode('utf-8')
+        else:
+            text = ''.join(line + '\n' for line in _iter_decompressed_lines(raw, filename))
+        quotes = _parse_parallel(text, filename, workers)
+    else:
+        if _get_compression(filename) is None:
+            lines = raw.decode('utf-8').splitlines()
+        else:
+            lines = _iter_decompressed_lines(raw, filename)
+        quotes = _parse_split_lines(lines, filename)
 
     return quotes, sha256_hex
 
 
+def read_quotes_lazy(filename, strict=False):
+    """Read the quote file, deferring the parsing of each quote until it is used.
+
+    Each non-blank, non-comment line becomes a :class:`LazyQuote` that is
+    split and validated the first time one of its fields is accessed, so
+    callers that display one quote out of many, such as ``jotquote today``,
+    do not pay to parse the rest.  The list has the same length, order, and
+    line numbers as :func:`read_quotes` returns.
+
+    Args:
+        filename (str): Path to the quote file to read.
+        strict (bool): If ``True``, every line is parsed and validated up
+            front exactly as :func:`read_quotes` does, so a malformed line
+            raises here rather than on first access.  Fully parsed quotes
+            are returned.
+
+    Returns:
+        list[Quote]: The quotes, in file order.
+
+    Raises:
+        StorageError: If the file does not exist.
+        QuoteValidationError: If ``strict`` is ``True`` and the file has a
+            malformed line.  Otherwise raised when a malformed quote is
+            first accessed.
+    """
+    if strict:
+        return read_quotes(filename)
+
+    if not os.path.exists(filename):
+        raise StorageError("The quote file '{0}' was not found.".format(filename))
+
+    with open(filename, 'rb') as f:
+        raw = f.read()
+    _new_tag_snapshot()
+    if _get_compression(filename) is None:
+        lines = raw.decode('utf-8').splitlines()
+    else:
+        lines = _iter_decompressed_lines(raw, filename)
+
+    def parse_line(line, linenum):
+        return _parse_line(line, linenum, filename, simple_format=False)
+
+    quotes = []
+    with _gc_paused():
+        for linenum, rawline in enumerate(lines, 1):
+            line = rawline.strip()
+            if line and line[0] != '#':
+                quotes.append(LazyQuote(line, linenum, parse_line))
+    return quotes
+
+
 def read_tags(quotefile):
     """Return a sorted list of every unique tag used in the given quote file.
 
@@ -127,20 +229,128 @@ def parse_quotes(rawlines, filename, encoding=None, simple_format=True):
         if line.startswith('#'):
             continue
 
-        try:
-            quote = _parse_quote(line, simple_format=simple_format)
-            quote.line_number = linenum
-            quotes.append(quote)
-        except Exception as exception:
-            raise QuoteValidationError(
-                'syntax error on line {0} of {1}: {2}.  Line with error: "{3}"'.format(
-                    str(linenum), filename, str(exception), line
-                )
-            )
+        quote = _parse_line(line, linenum, filename, simple_format)
+        quotes.append(quote)
 
     return quotes
 
 
+def _parse_split_lines(lines, filename, first_line=1):
+    """Batch-parse pipe-delimited lines produced by ``str.splitlines()``.
+
+    Equivalent to ``parse_quotes(lines, filename, simple_format=False)`` but
+    several times faster on large files.  Lines the batch parser declines
+    are re-parsed by :func:`_parse_line`, so quotes and error messages are
+    identical.
+    """
+
+    def parse_slow_line(line, linenum):
+        return _parse_line(line, linenum, filename, simple_format=False)
+
+    return _parse_quotes_extended_fast(lines, parse_slow_line, first_line)
+
+
+def _parse_parallel(text, filename, workers):
+    """Parse the decoded quote file ``text`` across ``workers`` processes or threads."""
+    if len(text) < _MIN_PARALLEL_PARSE_CHARS:
+        return _parse_split_lines(text.splitlines(), filename)
+
+    # Give each chunk the global line number of its first line so that quotes
+    # and syntax errors carry the same line numbers as the serial path.
+    chunks = _split_on_line_boundaries(text, workers)
+    first_lines = []
+    next_line = 1
+    for chunk in chunks:
+        first_lines.append(next_line)
+        next_line += len(chunk.splitlines())
+
+    # Imported only for large files; it is slow to import
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    # executor.map() yields in chunk order and re-raises the first failing
+    # chunk's error, so the error reported is the first one in the file.
+    if _is_free_threaded():
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_parse_chunk, chunks, [filename] * len(chunks), first_lines)
+            return [quote for chunk_quotes in results for quote in chunk_quotes]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_parse_chunk_fields, chunks, [filename] * len(chunks), first_lines))
+    return _quotes_from_fields(results)
+
+
+def _split_on_line_boundaries(text, count):
+    """Split ``text`` into about ``count`` chunks, each ending just after a newline."""
+    chunk_size = len(text) // count + 1
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = text.find('\n', start + chunk_size)
+        end = len(text) if end == -1 else end + 1
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+def _parse_chunk(chunk, filename, first_line):
+    """Parse one chunk of a quote file; runs in a worker."""
+    return _parse_split_lines(chunk.splitlines(), filename, first_line)
+
+
+def _parse_chunk_fields(chunk, filename, first_line):
+    """Parse one chunk in a worker process and return its quotes as flat fields.
+
+    Pickling plain strings back to the parent is several times cheaper than
+    pickling :class:`Quote` objects.  Returns ``(fields, line_numbers)``
+    where ``fields`` holds four strings per quote: quote, author,
+    publication, and the comma-joined tags.
+    """
+    fields = []
+    line_numbers = []
+    for quote in _parse_chunk(chunk, filename, first_line):
+        fields.extend((quote.quote, quote.author, quote.publication, ','.join(quote.tags)))
+        line_numbers.append(quote.line_number)
+    return fields, line_numbers
+
+
+def _quotes_from_fields(results):
+    """Rebuild quotes from the ``(fields, line_numbers)`` results of :func:`_parse_chunk_fields`."""
+    quotes = []
+    tag_cache = {'': _shared_tags(())}
+    new_quote = Quote._from_valid_fields
+    with _gc_paused():
+        for fields, line_numbers in results:
+            for i, line_number in enumerate(line_numbers):
+                text, author, publication, tags_string = fields[4 * i : 4 * i + 4]
+                tags = tag_cache.get(tags_string)
+                if tags is None:
+                    tags = tag_cache[tags_string] = _shared_tags(tags_string.split(','))
+                quote = new_quote(text, author, publication, tags)
+                quote.line_number = line_number
+                quotes.append(quote)
+    return quotes
+
+
+def _is_free_threaded():
+    """Return True when running on a free-threaded (no-GIL) Python build."""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _parse_line(line, linenum, filename, simple_format):
+    """Parse one stripped, non-comment line, wrapping any error with its location."""
+    try:
+        quote = _parse_quote(line, simple_format=simple_format)
+    except Exception as exception:
+        raise QuoteValidationError(
+            'syntax error on line {0} of {1}: {2}.  Line with error: "{3}"'.format(
+                str(linenum), filename, str(exception), line
+            )
+        )
+    quote.line_number = linenum
+    return quote
+
+
 def settags(quotefile, n, hash, newtags):
     """Set tags on the quote identified by number (1-based) or hash.
 
@@ -172,7 +382,7 @@ def settags(quotefile, n, hash, newtags):
             raise QuoteNotFoundError('quote number {0} is out of range (1-{1}).'.format(n, len(quotes)))
         quote = quotes[n - 1]
     else:
-        matched = [q for q in quotes if q.get_hash() == hash]
+        matched = [q for q, h in zip(quotes, compute_hashes(quotes)) if h == hash]
         if not matched:
             raise QuoteNotFoundError("no quote found with hash '{0}'.".format(hash))
         quote = matched[0]
@@ -289,7 +499,7 @@ def add_quotes(filename, newquotes):
     quotes, sha256 = read_quotes_with_hash(filename)
 
     # Build a hash-to-text map for O(1) lookup, then check each new quote against existing ones.
-    existing_by_hash = {q.get_hash(): q.quote for q in quotes}
+    existing_by_hash = {h: q.quote for q, h in zip(quotes, compute_hashes(quotes))}
     for new_quote in newquotes:
         h = new_quote.get_hash()
         if h in existing_by_hash:
@@ -316,6 +526,13 @@ def write_quotes(quote_path, quotes, expected_sha256=None):
     verified to match it before writing.  If the file was modified by
     another process, the write is aborted.
 
+    How much is flushed to stable storage is controlled by the
+    ``durability`` property in the ``[general]`` section: ``none`` (the
+    default) leaves it to the OS, ``file`` fsyncs the temp file before it replaces the quote
+    file (so a crash cannot leave a zero-length quote file), and ``full``
+    additionally fsyncs the parent directory so the rename itself survives a
+    crash.  The time spent in each phase is logged at DEBUG level.
+
     If more than one process calls this function on the same file at the
     same time, the results are undefined.
 
@@ -344,18 +561,15 @@ def write_quotes(quote_path, quotes, expected_sha256=None):
                 current_sha256=current_sha,
             )
 
+    from jotquote.api import backup as _backup
+
     newline = _get_newline()
+    durability = _get_durability()
+    backup_count = _backup.get_backup_count()
 
-    parent_path = os.path.abspath(os.path.join(quote_path, os.pardir))
     quote_file = os.path.basename(quote_path)
-    backup_file = '.' + quote_file + '.jotquote.bak'
-    backup_path = os.path.join(parent_path, backup_file)
-
-    while True:
-        temp_file = '.' + quote_file + str(randomlib.randint(0, 99999999)) + '.jotquote.tmp'
-        temp_path = os.path.join(parent_path, temp_file)
-        if not os.path.exists(temp_path):
-            break
+    temp_path = _get_temp_path(quote_path)
+    timings = _PhaseTimer()
 
     try:
         # Create the temp file directly rather than delegating atomic replacement
@@ -364,15 +578,25 @@ def write_quotes(quote_path, quotes, expected_sha256=None):
         # be replaced with a partially written temp file taught me to keep the
         # replacement step explicit and under this function's control.
         with open(temp_path, mode='wb') as outfile:
-            for quote in quotes:
-                output_bytes = format_quote(quote).encode('utf-8') + newline.encode('utf-8')
-                outfile.write(output_bytes)
-
-        # Before overwriting the quote file, sanity check size and line count
+            with _compressing_writer(outfile, quote_path) as writer:
+                for quote in quotes:
+                    output_bytes = format_quote(quote).encode('utf-8') + newline.encode('utf-8')
+                    writer.write(output_bytes)
+            timings.mark('write')
+
+            # Make the temp file's contents durable before it can replace the quote file
+            if durability != 'none':
+                outfile.flush()
+                os.fsync(outfile.fileno())
+                timings.mark('fsync')
+
+        # Before overwriting the quote file, sanity check size and line count.  Both are
+        # measured on the uncompressed contents so the checks mean the same for compressed files.
         if os.path.exists(quote_path):
+            quotefile_size, quote_lines = _get_size_and_line_count(quote_path, quote_path)
+            temp_size, temp_lines = _get_size_and_line_count(temp_path, quote_path)
+
             # Error if the existing quote file is larger than the new quote file will be by more than 1,000 bytes.
-            quotefile_size = os.path.getsize(quote_path)
-            temp_size = os.path.getsize(temp_path)
             if quotefile_size > temp_size + 1000:
                 os.remove(temp_path)
                 raise StorageError(
@@ -381,19 +605,17 @@ def write_quotes(quote_path, quotes, expected_sha256=None):
                 )
 
             # Error if this change will reduce the number of lines in the quote file.
-            with open(quote_path, 'rb') as f:
-                quote_lines = f.read().count(b'\n')
-            with open(temp_path, 'rb') as f:
-                temp_lines = f.read().count(b'\n')
             if quote_lines > temp_lines:
                 os.remove(temp_path)
                 raise StorageError(
                     "the quote file '{0}' would be reduced from {1} lines to {2} lines by this operation."
                     'This is suspicious, the quote file was not modified.'.format(quote_file, quote_lines, temp_lines)
                 )
+        timings.mark('sanity_check')
 
-        # Create a backup (overwriting existing backup)
-        shutil.copy(quote_path, backup_path)
+        # Rotate older backups and hardlink the outgoing file as the newest one
+        _backup.rotate_backups(quote_path, backup_count)
+        timings.mark('backup')
     except ApiException:
         raise
     except:
@@ -402,9 +624,65 @@ def write_quotes(quote_path, quotes, expected_sha256=None):
 
     try:
         os.replace(temp_path, quote_path)
+        timings.mark('replace')
+        if durability == 'full':
+            _fsync_directory(quote_path)
+            timings.mark('dir_fsync')
     except:
         raise StorageError('an error occurred writing the quotes.')
 
+    import logging
+
+    logging.getLogger(__name__).debug('write_quotes(%s) durability=%s timings: %s', quote_path, durability, timings)
+
+
+def restore_backup(quote_path, generation=1):
+    """Replace the quote file with one of its backup generations.
+
+    The current quote file (if any) is rotated into the backups first, so a
+    restore can itself be undone by restoring generation 1.
+
+    Args:
+        quote_path (str): Path to the quote file to restore.  The file does
+            not need to exist.
+        generation (int): Backup generation to restore, 1 being the most
+            recent.
+
+    Raises:
+        StorageError: If the backup does not exist or an I/O error occurs.
+    """
+    from jotquote.api import backup as _backup
+
+    backup = _backup.get_backup(quote_path, generation)
+    durability = _get_durability()
+    temp_path = _get_temp_path(quote_path)
+
+    try:
+        # Copy rather than link, so that editing the restored file in place can never alter the backup
+        with open(backup.path, 'rb') as infile, open(temp_path, 'wb') as outfile:
+            shutil.copyfileobj(infile, outfile)
+            if durability != 'none':
+                outfile.flush()
+                os.fsync(outfile.fileno())
+        if os.path.exists(quote_path):
+            _backup.rotate_backups(quote_path, _backup.get_backup_count())
+    except ApiException:
+        os.remove(temp_path)
+        raise
+    except:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise StorageError(
+            "an error occurred restoring the backup.  The file '{0}' was not modified.".format(quote_path)
+        )
+
+    try:
+        os.replace(temp_path, quote_path)
+        if durability == 'full':
+            _fsync_directory(quote_path)
+    except:
+        raise StorageError('an error occurred restoring the backup.')
+
 
 def format_quote(quote):
     """Format a :class:`Quote` as a single pipe-delimited line.
@@ -446,12 +724,93 @@ def _sha256_hex(data):
     return hashlib.sha256(data).hexdigest()
 
 
+def _get_compression(path):
+    """Return the compressed extension (``'.gz'`` or ``'.xz'``) of ``path``, or ``None``."""
+    ext = os.path.splitext(path)[1].lower()
+    return ext if ext in COMPRESSED_EXTENSIONS else None
+
+
+def _decompressing_reader(fileobj, quote_path):
+    """Wrap a binary file object in a decompressor chosen from ``quote_path``'s extension."""
+    compression = _get_compression(quote_path)
+    if compression == '.gz':
+        import gzip
+
+        return gzip.GzipFile(fileobj=fileobj, mode='rb')
+    if compression == '.xz':
+        import lzma
+
+        return lzma.LZMAFile(fileobj, mode='rb')
+    return fileobj
+
+
+def _compressing_writer(fileobj, quote_path):
+    """Return a context manager yielding a writer that compresses into ``fileobj`` as needed.
+
+    The compressor is closed (flushing its trailer) when the context exits,
+    but ``fileobj`` is left open so the caller can still fsync it.
+    """
+    compression = _get_compression(quote_path)
+    if compression == '.gz':
+        import gzip
+
+        # mtime=0 keeps the output byte-identical for identical contents
+        return gzip.GzipFile(fileobj=fileobj, mode='wb', mtime=0)
+    if compression == '.xz':
+        import lzma
+
+        return lzma.LZMAFile(fileobj, mode='wb')
+    return contextlib.nullcontext(fileobj)
+
+
+def _iter_decompressed_lines(raw, filename):
+    """Yield the text lines of compressed quote file contents as they are decompressed.
+
+    Each physical line is passed through ``str.splitlines()`` so line
+    numbering matches the uncompressed path exactly.
+    """
+    import lzma
+
+    reader = io.TextIOWrapper(_decompressing_reader(io.BytesIO(raw), filename), encoding='utf-8')
+    try:
+        for physical_line in reader:
+            yield from physical_line.splitlines()
+    except (OSError, EOFError, lzma.LZMAError) as e:
+        raise StorageError("the quote file '{0}' could not be decompressed: {1}".format(filename, e)) from e
+
+
+def _get_size_and_line_count(path, quote_path):
+    """Return ``(size, newline_count)`` of the uncompressed contents of ``path``.
+
+    ``quote_path`` determines the compression, since temp files do not
+    carry the quote file's extension.
+    """
+    size = 0
+    lines = 0
+    with open(path, 'rb') as f:
+        reader = _decompressing_reader(f, quote_path)
+        for chunk in iter(lambda: reader.read(1024 * 1024), b''):
+            size += len(chunk)
+            lines += chunk.count(b'\n')
+    return size, lines
+
+
+def _get_temp_path(quote_path):
+    """Return an unused temp file path in the same directory as ``quote_path``."""
+    parent_path = os.path.abspath(os.path.join(quote_path, os.pardir))
+    quote_file = os.path.basename(quote_path)
+    while True:
+        temp_file = '.' + quote_file + str(randomlib.randint(0, 99999999)) + '.jotquote.tmp'
+        temp_path = os.path.join(parent_path, temp_file)
+        if not os.path.exists(temp_path):
+            return temp_path
+
+
 def _check_for_duplicates(quotes, source):
     """Throws an exception if the given list of quotes contains duplicates or near-duplicates."""
 
     seen = {}
-    for index, quote in enumerate(quotes):
-        quote_hash = quote.get_hash()
+    for index, (quote, quote_hash) in enumerate(zip(quotes, compute_hashes(quotes))):
         if quote_hash not in seen:
             seen[quote_hash] = quote.quote
         elif quote.quote == seen[quote_hash]:
@@ -479,3 +838,47 @@ def _get_newline():
             "the value '{0}' is not valid value for the line_separator property."
             "  Valid values are 'platform', 'windows', or 'unix'.".format(linesep_property)
         )
+
+
+def _get_durability():
+    """Return the durability mode based on the durability config property."""
+    config = _config.get_config()
+    durability = config.get(_config.SECTION_GENERAL, 'durability', fallback='none') or 'none'
+    if durability not in DURABILITY_MODES:
+        raise ConfigError(
+            "the value '{0}' is not valid value for the durability property."
+            "  Valid values are 'none', 'file', or 'full'.".format(durability)
+        )
+    return durability
+
+
+def _fsync_directory(path):
+    """Flush the directory entry for ``path`` to stable storage.
+
+    Directories cannot be opened for fsync on Windows, where NTFS journals
+    the rename itself, so this is a no-op there.
+    """
+    if os.name == 'nt':
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _PhaseTimer:
+    """Record the elapsed time of consecutive phases for DEBUG logging."""
+
+    def __init__(self):
+        self._last = time.perf_counter()
+        self.phases = []
+
+    def mark(self, phase):
+        """Close the current phase under the name ``phase`` and start the next one."""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def __str__(self):
+        return ' '.join('{0}={1:.2f}ms'.format(name, seconds * 1000) for name, seconds in self.phases)
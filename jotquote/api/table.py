@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+#  This file is licensed under the terms of the MIT License.  See the LICENSE
+# file in the root of this repository for complete details.
+
+import bisect
+import collections
+import itertools
+from array import array
+
+from jotquote.api.quote import Quote, _shared_tags
+
+
+class QuoteTable:
+    """A column-oriented, read-only view of a quote collection.
+
+    Instead of one object per quote, a table keeps a few parallel columns:
+
+    * the quote texts concatenated into one string, with an array of start
+      offsets;
+    * author and publication IDs into per-table dictionaries of distinct
+      values;
+    * tags in compressed sparse row form: a flat array of tag IDs plus an
+      array of offsets giving each row's slice of it, and a parallel array
+      of the row each tag ID belongs to for tag lookups.
+
+    Filters and counts run over whole columns with C-implemented builtins
+    (``str.find``, ``array.count``, :class:`collections.Counter`,
+    :func:`itertools.compress`) rather than a Python loop over quotes, which
+    makes repeated queries over a large collection much cheaper.  The set of
+    rows for each tag is computed on first use and cached, since a table is
+    never modified.  Rows are converted back to :class:`Quote` objects only
+    on request.
+
+    Build a table with :meth:`from_quotes`, typically from the result of
+    :func:`jotquote.api.read_quotes`.  Row indexes are 0-based positions in
+    the list the table was built from.
+    """
+
+    def __init__(self):
+        """Create an empty table; use :meth:`from_quotes` to build one from quotes."""
+        self._text = ''
+        self._text_offsets = array('q', [0])
+        self._authors = []
+        self._author_index = {}
+        self._author_ids = array('I')
+        self._publications = []
+        self._publication_index = {}
+        self._publication_ids = array('I')
+        self._tags = []
+        self._tag_index = {}
+        self._tag_ids = array('I')
+        self._tag_offsets = array('q', [0])
+        self._tag_rows = array('I')
+        self._tag_row_sets = {}
+        self._line_numbers = array('q')
+
+    @classmethod
+    def from_quotes(cls, quotes):
+        """Build a table holding the given quotes, in order.
+
+        Args:
+            quotes (Iterable[Quote]): The quotes to store.
+
+        Returns:
+            QuoteTable: The new table.
+        """
+        table = cls()
+        texts = []
+        tag_offset = 0
+        for row, quote in enumerate(quotes):
+            texts.append(quote.quote)
+            table._author_ids.append(_encode(quote.author, table._author_index, table._authors))
+            table._publication_ids.append(_encode(quote.publication, table._publication_index, table._publications))
+            tags = quote._tags
+            table._tag_ids.extend(_encode(tag, table._tag_index, table._tags) for tag in tags)
+            tag_offset += len(tags)
+            table._tag_offsets.append(tag_offset)
+            table._tag_rows.extend(itertools.repeat(row, len(tags)))
+            table._line_numbers.append(quote.line_number)
+
+        # Quotes never contain a newline, so a separator keeps keyword matches within one quote
+        table._text = '\n'.join(texts)
+        table._text_offsets = array('q', [0])
+        table._text_offsets.extend(itertools.accumulate(len(text) + 1 for text in texts))
+        return table
+
+    def __len__(self):
+        """Return the number of quotes in the table."""
+        return len(self._author_ids)
+
+    def get_quote(self, row):
+        """Return the quote in the given row as a new :class:`Quote`.
+
+        Args:
+            row (int): 0-based row index.
+
+        Returns:
+            Quote: The quote, with ``line_number`` set.
+
+        Raises:
+            IndexError: If ``row`` is out of range.
+        """
+        if not 0 <= row < len(self):
+            raise IndexError('row {0} is out of range for a table of {1} quotes'.format(row, len(self)))
+        text = self._text[self._text_offsets[row] : self._text_offsets[row + 1] - 1]
+        tags = _shared_tags(self._tags[i] for i in self._tag_ids[self._tag_offsets[row] : self._tag_offsets[row + 1]])
+        quote = Quote._from_valid_fields(
+            text,
+            self._authors[self._author_ids[row]],
+            self._publications[self._publication_ids[row]],
+            tags,
+        )
+        quote.line_number = self._line_numbers[row]
+        return quote
+
+    def to_quotes(self, rows=None):
+        """Return the quotes in the given rows as :class:`Quote` objects.
+
+        Args:
+            rows (Iterable[int] | None): Row indexes to convert, for example
+                the result of :meth:`filter`.  ``None`` converts every row.
+
+        Returns:
+            list[Quote]: The quotes, in the order of ``rows``.
+        """
+        if rows is None:
+            rows = range(len(self))
+        return [self.get_quote(row) for row in rows]
+
+    def filter(self, tags=None, keyword=None, author=None, excluded_tags=None):
+        """Return the rows that meet every given criterion.
+
+        The criteria match those of :func:`jotquote.api.get_first_match`.
+
+        Args:
+            tags (Iterable[str] | None): The quote must have every one of
+                these tags.
+            keyword (str | None): Substring that must appear in the quote
+                text, author, or publication, or be equal to one of the tags.
+            author (str | None): The quote's author must equal this value.
+            excluded_tags (Iterable[str] | None): The quote must have none of
+                these tags.
+
+        Returns:
+            list[int]: Matching 0-based row indexes, in ascending order.
+        """
+        rows = None
+
+        def narrow(matched):
+            return set(matched) if rows is None else rows.intersection(matched)
+
+        # Start from the rarest tag so the intersections stay small
+        if tags is not None:
+            tags = sorted(tags, key=lambda tag: len(self._rows_with_tag(tag)))
+
+        if author is not None:
+            author_id = self._author_index.get(author)
+            rows = narrow(self._rows_with_ids(self._author_ids, set() if author_id is None else {author_id}))
+        if tags is not None:
+            for tag in tags:
+                rows = narrow(self._rows_with_tag(tag))
+        if keyword is not None:
+            rows = narrow(self._rows_with_keyword(keyword))
+        if rows is None:
+            rows = set(range(len(self)))
+        if excluded_tags is not None:
+            for tag in excluded_tags:
+                rows.difference_update(self._rows_with_tag(tag))
+        return sorted(rows)
+
+    def count_author(self, author):
+        """Return the number of quotes attributed to ``author``."""
+        author_id = self._author_index.get(author)
+        if author_id is None:
+            return 0
+        return self._author_ids.count(author_id)
+
+    def author_counts(self):
+        """Return the number of quotes per author.
+
+        Returns:
+            collections.Counter: Maps each author to their number of quotes.
+        """
+        counts = collections.Counter(self._author_ids)
+        return collections.Counter({self._authors[i]: count for i, count in counts.items()})
+
+    def tag_counts(self):
+        """Return the number of quotes per tag.
+
+        Returns:
+            collections.Counter: Maps each tag to the number of quotes that
+                have it.
+        """
+        counts = collections.Counter(self._tag_ids)
+        return collections.Counter({self._tags[i]: count for i, count in counts.items()})
+
+    def _rows_with_ids(self, column, ids):
+        """Return the rows whose value in ``column`` is one of ``ids``."""
+        if not ids:
+            return []
+        return itertools.compress(range(len(column)), map(ids.__contains__, column))
+
+    def _rows_with_tag(self, tag):
+        """Return the set of rows that have ``tag``, cached since the table is read-only."""
+        rows = self._tag_row_sets.get(tag)
+        if rows is None:
+            tag_id = self._tag_index.get(tag)
+            if tag_id is None:
+                return frozenset()
+            matches = itertools.compress(self._tag_rows, map(tag_id.__eq__, self._tag_ids))
+            rows = self._tag_row_sets[tag] = frozenset(matches)
+        return rows
+
+    def _rows_with_keyword(self, keyword):
+        """Return the rows whose text, author, or publication contains ``keyword``, or that have it as a tag."""
+        # Every text contains the empty string, and the scan below would not stop at the last row
+        if keyword == '':
+            return set(range(len(self)))
+        rows = set()
+        text, offsets = self._text, self._text_offsets
+        # A newline can only match the separators between quotes
+        position = text.find(keyword) if '\n' not in keyword else -1
+        while position != -1:
+            row = bisect.bisect_right(offsets, position) - 1
+            rows.add(row)
+            position = text.find(keyword, offsets[row + 1])
+        author_ids = {i for i, name in enumerate(self._authors) if keyword in name}
+        rows.update(self._rows_with_ids(self._author_ids, author_ids))
+        publication_ids = {i for i, name in enumerate(self._publications) if name is not None and keyword in name}
+        rows.update(self._rows_with_ids(self._publication_ids, publication_ids))
+        rows.update(self._rows_with_tag(keyword))
+        return rows
+
+
+def _encode(value, index, values):
+    """Return the dictionary ID of ``value``, adding it to ``values`` if new."""
+    value_id = index.get(value)
+    if value_id is None:
+        value_id = index[value] = len(values)
+        values.append(value)
+    return value_id
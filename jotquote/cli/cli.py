@@ -2,7 +2,13 @@
 #  This file is licensed under the terms of the MIT License.  See the LICENSE
 # file in the root of this repository for complete details.
 
+import collections
+import contextlib
+import datetime
 import functools
+import hashlib
+import itertools
+import json
 import os
 import random as randomlib
 import sys
@@ -62,7 +68,19 @@ HELP_RANDOM = 'display a single random quote, optionally selected from quotes ma
 HELP_RANDOM_K_ARG = 'display a random quote with the given keyword in the quote, author, or publication'
 HELP_RANDOM_T_ARG = 'display a random quote with the given tag'
 
-HELP_TODAY_T_ARG = 'the quote must have the given tag'
+HELP_TODAY_T_ARG = 'show the quote of the day for the given tag'
+
+HELP_SCHEDULE_FROM_ARG = 'first date of the schedule, as YYYYMMDD (defaults to today, or tomorrow from 11:45 PM)'
+HELP_SCHEDULE_DAYS_ARG = 'number of days to include in the schedule'
+HELP_SCHEDULE_FORMAT_ARG = 'output format'
+HELP_SCHEDULE_OUTPUT_ARG = 'write the schedule to this file instead of standard output'
+
+# Formats of 'jotquote schedule'; the same as api.SCHEDULE_FORMATS, listed here so
+# that starting the CLI does not import the schedule module
+_SCHEDULE_FORMATS = ('csv', 'json')
+
+# JSON schema of the logs written by 'jotquote lint --format sarif'
+_SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
 
 
 @click.group(invoke_without_command=True)
@@ -83,8 +101,8 @@ def jotquote(ctx, quotefile):
 
         # All subcommands require quotefile to exist except webserver/webeditor
         # (lazy-load the quote file on first page view so the server can start
-        # even if the file is missing).
-        if ctx.invoked_subcommand not in ('webserver', 'webeditor') and not os.path.exists(quotefile):
+        # even if the file is missing) and backups (which can restore a missing file).
+        if ctx.invoked_subcommand not in ('webserver', 'webeditor', 'backups') and not os.path.exists(quotefile):
             config_dir = click.get_app_dir(api.APP_NAME, roaming=True, force_posix=False)
             config_path = os.path.join(config_dir, 'settings.conf')
             print(
@@ -220,26 +238,80 @@ def random(ctx, tags, keyword):
 
 
 @jotquote.command()
+@click.option('--tag', '-t', help=HELP_TODAY_T_ARG)
 @click.pass_context
 @_translate_api_errors
-def today(ctx):
+def today(ctx, tag):
     """Display a random quote, seeding the random number generator with the
     date to produce a random quote that remains the same on a given day.
+    With -t, the quote of the day is chosen from the quotes with that tag;
+    each tag has its own daily quote.
     """
     quotefile = ctx.obj['QUOTEFILE']
+    config = api.get_config()
+    tz = config[api.SECTION_GENERAL].get('timezone') or None
 
-    quotes = api.read_quotes(quotefile)
+    if tag is not None:
+        # Every quote's tags are looked at, so read them strictly like 'random -t'
+        quotes = api.read_quotes(quotefile)
+        index = api.get_channel_choice(quotes, tag, timezone=tz)
+        if index is None:
+            raise click.ClickException("no quotes tagged '{0}'".format(tag))
+        print_quote_short(quotes[index])
+        return
+
+    # Only the selected quote is shown, so leave the others unparsed
+    quotes = api.read_quotes_lazy(quotefile)
 
     if len(quotes) > 0:
         # Get random random quote based on date and number of quotes
-        config = api.get_config()
-        tz = config[api.SECTION_GENERAL].get('timezone') or None
         index = api.get_random_choice(len(quotes), timezone=tz)
         quote = quotes[index]
 
         print_quote_short(quote)
 
 
+@jotquote.command()
+@click.option('--from', 'from_date', help=HELP_SCHEDULE_FROM_ARG)
+@click.option('--days', type=click.IntRange(min=1), default=30, show_default=True, help=HELP_SCHEDULE_DAYS_ARG)
+@click.option(
+    '--format',
+    'output_format',
+    type=click.Choice(_SCHEDULE_FORMATS),
+    default='csv',
+    show_default=True,
+    help=HELP_SCHEDULE_FORMAT_ARG,
+)
+@click.option('--output', '-o', type=click.Path(dir_okay=False, writable=True), help=HELP_SCHEDULE_OUTPUT_ARG)
+@click.pass_context
+@_translate_api_errors
+def schedule(ctx, from_date, days, output_format, output):
+    """Show which quote 'jotquote today' and the web viewer will display on
+    each of the coming days.  Quotes chosen by the quote resolver configured
+    in settings.conf take precedence over the date-seeded choice.  The output
+    can be used as the schedule_file of the web viewer.
+    """
+    quotefile = ctx.obj['QUOTEFILE']
+    config = api.get_config()
+
+    if from_date is None:
+        start_date = api.get_quote_date(config[api.SECTION_GENERAL].get('timezone') or None)
+    else:
+        try:
+            start_date = datetime.datetime.strptime(from_date, '%Y%m%d').date()
+        except ValueError as e:
+            raise click.ClickException("invalid --from date '{0}'; expected YYYYMMDD.".format(from_date)) from e
+
+    quotes = api.read_quotes(quotefile)
+    entries = api.build_schedule(quotes, start_date, days, resolver=api.load_resolver(config))
+
+    if output is None:
+        api.write_schedule(entries, sys.stdout, output_format)
+    else:
+        with open(output, 'w', encoding='utf-8', newline='') as f:
+            api.write_schedule(entries, f, output_format)
+
+
 @jotquote.command()
 @click.pass_context
 @_translate_api_errors
@@ -262,15 +334,71 @@ def info(ctx):
         print('Time quote file last modified: {}'.format(time.ctime(os.path.getmtime(quotefile))))
 
 
+@jotquote.group()
+@click.pass_context
+def backups(ctx):
+    """List or restore backups of the quote file.  A backup generation is
+    kept each time jotquote rewrites the quote file; the number of
+    generations is set by the backup_count property in settings.conf.
+    """
+
+
+@backups.command('list')
+@click.pass_context
+@_translate_api_errors
+def backups_list(ctx):
+    """List the available backups of the quote file, newest first."""
+    quotefile = ctx.obj['QUOTEFILE']
+
+    found = api.list_backups(quotefile)
+    if not found:
+        print('No backups found.')
+    for backup in found:
+        print('{0}: {1}  {2} bytes  {3}'.format(backup.generation, time.ctime(backup.mtime), backup.size, backup.path))
+
+
+@backups.command('restore')
+@click.argument('generation', type=int, required=False, default=1)
+@click.pass_context
+@_translate_api_errors
+def backups_restore(ctx, generation):
+    """Replace the quote file with a backup.  The current quote file is kept
+    as the newest backup, so a restore can be undone by restoring generation 1.
+    """
+    quotefile = ctx.obj['QUOTEFILE']
+
+    api.restore_backup(quotefile, generation)
+    print('Restored backup generation {0} to {1}.'.format(generation, quotefile))
+
+
 @jotquote.command()
 @click.option('--fix', is_flag=True, help='Auto-fix issues that can be corrected safely.')
 @click.option(
     '--select', 'select_checks', default='', help='Comma-separated list of checks to run (disables all others).'
 )
 @click.option('--ignore', 'ignore_checks', default='', help='Comma-separated list of checks to skip.')
+@click.option(
+    '-j',
+    '--jobs',
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help='Number of processes to run the checks in; 0 uses one per CPU.',
+)
+@click.option('--no-cache', is_flag=True, help='Check every quote, ignoring and not saving earlier results.')
+@click.option('--max-issues', type=click.IntRange(min=1), help='Stop checking after this many issues are reported.')
+@click.option('--fail-fast', is_flag=True, help='Stop checking at the first issue reported.')
+@click.option(
+    '--format',
+    'output_format',
+    type=click.Choice(['text', 'json', 'sarif']),
+    default='text',
+    show_default=True,
+    help='Output format: text, JSON with one issue per line, or a SARIF 2.1.0 log.',
+)
 @click.pass_context
 @_translate_api_errors
-def lint(ctx, fix, select_checks, ignore_checks):
+def lint(ctx, fix, select_checks, ignore_checks, jobs, no_cache, max_issues, fail_fast, output_format):
     """Check the quote file for quality issues.
 
     By default, the checks configured in settings.conf
@@ -287,68 +415,288 @@ def lint(ctx, fix, select_checks, ignore_checks):
         jotquote lint --ignore spelling
       Auto-fix issues that can be corrected safely:
         jotquote lint --fix
+      Spread the checks of a large quote file over four processes:
+        jotquote lint --jobs 4
+      Check every quote again, without the saved results:
+        jotquote lint --no-cache
+      Stop at the first issue:
+        jotquote lint --fail-fast
+      Write the issues as a SARIF log for a code scanning tool:
+        jotquote lint --format sarif > jotquote.sarif
     """
+    import dataclasses
+
     from jotquote.api import lint as lintmod
 
     if select_checks and ignore_checks:
         raise click.ClickException('--select and --ignore are mutually exclusive.')
+    if fail_fast:
+        if max_issues is not None:
+            raise click.ClickException('--fail-fast and --max-issues are mutually exclusive.')
+        max_issues = 1
 
     quotefile = ctx.obj['QUOTEFILE']
     config = api.get_config()
 
     checks = _get_active_checks(select_checks, ignore_checks, config)
 
+    # Results of unchanged quotes are reused from the previous run
+    cache = None
+    if not no_cache:
+        cache_path = _get_lint_cache_path(quotefile)
+        cache = lintmod.read_lint_cache(cache_path)
+        saved_cache = dict(cache)
+    elif fix:
+        # Kept in memory only, so that after fixing just the quotes the fixes changed are checked again
+        cache = {}
+
     quotes, sha256 = api.read_quotes_with_hash(quotefile)
-    issues = lintmod.lint_quotes(quotes, checks, config)
 
     fix_count = 0
     if fix:
+        issues = lintmod.lint_quotes(quotes, checks, config, workers=jobs, cache=cache)
         quotes, fix_count = lintmod.apply_fixes(quotes, issues)
         if fix_count > 0:
             api.write_quotes(quotefile, quotes, expected_sha256=sha256)
-            quotes = api.read_quotes(quotefile)
-            issues = lintmod.lint_quotes(quotes, checks, config)
+            # The rewritten file holds one quote per line
+            for line_number, quote in enumerate(quotes, 1):
+                quote.line_number = line_number
+
+    if output_format == 'sarif':
+        sarif_head, sarif_tail = _get_sarif_log(quotefile, checks)
+        click.echo(sarif_head, nl=False)
+    issue_count = fixable_count = 0
+    if output_format == 'text' and max_issues is None:
+        # Plain text without a limit lists the issues check by check, as it always has
+        stream = contextlib.nullcontext(lintmod.lint_quotes(quotes, checks, config, workers=jobs, cache=cache))
+    else:
+        # Otherwise issues are written as they are found, so a large file's first issues show up at once;
+        # closing the iterator stops the checks and records the results of the quotes checked so far
+        stream = contextlib.closing(lintmod.iter_lint_issues(quotes, checks, config, workers=jobs, cache=cache))
+    with stream as issues:
+        for issue in itertools.islice(issues, max_issues):
+            if output_format == 'json':
+                click.echo(json.dumps(dataclasses.asdict(issue), ensure_ascii=False))
+            elif output_format == 'sarif':
+                click.echo(
+                    '{0}{1}'.format(',\n' if issue_count else '', _format_sarif_result(issue, quotefile)), nl=False
+                )
+            else:
+                fixable_str = ' (fixable)' if issue.fixable else ''
+                click.echo('line {}: [{}] {}{}'.format(issue.line_number, issue.check, issue.message, fixable_str))
+            issue_count += 1
+            fixable_count += issue.fixable
+    if output_format == 'sarif':
+        click.echo(sarif_tail)
+
+    if not no_cache:
+        if cache != saved_cache:
+            try:
+                lintmod.write_lint_cache(cache_path, cache)
+            except api.StorageError as e:
+                click.echo('Warning: {0}'.format(e), err=True)
+        # Signatures the near-duplicate check computed are kept for the next run
+        try:
+            lintmod.write_near_duplicate_signatures()
+        except api.StorageError as e:
+            click.echo('Warning: {0}'.format(e), err=True)
 
-    for issue in issues:
-        fixable_str = ' (fixable)' if issue.fixable else ''
-        click.echo('line {}: [{}] {}{}'.format(issue.line_number, issue.check, issue.message, fixable_str))
-    issue_count = len(issues)
+    # Machine-readable output keeps stdout to the issues themselves
+    summary_to_stderr = output_format != 'text'
     if fix and fix_count > 0:
-        click.echo('{} fix{} applied.'.format(fix_count, 'es' if fix_count != 1 else ''))
-    if issue_count == 0:
-        click.echo('No issues found.')
-    else:
-        fixable_count = sum(1 for i in issues if i.fixable)
+        click.echo('{} fix{} applied.'.format(fix_count, 'es' if fix_count != 1 else ''), err=summary_to_stderr)
+    if not summary_to_stderr:
+        if issue_count == 0:
+            click.echo('No issues found.')
+        else:
+            click.echo(
+                '{} issue{} found, {} {} fixable.'.format(
+                    issue_count,
+                    's' if issue_count != 1 else '',
+                    fixable_count,
+                    'is' if fixable_count == 1 else 'are',
+                )
+            )
+    if max_issues is not None and issue_count == max_issues:
         click.echo(
-            '{} issue{} found, {} {} fixable.'.format(
-                issue_count,
-                's' if issue_count != 1 else '',
-                fixable_count,
-                'is' if fixable_count == 1 else 'are',
+            'Stopped after {} issue{}; there may be more.'.format(issue_count, 's' if issue_count != 1 else ''),
+            err=summary_to_stderr,
+        )
+
+    sys.exit(1 if issue_count else 0)
+
+
+@jotquote.command()
+@click.option(
+    '--threshold',
+    type=click.FloatRange(0, 1, min_open=True),
+    help='Smallest similarity to report, from 0 to 1 (default: near_duplicate_threshold in settings.conf, or 0.7).',
+)
+@click.pass_context
+@_translate_api_errors
+def dedupe(ctx, threshold):
+    """Report quotes whose text is nearly the same as an earlier quote's.
+
+    Similarity is the share of adjacent word pairs the two quote texts
+    have in common, ignoring case and punctuation.  Quotes under four
+    words are not compared.
+
+    \b
+    Examples:
+      Report quotes that are at least 70% similar:
+        jotquote dedupe
+      Report only quotes that are at least 90% similar:
+        jotquote dedupe --threshold 0.9
+    """
+    quotefile = ctx.obj['QUOTEFILE']
+    configured_threshold, signature_path = api.get_near_duplicate_settings(api.get_config())
+    if threshold is None:
+        threshold = configured_threshold
+
+    # Signatures of unchanged quotes are reused from the previous run
+    signatures = api.read_signatures(signature_path)
+    saved_signatures = dict(signatures)
+
+    quotes = api.read_quotes(quotefile)
+    found = api.find_near_duplicates(quotes, threshold, signatures)
+
+    if signatures != saved_signatures:
+        try:
+            api.write_signatures(signature_path, signatures)
+        except api.StorageError as e:
+            click.echo('Warning: {0}'.format(e), err=True)
+
+    for pair in found:
+        original, quote = quotes[pair.original], quotes[pair.index]
+        print(
+            'line {0} and line {1} are {2:.0%} similar:'.format(
+                original.line_number, quote.line_number, pair.similarity
             )
         )
+        print_quote_short(original)
+        print_quote_short(quote)
+        print()
+    if found:
+        print('{0} near duplicate{1} found.'.format(len(found), 's' if len(found) != 1 else ''))
+    else:
+        print('No near duplicates found.')
+
 
-    sys.exit(1 if issues else 0)
+@jotquote.command()
+@click.pass_context
+@_translate_api_errors
+def authorvariants(ctx):
+    """Report authors whose name looks like another way of writing a more
+    common author's name, such as 'R. W. Emerson' for 'Ralph Waldo Emerson'.
+    Each variant is listed under the name used by the most quotes.
+    """
+    quotefile = ctx.obj['QUOTEFILE']
+
+    quotes = api.read_quotes(quotefile)
+    variants = api.find_author_variants(quotes)
+    counts = collections.Counter(quote.author for quote in quotes)
+
+    by_preferred = {}
+    for author, preferred in variants.items():
+        by_preferred.setdefault(preferred, []).append(author)
+    for preferred in sorted(by_preferred):
+        print('{0} ({1})'.format(preferred, _format_quote_count(counts[preferred])))
+        for author in by_preferred[preferred]:
+            print('    {0} ({1})'.format(author, _format_quote_count(counts[author])))
+    if variants:
+        print('{0} author variant{1} found.'.format(len(variants), 's' if len(variants) != 1 else ''))
+    else:
+        print('No author variants found.')
+
+
+def _format_quote_count(count):
+    return '{0} quote{1}'.format(count, 's' if count != 1 else '')
+
+
+def _get_lint_cache_path(quotefile):
+    """Return the path of the saved lint results of ``quotefile``, in the settings.conf directory."""
+    from jotquote.api import lint as lintmod
+
+    digest = hashlib.blake2b(os.path.abspath(quotefile).encode('utf-8'), digest_size=8).hexdigest()
+    return os.path.join(lintmod._get_lint_cache_dir(), '{0}.bin'.format(digest))
 
 
 def _get_active_checks(select_checks, ignore_checks, config):
-    """Determine the set of lint checks to run based on CLI flags and config."""
-    all_checks = api.ALL_CHECKS
+    """Determine the lint checks to run based on CLI flags and config.
+
+    Opt-in checks and checks installed as plugins can be selected or ignored
+    by name, but only the default checks run when none are named.  The names
+    are returned sorted, so that issues are listed in the same order on
+    every run.
+    """
+    default_checks = api.DEFAULT_CHECKS
     if select_checks:
         checks = {c.strip() for c in select_checks.split(',') if c.strip()}
-        invalid = checks - all_checks
+        invalid = checks - api.available_checks()
         if invalid:
             raise click.ClickException('Unknown check(s): {}'.format(', '.join(sorted(invalid))))
     elif ignore_checks:
         ignore = {c.strip() for c in ignore_checks.split(',') if c.strip()}
-        invalid = ignore - all_checks
+        invalid = ignore - api.available_checks()
         if invalid:
             raise click.ClickException('Unknown check(s): {}'.format(', '.join(sorted(invalid))))
-        checks = all_checks - ignore
+        checks = default_checks - ignore
     else:
         raw = config.get(api.SECTION_LINT, 'enabled_checks', fallback='')
-        checks = {c.strip() for c in raw.split(',') if c.strip()} if raw.strip() else all_checks
-    return checks
+        checks = {c.strip() for c in raw.split(',') if c.strip()} if raw.strip() else default_checks
+    return sorted(checks)
+
+
+def _get_sarif_log(quotefile, checks):
+    """Return the text of a SARIF 2.1.0 log for ``jotquote lint``, split where its results go.
+
+    Each check is described as a rule, by the first line of its docstring.
+    The results are written between the two parts, separated by commas.
+    """
+    from jotquote import __version__
+    from jotquote.api import lint as lintmod
+
+    rules = []
+    for name in sorted(checks):
+        rule = {'id': name}
+        check_obj = lintmod.CHECKS.get(name)
+        if check_obj is not None and type(check_obj).__doc__:
+            rule['shortDescription'] = {'text': type(check_obj).__doc__.strip().splitlines()[0]}
+        rules.append(rule)
+    run = {
+        'tool': {'driver': {'name': 'jotquote', 'version': __version__, 'rules': rules}},
+        'artifacts': [{'location': {'uri': _get_file_uri(quotefile)}}],
+        'results': [],
+    }
+    log = json.dumps({'$schema': _SARIF_SCHEMA, 'version': '2.1.0', 'runs': [run]}, ensure_ascii=False, indent=2)
+    head, tail = log.split('"results": []')
+    return head + '"results": [\n', '\n]' + tail
+
+
+def _format_sarif_result(issue, quotefile):
+    """Return a lint issue as the JSON text of a SARIF result."""
+    result = {
+        'ruleId': issue.check,
+        'level': 'warning',
+        'message': {'text': issue.message},
+        'locations': [
+            {
+                'physicalLocation': {
+                    'artifactLocation': {'uri': _get_file_uri(quotefile), 'index': 0},
+                    'region': {'startLine': issue.line_number},
+                }
+            }
+        ],
+        'properties': {'field': issue.field, 'fixable': issue.fixable},
+    }
+    return json.dumps(result, ensure_ascii=False)
+
+
+def _get_file_uri(path):
+    """Return the ``file:`` URI of ``path``."""
+    import pathlib
+
+    return pathlib.Path(os.path.abspath(path)).as_uri()
 
 
 def _lint_new_quotes(quotes):
@@ -422,7 +770,11 @@ def _print_random(quotefile, tags, keyword):
     """Given path to quote file, prints a random quote that optionally meets
     given tags and keyword.
     """
-    quotes = api.read_quotes(quotefile)
+    # Without filters only the selected quote is looked at, so leave the others unparsed
+    if tags is None and keyword is None:
+        quotes = api.read_quotes_lazy(quotefile)
+    else:
+        quotes = api.read_quotes(quotefile)
 
     if len(quotes) > 0:
         selected = _select_quotes(quotes, tags=tags, keyword=keyword, rand=True)
@@ -487,6 +839,10 @@ def _select_quotes(quotes, tags=None, keyword=None, number=None, hash_arg=None,
     if tags is not None:
         taglist = api.parse_tags(tags)
 
+    # Hash every quote in one batch; get_hash() below then returns the cached value
+    if hash_arg is not None:
+        api.compute_hashes(quotes)
+
     # Get quotes that meet all criteria
     selected_quotes = []
     for index in range(0, len(quotes)):
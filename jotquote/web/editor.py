@@ -3,6 +3,7 @@
 # file in the root of this repository for complete details.
 
 import logging
+import threading
 
 from flask import Flask, abort, redirect, render_template, request, send_file
 
@@ -34,7 +35,11 @@ def _log_startup_info():
     web_helpers.log_paths_and_version(_logger)
 
 
-_lint_cache = {'sha256': None, 'checks': None, 'issues': []}
+# Issues of the last linted file version, and per-quote results reused across versions
+_lint_cache = {'sha256': None, 'checks': None, 'issues': [], 'quotes': {}}
+
+# Serializes linting, which reads and updates _lint_cache, across request threads.
+_lint_cache_lock = threading.Lock()
 
 
 @app.after_request
@@ -197,6 +202,10 @@ def _load_quotes():
 def _get_lint_issues(quotes, checks, config, sha256):
     """Return cached lint issues if SHA-256 and checks match, else re-lint.
 
+    A re-lint reuses the per-quote results of earlier versions of the file,
+    so after a one-quote edit only that quote and the file-scope checks are
+    checked again.
+
     Args:
         quotes (list[api.Quote]): All quotes to lint.
         checks (frozenset[str]): The set of lint checks to run.
@@ -206,17 +215,18 @@ def _get_lint_issues(quotes, checks, config, sha256):
     Returns:
         list[lint.LintIssue]: Lint issues found across all quotes.
     """
-    # Return cached result if the file content and checks haven't changed
     frozen_checks = frozenset(checks)
-    if _lint_cache['sha256'] == sha256 and _lint_cache['checks'] == frozen_checks:
-        return _lint_cache['issues']
-
-    # Cache miss — re-lint all quotes and store the updated result
-    issues = lint.lint_quotes(quotes, checks, config)
-    _lint_cache['sha256'] = sha256
-    _lint_cache['checks'] = frozen_checks
-    _lint_cache['issues'] = issues
-    return issues
+    with _lint_cache_lock:
+        # Return cached result if the file content and checks haven't changed
+        if _lint_cache['sha256'] == sha256 and _lint_cache['checks'] == frozen_checks:
+            return _lint_cache['issues']
+
+        # Cache miss — re-lint the changed quotes and store the updated result
+        issues = lint.lint_quotes(quotes, sorted(frozen_checks), config, cache=_lint_cache['quotes'])
+        _lint_cache['sha256'] = sha256
+        _lint_cache['checks'] = frozen_checks
+        _lint_cache['issues'] = issues
+        return issues
 
 
 def _error_nav(quotes, idx, all_issues):
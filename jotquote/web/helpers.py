@@ -78,9 +78,9 @@ def sanitize_for_log(value):
 
 
 def get_enabled_checks(config):
-    """Return the set of lint checks to run, from config or all checks if unset."""
+    """Return the set of lint checks to run, from config or the default checks if unset."""
     raw = config.get(api.SECTION_LINT, 'enabled_checks', fallback='')
-    return {c.strip() for c in raw.split(',') if c.strip()} if raw.strip() else api.ALL_CHECKS
+    return {c.strip() for c in raw.split(',') if c.strip()} if raw.strip() else api.DEFAULT_CHECKS
 
 
 def resolve_favicon_path(config):
@@ -2,14 +2,17 @@
 #  This file is licensed under the terms of the MIT License.  See the LICENSE
 # file in the root of this repository for complete details.
 
+import contextlib
 import datetime
 import importlib
 import logging
 import os
 import random
+import sys
+import threading
 import zoneinfo
 
-from flask import Flask, abort, g, jsonify, make_response, render_template, request, send_file
+from flask import Flask, abort, g, jsonify, make_response, render_template, request, send_file, url_for
 
 from jotquote import api
 from jotquote.api.exceptions import ConfigError
@@ -54,7 +57,7 @@ def _log_startup_info():
     else:
         _logger.info('configured timezone: <not set; using system local time>')
     _logger.info('current local time: %s', now.strftime('%Y-%m-%d %I:%M:%S %p %Z').strip())
-    if mode != 'random':
+    if mode not in ('random', 'rotation'):
         _logger.info('quote of the day will refresh at 12:00 AM local time')
 
 
@@ -62,6 +65,22 @@ def _log_startup_info():
 _resolver_fn = None
 _resolver_loaded = False
 
+# Cached quote list, with the path, modification time and size of the file it was read from.
+_quotes = None
+_quotes_key = None
+_quotes_lock = threading.Lock()
+
+# Cached schedule table from the schedule_file setting, reloaded when the file changes.
+_schedule = None
+_schedule_key = None
+
+# Serializes updates of the global rotation cursor file within this process;
+# _rotation_file_lock() serializes them across worker processes.
+_rotation_lock = threading.Lock()
+
+# Cookie holding a client's next rotation cursor when rotation_scope is 'client'.
+_ROTATION_COOKIE = 'jotquote_rotation'
+
 # Cached header-provider function, loaded lazily on first request.
 _header_fn = None
 _header_loaded = False
@@ -92,11 +111,32 @@ def log_request(response):
     return response
 
 
+@app.after_request
+def set_rotation_cookie(response):
+    """Store the client's next rotation cursor when the request advanced it.
+
+    The response then depends on the client's cookie, so it is marked
+    private in place of any caching headers from ``header_provider_extension``;
+    a shared cache would otherwise hand one client's cursor to others.
+    """
+    cursor = getattr(g, 'rotation_cursor', None)
+    if cursor is not None:
+        response.set_cookie(_ROTATION_COOKIE, str(cursor), max_age=365 * 24 * 60 * 60, samesite='Lax')
+        response.headers['Cache-Control'] = 'private, no-store'
+        response.vary.add('Cookie')
+    return response
+
+
 @app.route('/')
 def rootpage():
     return showpage()
 
 
+@app.route('/c/<channel>')
+def channelpage(channel):
+    return showpage(channel=channel)
+
+
 @app.route('/about')
 def aboutpage():
     """Render the about page."""
@@ -126,17 +166,20 @@ def apiroute():
 
     Honors ``[web].mode`` like the HTML root route: ``daily`` returns the
     deterministic daily quote, ``random`` returns a fresh random quote on
-    each request.  Custom HTTP headers from ``header_provider_extension``
+    each request.  With a ``tag`` query parameter the quote comes from that
+    tag's daily channel, like ``/c/<tag>``.  Custom HTTP headers from ``header_provider_extension``
     are applied to both success and 503-unavailable responses.
 
     Returns flask.Response with a JSON body containing ``quote``, ``author``,
     ``publication``, ``date`` (YYYYMMDD), ``date_formatted`` (long form),
-    and ``expires_at`` (UTC ISO-8601).
+    and ``expires_at`` (UTC ISO-8601), plus ``cursor`` (the client's next
+    rotation step) in ``rotation`` mode with ``rotation_scope = client``.
     """
     # Read configuration and current local time
     config = api.get_config()
     now, tz_name = _get_local_now(config)
     mode = config[api.SECTION_WEB].get('mode', 'daily')
+    channel = request.args.get('tag')
 
     # Compute cache lifetime (capped at midnight in daily mode) and expires_at
     expiration_seconds, expires_at = _compute_expiration(config, mode, None, now)
@@ -146,15 +189,16 @@ def apiroute():
     date_url = now.strftime('%Y%m%d')
     date_formatted = now.strftime('%A, %B %d, %Y')
 
-    # Return 503 JSON when quotes unavailable, still applying extension headers
+    # Select the quote (mirrors HTML root: random | resolver | seeded RNG)
     quotes = get_quotes()
-    if quotes is None:
+    selection = _select_parsed_quote(config, quotes, mode, None, now, tz_name, channel)
+
+    # Return 503 JSON when quotes unavailable, still applying extension headers
+    if selection is None:
         response = make_response(jsonify({'error': 'quotes unavailable'}), 503)
         _apply_headers(response, config, expiration_seconds)
         return response
-
-    # Select the quote (mirrors HTML root: random | resolver | seeded RNG)
-    quote, _index, _permalink = _select_quote(config, quotes, mode, None, now, tz_name)
+    quote, _index, _permalink = selection
 
     # Build and return the JSON response
     body = {
@@ -165,6 +209,9 @@ def apiroute():
         'date_formatted': date_formatted,
         'expires_at': expires_at,
     }
+    # Clients without cookies pass this back as ?cursor= to continue their rotation
+    if getattr(g, 'rotation_cursor', None) is not None:
+        body['cursor'] = g.rotation_cursor
     response = make_response(jsonify(body), 200)
     _apply_headers(response, config, expiration_seconds)
     return response
@@ -185,7 +232,7 @@ def datepage(date_path_param):
     return showpage(date_path_param=date_path_param)
 
 
-def showpage(date_path_param=None):
+def showpage(date_path_param=None, channel=None):
     """Render the template"""
 
     # Read page configuration
@@ -208,14 +255,16 @@ def showpage(date_path_param=None):
             display_date = datetime.datetime.strptime(date_path_param, '%Y%m%d')
         except ValueError:
             abort(404)
-        if display_date.date() > now.date():
+        if display_date.date() > api.get_quote_date(tz_name, now):
             abort(404)
         date1 = display_date.strftime('%A, %B %d, %Y')
     else:
         date1 = now.strftime('%A, %B %d, %Y')
 
+    # Select quote (random | resolver | seeded RNG fallback)
     quotes = get_quotes()
-    if quotes is None:
+    selection = _select_parsed_quote(config, quotes, mode, date_path_param, now, tz_name, channel)
+    if selection is None:
         response = make_response(
             render_template(
                 'unavailable.html',
@@ -229,8 +278,7 @@ def showpage(date_path_param=None):
         _apply_headers(response, config, expiration_seconds)
         return response
 
-    # Select quote (random | resolver | seeded RNG fallback)
-    quote, index, permalink = _select_quote(config, quotes, mode, date_path_param, now, tz_name)
+    quote, index, permalink = selection
 
     stars = quote.get_num_stars()
     response = make_response(
@@ -247,6 +295,7 @@ def showpage(date_path_param=None):
             stars=stars,
             show_stars=show_stars,
             permalink=permalink,
+            api_url=url_for('apiroute', tag=channel),
             show_about=show_about,
             **colors,
         )
@@ -255,31 +304,93 @@ def showpage(date_path_param=None):
     return response
 
 
-def _select_quote(config, quotes, mode, date_path_param, now, tz_name):
+def _select_parsed_quote(config, quotes, mode, date_path_param, now, tz_name, channel=None):
+    """Select a quote with :func:`_select_quote` and make sure it parses.
+
+    Quotes are read lazily, so a malformed line is only detected when it is
+    selected (or, with a resolver, when hashes are compared).  Like a quote
+    file that cannot be read, that is logged and reported as unavailable.
+
+    Returns tuple[Quote, int, str | None], or None if ``quotes`` is None or
+    the selected quote is malformed.
+    """
+    if quotes is None:
+        return None
+    try:
+        selection = _select_quote(config, quotes, mode, date_path_param, now, tz_name, channel)
+        selection[0].get_hash()
+    except api.QuoteValidationError as exception:
+        app.logger.error(
+            "unable to read quote file '{0}'.  Details: {1}".format(app.config['QUOTE_FILE'], str(exception))
+        )
+        return None
+    return selection
+
+
+def _select_quote(config, quotes, mode, date_path_param, now, tz_name, channel=None):
     """Return ``(quote, index, permalink)`` for the configured selection mode.
 
     In ``random`` mode (and only when no ``date_path_param`` is supplied),
-    returns a truly random quote with no permalink.  Otherwise, tries the
+    returns a truly random quote with no permalink, weighted by star rating
+    when ``random_weighting`` is ``stars``.  In ``rotation`` mode it returns the
+    next quote of the no-repeat rotation for the client or the server.  Otherwise, tries the
     configured quote resolver first; on a miss or when no resolver is
     configured, falls back to seeded RNG on the root/api route or aborts
     with 404 on a dated permalink route.
 
+    With a ``channel`` the quote is chosen only from quotes with that tag,
+    by the channel's own seeded RNG (or at random in ``random`` mode); the
+    schedule and resolver do not apply, and an unknown tag aborts with 404.
+
     config (ConfigParser) -- the application configuration object.
     quotes (list[Quote]) -- the loaded quote list.
-    mode (str) -- the configured viewer mode ('daily' or 'random').
+    mode (str) -- the configured viewer mode ('daily', 'random' or 'rotation').
     date_path_param (str | None) -- the URL date parameter, or None.
     now (datetime) -- current local datetime (used for daily lookup).
     tz_name (str | None) -- IANA timezone name for seeded RNG.
+    channel (str | None) -- tag of the daily channel, or None for all quotes.
     Returns tuple[Quote, int, str | None].
     """
-    # Truly random selection only when no date is requested
+    # Daily channels pick from the tag's quotes with their own seeded RNG
+    if channel is not None:
+        if mode == 'random':
+            index = api.get_channel_random_choice(quotes, channel)
+        else:
+            index = api.get_channel_choice(quotes, channel, timezone=tz_name)
+        if index is None:
+            abort(404)
+        return quotes[index], index, None
+
+    # Truly random selection only when no date is requested; no scan of the quotes either way
     if mode == 'random' and date_path_param is None:
-        quote = api.get_first_match(quotes, rand=True)
-        return quote, quotes.index(quote), None
+        if config[api.SECTION_WEB].get('random_weighting', 'none') == 'stars':
+            index = api.get_star_weighted_choice(quotes)
+        else:
+            index = random.randrange(len(quotes))
+        return quotes[index], index, None
+
+    # Rotation walks a shuffle of all quotes, so a quote repeats only after all have been shown
+    if mode == 'rotation' and date_path_param is None:
+        index = api.get_rotation_choice(len(quotes), _next_rotation_cursor(config, len(quotes)))
+        return quotes[index], index, None
+
+    # Daily / dated path: a precomputed schedule answers without calling the resolver
+    lookup_date = date_path_param if date_path_param else api.get_quote_date(tz_name, now).strftime('%Y%m%d')
+    entry = _get_schedule(config).get(lookup_date)
+    if entry is not None and not api.is_entry_current(quotes, entry):
+        app.logger.warning('schedule entry for %s does not match the quote file; ignoring it', lookup_date)
+        entry = None
+    if entry is not None:
+        if entry.source == 'resolver':
+            permalink = f'/{lookup_date}' if date_path_param is None else None
+            return quotes[entry.number - 1], entry.number - 1, permalink
+        # As without a schedule, only resolver choices have a dated page
+        if date_path_param:
+            abort(404)
+        return quotes[entry.number - 1], entry.number - 1, None
 
-    # Daily / dated path: try the configured resolver first
+    # Not scheduled: try the configured resolver first
     resolver = _get_resolver(config)
-    lookup_date = date_path_param if date_path_param else now.strftime('%Y%m%d')
     resolved_hash = None
     if resolver:
         try:
@@ -291,7 +402,7 @@ def _select_quote(config, quotes, mode, date_path_param, now, tz_name):
     if resolved_hash:
         quote = api.get_first_match(quotes, hash_arg=resolved_hash)
         if quote:
-            index = quotes.index(quote)
+            index = _index_of(quotes, quote)
             permalink = f'/{lookup_date}' if date_path_param is None else None
             return quote, index, permalink
         if date_path_param:
@@ -306,13 +417,24 @@ def _select_quote(config, quotes, mode, date_path_param, now, tz_name):
     return quotes[index], index, None
 
 
+def _index_of(quotes, quote):
+    """Return the position of ``quote`` in ``quotes`` by identity.
+
+    Unlike ``list.index`` this does not compare fields, so the lazily read
+    quotes before it stay unparsed.
+    """
+    for index, candidate in enumerate(quotes):
+        if candidate is quote:
+            return index
+    raise ValueError('quote is not in the list')
+
+
 def _get_resolver(config):
     """Return the cached quote resolver function, or None.
 
     Loads the resolver module specified by the ``quote_resolver_extension`` property in the
-    ``[web]`` section of settings.conf.  The module must define a ``resolve``
-    function that accepts a date string (YYYYMMDD) and returns a 16-char MD5 hash
-    string or None.
+    ``[web]`` section of settings.conf with :func:`jotquote.api.load_resolver`, once;
+    a resolver that cannot be loaded is logged and treated as none.
 
     config (ConfigParser) -- the application configuration object.
     Returns callable or None.
@@ -321,14 +443,10 @@ def _get_resolver(config):
     if _resolver_loaded:
         return _resolver_fn
     _resolver_loaded = True
-    module_path = config[api.SECTION_WEB].get('quote_resolver_extension', '')
-    if not module_path:
-        return None
     try:
-        mod = importlib.import_module(module_path)
-        _resolver_fn = getattr(mod, 'resolve')
-    except (ImportError, AttributeError) as e:
-        app.logger.error('failed to load quote resolver %r: %s', module_path, e)
+        _resolver_fn = api.load_resolver(config)
+    except api.ConfigError as e:
+        app.logger.error('%s', e)
     return _resolver_fn
 
 
@@ -342,6 +460,135 @@ def _reset_resolver():
     _resolver_loaded = False
 
 
+@contextlib.contextmanager
+def _rotation_file_lock(path):
+    """Hold an exclusive OS lock on ``path`` for the duration of the block.
+
+    The lock file is created if missing.  If it cannot be opened or locked the
+    error is logged and the block runs unlocked, as a cursor that may repeat is
+    better than a failed page.
+
+    path (str) -- path of the lock file.
+    """
+    try:
+        f = open(path, 'a+b')
+    except OSError as e:
+        app.logger.error('unable to open rotation lock file %r: %s', path, e)
+        yield
+        return
+    with f:
+        try:
+            if sys.platform == 'win32':
+                import msvcrt
+
+                # msvcrt locks byte ranges from the current position; lock the first byte
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        except OSError as e:
+            app.logger.error('unable to lock rotation lock file %r: %s', path, e)
+            yield
+            return
+        try:
+            yield
+        finally:
+            if sys.platform == 'win32':
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _next_rotation_cursor(config, numquotes):
+    """Return the rotation cursor for this request and advance it.
+
+    With ``rotation_scope = client`` the cursor comes from the ``cursor``
+    query parameter or the rotation cookie; a new client starts at the
+    beginning of a randomly chosen pass so that clients do not show the same
+    sequence.  The advanced cursor
+    is stored in ``g`` for :func:`set_rotation_cookie`.  Otherwise the
+    server-wide cursor is read from ``rotation_state_file`` and the advanced
+    value is written back with an atomic rename, while holding an OS lock on
+    a ``.lock`` file beside it so that worker processes take turns.
+
+    config (ConfigParser) -- the application configuration object.
+    numquotes (int) -- number of quotes, for a new client's starting step.
+    Returns int.
+    """
+    if config[api.SECTION_WEB].get('rotation_scope', 'global') == 'client':
+        cursor = _parse_cursor(request.args.get('cursor') or request.cookies.get(_ROTATION_COOKIE))
+        if cursor is None:
+            cursor = numquotes * random.randrange(1 << 20)
+        g.rotation_cursor = cursor + 1
+        return cursor
+
+    path = config[api.SECTION_WEB].get('rotation_state_file') or os.path.join(api.get_config_dir(), 'rotation.state')
+    with _rotation_lock, _rotation_file_lock(path + '.lock'):
+        try:
+            with open(path, encoding='utf-8') as f:
+                cursor = _parse_cursor(f.read().strip()) or 0
+        except FileNotFoundError:
+            cursor = 0
+        except OSError as e:
+            app.logger.error('unable to read rotation state file %r: %s', path, e)
+            cursor = 0
+        temp_path = '{0}.{1}.tmp'.format(path, os.getpid())
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(str(cursor + 1))
+            os.replace(temp_path, path)
+        except OSError as e:
+            app.logger.error('unable to write rotation state file %r: %s', path, e)
+    return cursor
+
+
+def _parse_cursor(value):
+    """Return ``value`` as a non-negative rotation cursor, or None if it is missing or invalid."""
+    if value and value.isdigit():
+        return int(value)
+    return None
+
+
+def _get_schedule(config):
+    """Return the schedule table loaded from ``schedule_file``, keyed by YYYYMMDD date.
+
+    The file is written by ``jotquote schedule`` and named by the
+    ``schedule_file`` property in the ``[web]`` section of settings.conf.  It
+    is cached and reloaded only when its path or modification time changes.
+    A missing or invalid file is logged and treated as an empty schedule.
+
+    config (ConfigParser) -- the application configuration object.
+    Returns dict[str, ScheduleEntry].
+    """
+    global _schedule, _schedule_key
+    path = config[api.SECTION_WEB].get('schedule_file', '')
+    if not path:
+        return {}
+    try:
+        key = (path, os.stat(path).st_mtime)
+        if key != _schedule_key:
+            _schedule = api.load_schedule(path)
+            _schedule_key = key
+    except (OSError, api.StorageError) as e:
+        app.logger.error('unable to load schedule file %r: %s', path, e)
+        _schedule, _schedule_key = None, None
+        return {}
+    return _schedule
+
+
+def _reset_schedule():
+    """Clear the cached schedule so the next call to _get_schedule reloads.
+
+    Intended for use in tests only.
+    """
+    global _schedule, _schedule_key
+    _schedule = None
+    _schedule_key = None
+
+
 def _get_header_provider(config):
     """Return the cached header-provider function, or None.
 
@@ -456,7 +703,7 @@ def _compute_expiration(config, mode, date_path_param, now):
     any still-fresh cached copy when it reloads.
 
     config (ConfigParser) -- the application configuration object.
-    mode (str) -- the configured viewer mode ('daily' or 'random').
+    mode (str) -- the configured viewer mode ('daily', 'random' or 'rotation').
     date_path_param (str | None) -- the URL date parameter, or None for root.
     now (datetime) -- naive local datetime used for the midnight cap.
     Returns tuple[int, str | None].
@@ -465,7 +712,7 @@ def _compute_expiration(config, mode, date_path_param, now):
     expiration_seconds = int(config[api.SECTION_WEB].get('expiration_seconds', '14400'))
 
     # Cap at midnight for daily mode on the root route so the next day's quote appears
-    if mode != 'random' and date_path_param is None:
+    if mode not in ('random', 'rotation') and date_path_param is None:
         midnight = (now + datetime.timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
         seconds_until_midnight = int((midnight - now).total_seconds())
         expiration_seconds = min(expiration_seconds, seconds_until_midnight)
@@ -502,40 +749,59 @@ def _apply_headers(response, config, expiration_seconds):
 
 
 def get_quotes():
-    """Get cached list of quotes from application context.  If not set, read"""
-    quotes = getattr(g, '_quotes', None)
+    """Return the quotes of the quote file, read lazily and cached between requests.
+
+    The quote list is kept at module level and reread only when the quote
+    file's path, modification time or size changes, so the caches that the
+    selection functions key on the list (channels, star weighting) are
+    reused across requests.  Request threads share the list; its quotes
+    are parsed on first use, under the lock that makes ``api.LazyQuote``
+    safe to read from several threads.  The list and the file's
+    modification time are also stored in ``g``.  A file that cannot be
+    read is logged and None is returned.
+
+    Returns list[Quote] or None.
+    """
+    global _quotes, _quotes_key
 
     # Ensure that path to quote file read from configuration file
     if 'QUOTE_FILE' not in app.config:
         config = api.get_config()
         app.config['QUOTE_FILE'] = config.get(api.SECTION_GENERAL, 'quote_file')
 
+    path = app.config['QUOTE_FILE']
     try:
-        if quotes is None:
-            # Quotes not cached yet, read quote file
-            quotes = api.read_quotes(app.config['QUOTE_FILE'])
-            setattr(g, '_quotes', quotes)
-            mtime = os.stat(app.config['QUOTE_FILE']).st_mtime
-            setattr(g, '_cached_mtime', mtime)
-        else:
-            # Quotes had been previously cached, check if file modified
-            mtime = os.stat(app.config['QUOTE_FILE']).st_mtime
-            cached_mtime = getattr(g, '_cached_mtime', None)
-            if mtime != cached_mtime:
-                setattr(g, '_cached_mtime', mtime)
-                quotes = api.read_quotes(app.config['QUOTE_FILE'])
-                setattr(g, '_quotes', quotes)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        with _quotes_lock:
+            if key != _quotes_key:
+                # Quotes not cached yet or quote file modified, read quote file
+                _quotes = api.read_quotes_lazy(path)
+                _quotes_key = key
+            quotes = _quotes
     except BaseException as exception:
-        app.logger.error(
-            "unable to read quote file '{0}'.  Details: {1}".format(app.config['QUOTE_FILE'], str(exception))
-        )
+        app.logger.error("unable to read quote file '{0}'.  Details: {1}".format(path, str(exception)))
+        with _quotes_lock:
+            _quotes, _quotes_key = None, None
         setattr(g, '_quotes', None)
         setattr(g, '_cached_mtime', None)
         return None
 
+    setattr(g, '_quotes', quotes)
+    setattr(g, '_cached_mtime', stat.st_mtime)
     return quotes
 
 
+def _reset_quotes():
+    """Clear the cached quote list so the next call to get_quotes rereads the file.
+
+    Intended for use in tests only.
+    """
+    global _quotes, _quotes_key
+    with _quotes_lock:
+        _quotes, _quotes_key = None, None
+
+
 def run_server():
     """Start the web server using Waitress as the WSGI server.
 
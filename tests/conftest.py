@@ -12,8 +12,10 @@ from jotquote import api
 
 
 @pytest.fixture
-def config(monkeypatch):
+def config(monkeypatch, tmp_path):
     """Provide a test ConfigParser and patch api.get_config to return it."""
+    # Files kept beside settings.conf, like the lint cache, go to a temporary directory
+    monkeypatch.setenv('JOTQUOTE_CONFIG', str(tmp_path / 'config' / 'settings.conf'))
     cfg = ConfigParser()
     cfg.add_section(api.SECTION_GENERAL)
     cfg[api.SECTION_GENERAL]['quote_file'] = 'notset'
@@ -37,5 +39,6 @@ def flask_client(tmp_path):
     quote_file = tests.test_util.init_quotefile(str(tmp_path), 'quotes5.txt')
     viewer.app.testing = True
     viewer.app.config['QUOTE_FILE'] = quote_file
+    viewer._reset_quotes()
     with viewer.app.test_client() as client:
         yield client, quote_file
@@ -14,5 +14,6 @@ def flask_client(tmp_path):
     quote_file = tests.test_util.init_quotefile(str(tmp_path), 'quotes5.txt')
     web.app.testing = True
     web.app.config['QUOTE_FILE'] = quote_file
+    web._reset_quotes()
     with web.app.test_client() as client:
         yield client, quote_file
@@ -303,6 +303,30 @@ def test_lint_duplicate_hash_integration(tmp_path):
     assert 'duplicate-hash' in output
 
 
+def test_lint_order_independent_of_hash_seed(tmp_path):
+    """jotquote lint lists issues in the same order whatever the string hash seed."""
+    quote_file = tmp_path / 'quotes.txt'
+    quote_file.write_text(
+        '\u201cA  quote\u201d | Author A | |\nanother  quote | Author B | |\n',
+        encoding='utf-8',
+    )
+    env = _make_env(tmp_path, quote_file)
+
+    outputs = []
+    for seed in ('1', '2'):
+        result = subprocess.run(
+            [_script('jotquote'), 'lint', '--no-cache'],
+            env=dict(env, PYTHONHASHSEED=seed),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        assert result.returncode != 0
+        outputs.append(result.stdout.decode('utf-8', errors='replace'))
+
+    assert outputs[0] == outputs[1]
+    assert outputs[0].count('line ') >= 4
+
+
 def test_lint_unicode_ellipsis_fix_integration(tmp_path):
     """jotquote lint --fix replaces the unicode ellipsis with three ASCII periods."""
     quote_file = tmp_path / 'quotes.txt'
@@ -45,6 +45,16 @@ def test_get_config_env_var_overrides_default(tmp_path, monkeypatch):
     assert config.get(api.SECTION_WEB, 'page_title') == 'Custom Title'
 
 
+def test_get_config_dir(tmp_path, monkeypatch):
+    """get_config_dir returns the directory of JOTQUOTE_CONFIG, or of CONFIG_FILE when unset."""
+    monkeypatch.setenv('JOTQUOTE_CONFIG', str(tmp_path / 'settings.conf'))
+    assert api.get_config_dir() == str(tmp_path)
+
+    monkeypatch.delenv('JOTQUOTE_CONFIG')
+    monkeypatch.setattr(config_mod, 'CONFIG_FILE', str(tmp_path / 'home' / 'settings.conf'))
+    assert api.get_config_dir() == str(tmp_path / 'home')
+
+
 def test_get_config_resolves_relative_quote_file(tmp_path, monkeypatch):
     """A relative quote_file path is resolved to an absolute path."""
     quotes_file = tmp_path / 'myquotes.txt'
@@ -63,6 +73,34 @@ def test_get_config_resolves_relative_quote_file(tmp_path, monkeypatch):
     assert resolved == str(quotes_file)
 
 
+def test_get_config_resolves_relative_schedule_file(tmp_path, monkeypatch):
+    """A relative schedule_file path is resolved against the settings.conf directory."""
+    config_file = tmp_path / 'settings.conf'
+    config_file.write_text(
+        '[general]\nquote_file = ./myquotes.txt\n[web]\nschedule_file = schedule.csv\n',
+        encoding='utf-8',
+    )
+    monkeypatch.setenv('JOTQUOTE_CONFIG', str(config_file))
+
+    config = api.get_config()
+
+    assert config.get(api.SECTION_WEB, 'schedule_file') == str(tmp_path / 'schedule.csv')
+
+
+def test_get_config_resolves_relative_spelling_word_list(tmp_path, monkeypatch):
+    """A relative spelling_word_list path is resolved against the settings.conf directory."""
+    config_file = tmp_path / 'settings.conf'
+    config_file.write_text(
+        '[general]\nquote_file = ./myquotes.txt\n[lint]\nspelling_word_list = words.txt\n',
+        encoding='utf-8',
+    )
+    monkeypatch.setenv('JOTQUOTE_CONFIG', str(config_file))
+
+    config = api.get_config()
+
+    assert config.get(api.SECTION_LINT, 'spelling_word_list') == str(tmp_path / 'words.txt')
+
+
 def test_get_config_new_format(tmp_path, monkeypatch):
     """get_config() reads the new three-section format correctly."""
     config_file = tmp_path / 'settings.conf'
@@ -290,6 +328,8 @@ def test_all_known_keys_no_warning(tmp_path, monkeypatch, recwarn):
         'enabled_checks = smart-quotes\n'
         'lint_on_add = false\n'
         'max_quote_length = 0\n'
+        'near_duplicate_threshold = 0.7\n'
+        'spelling_word_list =\n'
         '\n'
         '[web]\n'
         'mode = daily\n'
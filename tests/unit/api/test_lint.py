@@ -2,13 +2,21 @@
 #  This file is licensed under the terms of the MIT License.  See the LICENSE
 # file in the root of this repository for complete details.
 
+import importlib.metadata
+import marshal
+import mmap
+import sys
 from configparser import ConfigParser
 
+import pytest
+
 from jotquote import api
+from jotquote.api import lint
 from jotquote.api.lint import (
     CHECKS,
     LintIssue,
     apply_fixes,
+    iter_lint_issues,
     lint_quotes,
 )
 
@@ -179,19 +187,19 @@ def test_check_quote_length_no_limit():
     """When lint_max_quote_length is 0 (default), no issues are raised."""
     cfg = _make_config()[api.SECTION_LINT]
     q = _make_quote(quote='x' * 500)
-    assert CHECKS['quote-too-long'].check(q, config=cfg) == []
+    assert CHECKS['quote-too-long'].check(q, rules=CHECKS['quote-too-long'].prepare(cfg)) == []
 
 
 def test_check_quote_length_within_limit():
     cfg = _make_config(max_quote_length='100')[api.SECTION_LINT]
     q = _make_quote(quote='x' * 100)
-    assert CHECKS['quote-too-long'].check(q, config=cfg) == []
+    assert CHECKS['quote-too-long'].check(q, rules=CHECKS['quote-too-long'].prepare(cfg)) == []
 
 
 def test_check_quote_length_exceeds_limit():
     cfg = _make_config(max_quote_length='100')[api.SECTION_LINT]
     q = _make_quote(quote='x' * 101)
-    issues = CHECKS['quote-too-long'].check(q, config=cfg)
+    issues = CHECKS['quote-too-long'].check(q, rules=CHECKS['quote-too-long'].prepare(cfg))
     assert len(issues) == 1
     assert issues[0].check == 'quote-too-long'
     assert issues[0].field == 'quote'
@@ -357,23 +365,40 @@ def test_check_lowercase_start_ignored_with_leading_digit():
 # ---------------------------------------------------------------------------
 
 
+@pytest.mark.parametrize(
+    'name, settings, quote, count',
+    [
+        ('quote-too-long', {'max_quote_length': '100'}, {'quote': 'x' * 101}, 1),
+        ('quote-too-long', {'max_quote_length': '100'}, {'quote': 'x' * 100}, 0),
+        ('required-tag-group', {'required_tag_groups': {'stars': '1star, 2stars'}}, {'tags': ['funny']}, 1),
+        ('required-tag-group', {'required_tag_groups': {'stars': '1star, 2stars'}}, {'tags': ['2stars']}, 0),
+    ],
+)
+def test_check_accepts_unprepared_section(name, settings, quote, count):
+    """check() still accepts the [lint] section itself, as it did before prepare() existed."""
+    cfg = _make_config(**settings)[api.SECTION_LINT]
+    q = _make_quote(**quote)
+    assert CHECKS[name].check(q, config=cfg) == CHECKS[name].check(q, rules=CHECKS[name].prepare(cfg))
+    assert len(CHECKS[name].check(q, config=cfg)) == count
+
+
 def test_required_tag_groups_not_configured():
     """When no lint_required_group_* keys exist, no issues are raised."""
     cfg = _make_config()[api.SECTION_LINT]
     q = _make_quote(tags=['funny'])
-    assert CHECKS['required-tag-group'].check(q, config=cfg) == []
+    assert CHECKS['required-tag-group'].check(q, rules=CHECKS['required-tag-group'].prepare(cfg)) == []
 
 
 def test_required_tag_groups_quote_has_required_tag():
     cfg = _make_config(required_tag_groups={'stars': '1star, 2stars, 3stars, 4stars, 5stars'})[api.SECTION_LINT]
     q = _make_quote(tags=['3stars', 'funny'])
-    assert CHECKS['required-tag-group'].check(q, config=cfg) == []
+    assert CHECKS['required-tag-group'].check(q, rules=CHECKS['required-tag-group'].prepare(cfg)) == []
 
 
 def test_required_tag_groups_missing_tag():
     cfg = _make_config(required_tag_groups={'stars': '1star, 2stars, 3stars, 4stars, 5stars'})[api.SECTION_LINT]
     q = _make_quote(tags=['funny'])
-    issues = CHECKS['required-tag-group'].check(q, config=cfg)
+    issues = CHECKS['required-tag-group'].check(q, rules=CHECKS['required-tag-group'].prepare(cfg))
     assert len(issues) == 1
     assert issues[0].check == 'required-tag-group'
     assert issues[0].field == 'tags'
@@ -389,7 +414,7 @@ def test_required_tag_groups_multiple_groups_all_satisfied():
         }
     )[api.SECTION_LINT]
     q = _make_quote(tags=['3stars', 'public', 'funny'])
-    assert CHECKS['required-tag-group'].check(q, config=cfg) == []
+    assert CHECKS['required-tag-group'].check(q, rules=CHECKS['required-tag-group'].prepare(cfg)) == []
 
 
 def test_required_tag_groups_multiple_groups_one_missing():
@@ -400,13 +425,107 @@ def test_required_tag_groups_multiple_groups_one_missing():
         }
     )[api.SECTION_LINT]
     q = _make_quote(tags=['3stars', 'funny'])
-    issues = CHECKS['required-tag-group'].check(q, config=cfg)
+    issues = CHECKS['required-tag-group'].check(q, rules=CHECKS['required-tag-group'].prepare(cfg))
     assert len(issues) == 1
     assert issues[0].check == 'required-tag-group'
     assert 'public' in issues[0].message
     assert 'private' in issues[0].message
 
 
+# ---------------------------------------------------------------------------
+# _check_spelling
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def word_list(tmp_path, monkeypatch):
+    """Write a word list and return a config using it, with the word cache in tmp_path."""
+    monkeypatch.setenv('JOTQUOTE_CONFIG', str(tmp_path / 'config' / 'settings.conf'))
+    monkeypatch.setattr(lint, '_word_list', (None, None))
+    path = tmp_path / 'words.txt'
+    path.write_text('The\ncat\nhat\nbest\nend\ndon\u2019t\n', encoding='utf-8')
+    cfg = _make_config()
+    cfg[api.SECTION_LINT]['spelling_word_list'] = str(path)
+    return cfg
+
+
+def test_spelling_not_configured():
+    """Without spelling_word_list, the spelling check does nothing."""
+    cfg = _make_config()
+    assert lint_quotes([_make_quote(quote='Teh wrold.')], ['spelling'], cfg) == []
+
+
+def test_spelling_flags_unknown_words(word_list):
+    """Unknown words are reported once each, in order, ignoring case and possessives."""
+    quotes = [
+        _make_quote(quote="The cat's Hat wsa teh best, teh end.", line_number=1),
+        _make_quote(quote="Don't, THE END.", line_number=2),
+    ]
+    issues = lint_quotes(quotes, ['spelling'], word_list)
+    assert [(i.line_number, i.field, i.message) for i in issues] == [(1, 'quote', 'Possibly misspelled: wsa, teh')]
+    assert not issues[0].fixable
+
+
+def test_spelling_word_cache_file(word_list, tmp_path):
+    """The sorted word list is saved beside settings.conf and mapped into memory."""
+    lint_quotes([_make_quote(quote='The cat.')], ['spelling'], word_list)
+    (cache_file,) = (tmp_path / 'config' / 'lint_cache').iterdir()
+    assert cache_file.read_bytes().split(b'\n')[1:] == [b'best', b'cat', b"don't", b'end', b'hat', b'the', b'']
+    assert isinstance(lint._word_list[1].buffer, mmap.mmap)
+
+
+def test_spelling_word_list_changed(word_list, tmp_path):
+    """Editing the word list rebuilds the word cache and invalidates cached lint results."""
+    quotes = [_make_quote(quote='The wsa.')]
+    cache = {}
+    assert len(lint_quotes(quotes, ['spelling'], word_list, cache=cache)) == 1
+
+    with open(str(tmp_path / 'words.txt'), 'a', encoding='utf-8') as f:
+        f.write('wsa\n')
+    assert lint_quotes(quotes, ['spelling'], word_list, cache=cache) == []
+    (cache_file,) = (tmp_path / 'config' / 'lint_cache').iterdir()
+    assert b'\nwsa\n' in cache_file.read_bytes()
+
+
+def test_spelling_word_cache_unwritable(word_list, tmp_path, monkeypatch):
+    """When the word cache cannot be written, the words are kept in memory."""
+    blocker = tmp_path / 'blocker'
+    blocker.write_text('', encoding='utf-8')
+    monkeypatch.setenv('JOTQUOTE_CONFIG', str(blocker / 'settings.conf'))
+    issues = lint_quotes([_make_quote(quote='The wsa.')], ['spelling'], word_list)
+    assert [i.message for i in issues] == ['Possibly misspelled: wsa']
+    assert isinstance(lint._word_list[1].buffer, bytes)
+
+
+def test_spelling_missing_word_list(word_list, tmp_path):
+    """A spelling_word_list that cannot be read raises ConfigError."""
+    word_list[api.SECTION_LINT]['spelling_word_list'] = str(tmp_path / 'missing.txt')
+    with pytest.raises(api.ConfigError, match='missing.txt'):
+        lint_quotes([_make_quote()], ['spelling'], word_list)
+
+
+def test_word_list_search():
+    """Every listed word is found, and no other, including prefixes and neighbours."""
+    words = sorted(['a', 'ab', 'abc', 'b', 'ba', 'caf\u00e9', 'z'])
+    word_list = lint._WordList(b'header\n' + b''.join(w.encode('utf-8') + b'\n' for w in words), 7)
+    for word in words:
+        assert word_list._contains(word)
+    for word in ['', 'aa', 'abd', 'bb', 'c', 'cafe', 'zz', '0']:
+        assert not word_list._contains(word)
+    assert not lint._WordList(b'header\n', 7)._contains('a')
+
+
+def test_word_list_answers_bounded(word_list, monkeypatch):
+    """The remembered answers are forgotten once _WORD_MEMO_LIMIT is reached, without changing the issues."""
+    monkeypatch.setattr(lint, '_WORD_MEMO_LIMIT', 4)
+    quotes = [_make_quote(quote='The cat wsa{0} hat.'.format(c), line_number=i) for i, c in enumerate('abcdefghij')]
+    issues = lint_quotes(quotes, ['spelling'], word_list)
+    assert [i.message for i in issues] == ['Possibly misspelled: wsa{0}'.format(c) for c in 'abcdefghij']
+    memo = lint._word_list[1]
+    assert len(memo.known) + len(memo.misspelled) <= 4
+    assert len(memo._listed) <= 5
+
+
 # ---------------------------------------------------------------------------
 # _check_duplicate_hash
 # ---------------------------------------------------------------------------
@@ -448,6 +567,121 @@ def test_check_duplicate_hash_detects_group_of_three():
     assert {i.line_number for i in issues} == {5, 9}
 
 
+# ---------------------------------------------------------------------------
+# author-variants
+# ---------------------------------------------------------------------------
+
+
+def test_author_variants():
+    """Quotes by a variant of a more common author name are flagged on the author field."""
+    quotes = [
+        _make_quote(author='Ralph Waldo Emerson', line_number=1),
+        _make_quote(author='R. W. Emerson', line_number=2),
+        _make_quote(author='Ralph Waldo Emerson', line_number=3),
+        _make_quote(author='Jane Smith', line_number=4),
+        _make_quote(author='R. W. Emerson', line_number=5),
+        _make_quote(author='John Smith', line_number=6),
+    ]
+    issues = CHECKS['author-variants'].check(quotes)
+    assert [(i.line_number, i.field, i.message) for i in issues] == [
+        (2, 'author', "Author may be the same as 'Ralph Waldo Emerson' (2 quotes)"),
+        (5, 'author', "Author may be the same as 'Ralph Waldo Emerson' (2 quotes)"),
+    ]
+    assert not issues[0].fixable
+
+
+# ---------------------------------------------------------------------------
+# near-duplicate
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def signature_file(tmp_path, monkeypatch):
+    """Keep the near-duplicate signature file in tmp_path and return its path."""
+    monkeypatch.setenv('JOTQUOTE_CONFIG', str(tmp_path / 'config' / 'settings.conf'))
+    monkeypatch.setattr(lint, '_signatures', None)
+    monkeypatch.setattr(lint, '_signatures_changed', False)
+    return tmp_path / 'config' / 'lint_cache' / 'near-duplicate.bin'
+
+
+def test_near_duplicate_detects_pair(signature_file):
+    """A quote nearly the same as an earlier one is flagged with the earlier quote's line."""
+    quotes = [
+        _make_quote(quote='The only way to do great work is to love what you do.', line_number=2),
+        _make_quote(quote='Be yourself; everyone else is already taken.', line_number=4),
+        _make_quote(quote='The only way to do great work is to love what you truly do.', line_number=9),
+    ]
+    issues = lint_quotes(quotes, ['near-duplicate'], _make_config())
+    assert [(i.line_number, i.field, i.message) for i in issues] == [
+        (9, 'quote', 'Quote is 79% similar to the quote on line 2')
+    ]
+    assert not signature_file.exists()
+    lint.write_near_duplicate_signatures()
+    assert signature_file.exists()
+
+
+def test_near_duplicate_skips_duplicate_hash(signature_file):
+    """Quotes that duplicate-hash reports are not reported again when it runs too."""
+    quotes = [
+        _make_quote(quote='The only way to do great work is to love what you do.', line_number=1),
+        _make_quote(quote='The only way to do great work is to love what you do!', line_number=2),
+    ]
+    assert CHECKS['near-duplicate'].check(quotes, rules=(0.7, True)) == []
+    issues = lint_quotes(quotes, ['near-duplicate', 'duplicate-hash'], _make_config())
+    assert [i.check for i in issues] == ['duplicate-hash']
+
+
+def test_near_duplicate_reports_same_hash_without_duplicate_hash(signature_file):
+    """Without duplicate-hash in the run, quotes with the same fuzzy hash are reported as near duplicates."""
+    quotes = [
+        _make_quote(quote='The only way to do great work is to love what you do.', line_number=1),
+        _make_quote(quote='The only way to do great work is to love what you do!', line_number=2),
+    ]
+    issues = lint_quotes(quotes, ['near-duplicate'], _make_config())
+    assert [(i.check, i.line_number) for i in issues] == [('near-duplicate', 2)]
+    # The checks of the run count, not enabled_checks in the settings
+    issues = lint_quotes(quotes, ['near-duplicate'], _make_config(enabled_checks='duplicate-hash, near-duplicate'))
+    assert [(i.check, i.line_number) for i in issues] == [('near-duplicate', 2)]
+    assert CHECKS['near-duplicate'].check(
+        quotes, rules=CHECKS['near-duplicate'].prepare(_make_config()[api.SECTION_LINT])
+    )
+
+
+def test_near_duplicate_threshold():
+    """near_duplicate_threshold defaults to 0.7 and must be in (0, 1]."""
+    check = CHECKS['near-duplicate']
+    cfg = _make_config()
+    assert check.prepare(cfg[api.SECTION_LINT]) == (0.7, False)
+    assert check.prepare(_make_config(enabled_checks='duplicate-hash')[api.SECTION_LINT]) == (0.7, True)
+    cfg[api.SECTION_LINT]['near_duplicate_threshold'] = '0.9'
+    assert check.prepare(cfg[api.SECTION_LINT]) == (0.9, False)
+    for value in ['0', '1.5', 'high']:
+        cfg[api.SECTION_LINT]['near_duplicate_threshold'] = value
+        with pytest.raises(api.ConfigError, match='near_duplicate_threshold'):
+            check.prepare(cfg[api.SECTION_LINT])
+
+
+def test_near_duplicate_signature_file_unwritable(signature_file):
+    """Saving the signatures raises StorageError when the signature file cannot be written."""
+    signature_file.parent.parent.mkdir()
+    signature_file.parent.write_text('', encoding='utf-8')
+    quotes = [
+        _make_quote(quote='The only way to do great work is to love what you do.', line_number=1),
+        _make_quote(quote='The only way to do great work is to love what you truly do.', line_number=2),
+    ]
+    assert [i.line_number for i in lint_quotes(quotes, ['near-duplicate'], _make_config())] == [2]
+    with pytest.raises(api.StorageError):
+        lint.write_near_duplicate_signatures()
+
+
+def test_get_near_duplicate_settings(signature_file):
+    """get_near_duplicate_settings() returns the configured threshold and the signature file."""
+    cfg = _make_config()
+    assert api.get_near_duplicate_settings(cfg) == (0.7, str(signature_file))
+    cfg[api.SECTION_LINT]['near_duplicate_threshold'] = '0.9'
+    assert api.get_near_duplicate_settings(cfg) == (0.9, str(signature_file))
+
+
 # ---------------------------------------------------------------------------
 # _check_unicode_ellipsis
 # ---------------------------------------------------------------------------
@@ -691,6 +925,106 @@ def test_apply_fixes_ignores_unknown_check_name():
     assert quotes[0].quote == 'Hello.'
 
 
+def test_lint_quotes_prepares_each_check_once(monkeypatch):
+    """lint_quotes reads the settings of each check once per run, not once per quote."""
+    prepared = []
+    prepare = lint.RequiredTagGroupCheck.prepare
+    monkeypatch.setattr(
+        lint.RequiredTagGroupCheck, 'prepare', lambda self, cfg: prepared.append(cfg) or prepare(self, cfg)
+    )
+    cfg = _make_config(required_tag_groups={'stars': '1star, 2stars'})
+    quotes = [_make_quote(tags=['1star'], line_number=1), _make_quote(tags=['funny'], line_number=2)]
+
+    issues = lint_quotes(quotes, ['required-tag-group', 'no-tags'], cfg)
+
+    assert len(prepared) == 1
+    assert [(i.line_number, i.message) for i in issues] == [
+        (2, 'Quote must have one of the following tags: 1star, 2stars')
+    ]
+
+
+def test_check_prepare_default():
+    """The default prepare() passes the [lint] section on only to checks that need it."""
+    cfg = _make_config()[api.SECTION_LINT]
+    assert CHECKS['no-tags'].prepare(cfg) is None
+    assert CHECKS['quote-too-long'].prepare(cfg) == 0
+
+
+def test_check_prepare_custom_rules():
+    """A check's prepare() result reaches check() in lint_quotes."""
+    from jotquote.api.lint import CHECKS, Check
+
+    class _TempLimitCheck(Check):
+        name = 'temp-limit-test-only'
+        needs_config = True
+
+        def prepare(self, config):
+            return len(config.get('temp_limit_word', ''))
+
+        def check(self, quote, *, config=None, rules=None):
+            if len(quote.quote) > rules:
+                return []
+            return [LintIssue(line_number=quote.line_number, check=self.name, field='quote', message='short')]
+
+    try:
+        cfg = _make_config()
+        cfg[api.SECTION_LINT]['temp_limit_word'] = 'abcdef'
+        quotes = [_make_quote(quote='abc', line_number=1), _make_quote(quote='abcdefgh', line_number=2)]
+        assert [i.line_number for i in lint_quotes(quotes, ['temp-limit-test-only'], cfg)] == [1]
+    finally:
+        CHECKS.pop('temp-limit-test-only', None)
+
+
+def test_check_prepare_mapping_rules():
+    """Rules that are a mapping reach check() as prepared, without being prepared again."""
+    from jotquote.api.lint import CHECKS, Check
+
+    prepared = []
+
+    class _TempMappingCheck(Check):
+        name = 'temp-mapping-test-only'
+        needs_config = True
+
+        def prepare(self, config):
+            prepared.append(config)
+            return {'limit': 3}
+
+        def check(self, quote, *, config=None, rules=None):
+            rules = self._rules(config, rules)
+            if len(quote.quote) > rules['limit']:
+                return []
+            return [LintIssue(line_number=quote.line_number, check=self.name, field='quote', message='short')]
+
+    try:
+        quotes = [_make_quote(quote='abc', line_number=1), _make_quote(quote='abcdefgh', line_number=2)]
+        assert [i.line_number for i in lint_quotes(quotes, ['temp-mapping-test-only'], _make_config())] == [1]
+        assert len(prepared) == 1
+    finally:
+        CHECKS.pop('temp-mapping-test-only', None)
+
+
+def test_check_default_prepare_passes_config():
+    """A check that keeps the default prepare() gets the [lint] section as config, as before prepare() existed."""
+    from jotquote.api.lint import CHECKS, Check
+
+    class _TempSectionCheck(Check):
+        name = 'temp-section-test-only'
+        needs_config = True
+
+        def check(self, quote, *, config=None):
+            if len(quote.quote) > int(config.get('temp_limit', '0')):
+                return []
+            return [LintIssue(line_number=quote.line_number, check=self.name, field='quote', message='short')]
+
+    try:
+        cfg = _make_config()
+        cfg[api.SECTION_LINT]['temp_limit'] = '4'
+        quotes = [_make_quote(quote='abc', line_number=1), _make_quote(quote='abcdefgh', line_number=2)]
+        assert [i.line_number for i in lint_quotes(quotes, ['temp-section-test-only'], cfg)] == [1]
+    finally:
+        CHECKS.pop('temp-section-test-only', None)
+
+
 def test_check_subclass_self_registers():
     """Defining a new Check subclass adds it to CHECKS automatically."""
     from jotquote.api.lint import CHECKS, Check
@@ -707,3 +1041,386 @@ def test_check_subclass_self_registers():
     finally:
         # Don't leak the probe into other tests via the module-global registry.
         CHECKS.pop('temp-probe-test-only', None)
+
+
+# ---------------------------------------------------------------------------
+# Fused pattern checks
+# ---------------------------------------------------------------------------
+
+
+def _mixed_quotes():
+    return [
+        _make_quote(quote='Clean quote.', line_number=1),
+        _make_quote(quote='“Hi”  there — again…', author='A  B', line_number=2),
+        _make_quote(quote='it is', author='‘Ann’', publication='Vol – 2…', line_number=3),
+        _make_quote(quote='Fine.', author='', publication='The  End', line_number=4),
+    ]
+
+
+def test_lint_quotes_fused_matches_each_check_alone():
+    """Running the checks together gives the issues of each check run alone, in check order."""
+    cfg = _make_config()
+    quotes = _mixed_quotes()
+    checks = ['double-spaces', 'no-author', 'smart-quotes', 'unicode-ellipsis', 'lowercase-start', 'smart-dashes']
+    expected = []
+    for name in checks:
+        for quote in quotes:
+            expected.extend(CHECKS[name].check(quote, config=cfg[api.SECTION_LINT]))
+    assert len(expected) == 11
+    assert lint_quotes(quotes, checks, cfg) == expected
+
+
+def test_lint_quotes_duplicate_check_names():
+    """A check named twice reports its issues twice, as when run one name at a time."""
+    q = _make_quote(quote='A  B.')
+    issues = lint_quotes([q], ['double-spaces', 'double-spaces'], _make_config())
+    assert [i.check for i in issues] == ['double-spaces', 'double-spaces']
+
+
+def test_pattern_check_subclass_is_fused():
+    """A PatternCheck subclass joins the fused scan alongside the character checks."""
+    from jotquote.api.lint import PatternCheck
+
+    class _TempTabsCheck(PatternCheck):
+        name = 'temp-tabs-test-only'
+        pattern = r'\t+'
+
+        def make_issue(self, quote, field_name, value, found):
+            return LintIssue(quote.line_number, self.name, field_name, '{} tab runs'.format(len(found)))
+
+    try:
+        q = _make_quote(quote='a\tb\t\tc…', line_number=7)
+        issues = lint_quotes([q], ['unicode-ellipsis', 'temp-tabs-test-only'], _make_config())
+        assert [(i.check, i.field, i.message) for i in issues] == [
+            ('unicode-ellipsis', 'quote', 'Unicode ellipsis in quote'),
+            ('temp-tabs-test-only', 'quote', '2 tab runs'),
+        ]
+    finally:
+        CHECKS.pop('temp-tabs-test-only', None)
+
+
+# ---------------------------------------------------------------------------
+# Parallel lint
+# ---------------------------------------------------------------------------
+
+
+def test_lint_quotes_workers_match_serial(monkeypatch):
+    """Spreading per-quote checks over worker processes returns the serial issues, in order."""
+    monkeypatch.setattr('jotquote.api.lint._MIN_CHUNK_QUOTES', 2)
+    quotes = _mixed_quotes() * 3
+    for line_number, quote in enumerate(quotes, 1):
+        quote.line_number = line_number
+    quotes.append(_make_quote(quote='Ants bother cats daily.', tags=['funny', '3stars'], line_number=13))
+    quotes.append(_make_quote(quote='Apples bake cherries deliciously.', line_number=14))
+    cfg = _make_config(max_quote_length='12', required_tag_groups={'mood': 'funny'})
+    checks = ['smart-dashes', 'duplicate-hash', 'no-tags', 'required-tag-group', 'quote-too-long', 'double-spaces']
+
+    serial = lint_quotes(quotes, checks, cfg)
+    assert {i.check for i in serial} == set(checks)
+    assert lint_quotes(quotes, checks, cfg, workers=2) == serial
+    assert lint_quotes(quotes, checks, cfg, workers=0) == serial
+
+
+def test_lint_quotes_workers_short_list_runs_in_process(monkeypatch):
+    """A list shorter than two chunks is checked without starting worker processes."""
+
+    def _fail(*args, **kwargs):
+        raise AssertionError('process pool started')
+
+    monkeypatch.setattr('concurrent.futures.ProcessPoolExecutor', _fail)
+    q = _make_quote(quote='A  B.')
+    issues = lint_quotes([q], ['double-spaces'], _make_config(), workers=4)
+    assert [i.check for i in issues] == ['double-spaces']
+
+
+# ---------------------------------------------------------------------------
+# Per-quote result cache
+# ---------------------------------------------------------------------------
+
+
+def test_lint_quotes_cache_matches_uncached(monkeypatch):
+    """A cached run returns the uncached issues, checking only quotes it has not seen."""
+    cfg = _make_config()
+    checks = ['double-spaces', 'duplicate-hash', 'no-author', 'smart-quotes']
+    cache = {}
+    quotes = _mixed_quotes()
+    assert lint_quotes(quotes, checks, cfg, cache=cache) == lint_quotes(quotes, checks, cfg)
+
+    # Edit one quote and move another to a new line
+    quotes = _mixed_quotes()
+    quotes[0].quote = 'Now  spaced.'
+    quotes[3].line_number = 9
+    checked = []
+    each = lint._lint_each_quote
+    monkeypatch.setattr(lint, '_lint_each_quote', lambda qs, *args: checked.extend(qs) or each(qs, *args))
+    issues = lint_quotes(quotes, checks, cfg, cache=cache)
+
+    assert [q.quote for q in checked] == ['Now  spaced.']
+    assert issues == lint_quotes(quotes, checks, cfg)
+    assert [(i.check, i.line_number) for i in issues if i.field != 'quote'] == [
+        ('double-spaces', 2),
+        ('double-spaces', 9),
+        ('no-author', 9),
+        ('smart-quotes', 3),
+    ]
+
+
+def test_lint_quotes_cache_entries_compact():
+    """The cache keeps () for a clean quote and, otherwise, each check's issues without line number or check name."""
+    cache = {}
+    lint_quotes(_mixed_quotes()[:2], ['double-spaces', 'no-author'], _make_config(), cache=cache)
+    ((_, record),) = cache.items()
+    assert list(record['quotes'].values()) == [
+        (),
+        (
+            (
+                ('quote', 'Multiple consecutive spaces in quote', True, '“Hi” there — again…'),
+                ('author', 'Multiple consecutive spaces in author', True, 'A B'),
+            ),
+            (),
+        ),
+    ]
+
+
+def test_lint_quotes_cache_invalidated_by_config():
+    """Changing the [lint] settings or the checks re-checks every quote."""
+    cache = {}
+    quotes = [_make_quote(quote='A long quote.')]
+    assert lint_quotes(quotes, ['quote-too-long'], _make_config(max_quote_length='0'), cache=cache) == []
+    issues = lint_quotes(quotes, ['quote-too-long'], _make_config(max_quote_length='5'), cache=cache)
+    assert [i.check for i in issues] == ['quote-too-long']
+    assert lint_quotes(quotes, ['no-tags'], _make_config(), cache=cache)[0].check == 'no-tags'
+    assert len(cache) == 1
+
+
+def test_lint_quotes_cache_shared_line_numbers():
+    """Quotes without distinct line numbers are still cached per quote."""
+    cache = {}
+    quotes = [_make_quote(quote='A  b.', line_number=0), _make_quote(quote='C d.', line_number=0)]
+    issues = lint_quotes(quotes, ['double-spaces'], _make_config(), cache=cache)
+    assert [i.fix_value for i in issues] == ['A b.']
+    assert lint_quotes(quotes, ['double-spaces'], _make_config(), cache=cache) == issues
+
+
+def test_lint_quotes_cache_reuses_file_checks(monkeypatch):
+    """File-scope checks only run again when the quote list has changed."""
+    cfg = _make_config()
+    cache = {}
+    quotes = _mixed_quotes()
+    expected = lint_quotes(quotes, ['duplicate-hash'], cfg, cache=cache)
+
+    whole = lint._lint_whole_file
+    calls = []
+    monkeypatch.setattr(lint, '_lint_whole_file', lambda qs, *args: calls.append(qs) or whole(qs, *args))
+    assert lint_quotes(_mixed_quotes(), ['duplicate-hash'], cfg, cache=cache) == expected
+    assert calls == []
+
+    quotes = _mixed_quotes()
+    quotes[1].line_number = 7
+    lint_quotes(quotes, ['duplicate-hash'], cfg, cache=cache)
+    assert len(calls) == 1
+
+
+def test_lint_quotes_cache_check_order():
+    """The cache is reused when the same checks are passed in a different order."""
+    cfg = _make_config()
+    cache = {}
+    lint_quotes(_mixed_quotes(), ['smart-quotes', 'double-spaces'], cfg, cache=cache)
+    saved = dict(cache)
+    issues = lint_quotes(_mixed_quotes(), ['double-spaces', 'smart-quotes'], cfg, cache=cache)
+    assert cache == saved
+    assert issues == lint_quotes(_mixed_quotes(), ['double-spaces', 'smart-quotes'], cfg)
+
+
+def test_lint_quotes_cache_invalidated_by_check_version(monkeypatch):
+    """Bumping a check's version re-checks every quote."""
+    cache = {}
+    quotes = [_make_quote(quote='A  b.')]
+    lint_quotes(quotes, ['double-spaces'], _make_config(), cache=cache)
+    fingerprint = next(iter(cache))
+
+    monkeypatch.setattr(lint.DoubleSpacesCheck, 'version', 2)
+    lint_quotes(quotes, ['double-spaces'], _make_config(), cache=cache)
+    assert list(cache) != [fingerprint]
+    assert len(cache) == 1
+
+
+def test_lint_cache_round_trip(tmp_path, monkeypatch):
+    """Results saved with write_lint_cache are reused after read_lint_cache."""
+    path = str(tmp_path / 'cache' / 'quotes.bin')
+    cfg = _make_config()
+    checks = ['double-spaces', 'duplicate-hash', 'no-author', 'smart-quotes']
+    cache = {}
+    expected = lint_quotes(_mixed_quotes(), checks, cfg, cache=cache)
+    lint.write_lint_cache(path, cache)
+
+    loaded = lint.read_lint_cache(path)
+    assert loaded == cache
+    monkeypatch.setattr(lint, '_lint_each_quote', lambda *args: pytest.fail('quote checked again'))
+    monkeypatch.setattr(lint, '_lint_whole_file', lambda *args: pytest.fail('file checked again'))
+    assert lint_quotes(_mixed_quotes(), checks, cfg, cache=loaded) == expected
+
+
+@pytest.mark.parametrize(
+    'content',
+    [
+        b'',
+        b'[1, 2]',
+        b'{"format": 1, "fingerprint": "", "quotes": {}, "file": null}',
+        b'jotquote-lint 1\n' + marshal.dumps({'fingerprint': '', 'quotes': {}, 'file': None}),
+        lint._LINT_CACHE_HEADER,
+        lint._LINT_CACHE_HEADER + b'not marshal data',
+        lint._LINT_CACHE_HEADER + marshal.dumps([1, 2]),
+    ],
+)
+def test_read_lint_cache_unusable(tmp_path, content):
+    """An unreadable or incompatible cache file is treated as an empty cache."""
+    path = tmp_path / 'quotes.bin'
+    path.write_bytes(content)
+    assert lint.read_lint_cache(str(path)) == {}
+    assert lint.read_lint_cache(str(tmp_path / 'missing.bin')) == {}
+
+
+def test_write_lint_cache_error(tmp_path):
+    """A cache file that cannot be written raises StorageError."""
+    cache = {}
+    lint_quotes([_make_quote()], ['no-tags'], _make_config(), cache=cache)
+    blocker = tmp_path / 'file'
+    blocker.write_text('', encoding='utf-8')
+    with pytest.raises(api.StorageError):
+        lint.write_lint_cache(str(blocker / 'quotes.bin'), cache)
+
+
+# ---------------------------------------------------------------------------
+# Streaming lint
+# ---------------------------------------------------------------------------
+
+
+def test_iter_lint_issues_quote_order():
+    """Issues come quote by quote, by check name within a quote, then those of the file-scope checks."""
+    cfg = _make_config()
+    quotes = _mixed_quotes() + [_make_quote(quote='Clean quote.', line_number=5)]
+    checks = ['smart-quotes', 'duplicate-hash', 'no-author', 'double-spaces']
+
+    issues = list(iter_lint_issues(quotes, checks, cfg))
+
+    expected = lint_quotes(quotes, checks, cfg)
+    per_quote = sorted((i for i in expected if i.check != 'duplicate-hash'), key=lambda i: (i.line_number, i.check))
+    assert issues == per_quote + [i for i in expected if i.check == 'duplicate-hash']
+    assert issues[-1].check == 'duplicate-hash'
+
+
+def test_iter_lint_issues_workers_match_serial(monkeypatch):
+    """Issues from worker processes come in the same order as from a serial run."""
+    monkeypatch.setattr('jotquote.api.lint._MIN_CHUNK_QUOTES', 2)
+    quotes = _mixed_quotes() + _mixed_quotes()
+    for line_number, quote in enumerate(quotes, 1):
+        quote.line_number = line_number
+    checks = ['smart-quotes', 'double-spaces', 'no-author']
+
+    serial = list(iter_lint_issues(quotes, checks, _make_config()))
+    assert list(iter_lint_issues(quotes, checks, _make_config(), workers=2)) == serial
+
+
+def test_iter_lint_issues_stops_early(monkeypatch):
+    """Quotes after the batch holding the issues taken are not checked."""
+    monkeypatch.setattr(lint, '_BATCH_QUOTES', 2)
+    checked = []
+    each = lint._lint_each_quote
+    monkeypatch.setattr(lint, '_lint_each_quote', lambda qs, *args: checked.extend(qs) or each(qs, *args))
+    monkeypatch.setattr(lint, '_lint_whole_file', lambda *args: pytest.fail('file-scope checks ran'))
+
+    issues = iter_lint_issues(_mixed_quotes(), ['double-spaces', 'duplicate-hash'], _make_config())
+    assert next(issues).line_number == 2
+    issues.close()
+
+    assert [q.line_number for q in checked] == [1, 2]
+
+
+def test_iter_lint_issues_stopped_early_keeps_cache(monkeypatch):
+    """Stopping early caches the quotes checked so far, and a later run checks only the rest."""
+    monkeypatch.setattr(lint, '_BATCH_QUOTES', 2)
+    cfg = _make_config()
+    cache = {}
+    issues = iter_lint_issues(_mixed_quotes(), ['double-spaces'], cfg, cache=cache)
+    next(issues)
+    issues.close()
+    assert len(next(iter(cache.values()))['quotes']) == 2
+
+    expected = lint_quotes(_mixed_quotes(), ['double-spaces'], cfg)
+    checked = []
+    each = lint._lint_each_quote
+    monkeypatch.setattr(lint, '_lint_each_quote', lambda qs, *args: checked.extend(qs) or each(qs, *args))
+    assert lint_quotes(_mixed_quotes(), ['double-spaces'], cfg, cache=cache) == expected
+    assert [q.line_number for q in checked] == [3, 4]
+
+
+# ---------------------------------------------------------------------------
+# Plugin checks
+# ---------------------------------------------------------------------------
+
+_PLUGIN_SOURCE = """
+from jotquote.api.lint import Check, LintIssue
+
+
+class TempPluginCheck(Check):
+    name = 'temp-plugin'
+
+    def check(self, quote, *, config=None):
+        return [LintIssue(line_number=quote.line_number, check=self.name, field='quote', message='plugin ran')]
+
+
+NOT_A_CHECK = 42
+"""
+
+
+@pytest.fixture
+def plugin(tmp_path, monkeypatch):
+    """Install a plugin module, unimported, with entry points for good and broken checks."""
+    (tmp_path / 'jq_temp_plugin.py').write_text(_PLUGIN_SOURCE, encoding='utf-8')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    entry_points = {
+        name: importlib.metadata.EntryPoint(name, value, lint.ENTRY_POINT_GROUP)
+        for name, value in [
+            ('temp-plugin', 'jq_temp_plugin:TempPluginCheck'),
+            ('temp-missing', 'jq_no_such_plugin:Check'),
+            ('temp-not-check', 'jq_temp_plugin:NOT_A_CHECK'),
+        ]
+    }
+    monkeypatch.setattr(lint, '_plugin_entry_points', lambda: entry_points)
+    yield
+    sys.modules.pop('jq_temp_plugin', None)
+    CHECKS.pop('temp-plugin', None)
+
+
+def test_default_checks_leave_out_opt_in_checks():
+    """The slow checks are registered but only run when named."""
+    opt_in = {'spelling', 'near-duplicate', 'author-variants'}
+    assert opt_in <= api.ALL_CHECKS
+    assert api.DEFAULT_CHECKS == api.ALL_CHECKS - opt_in
+
+
+def test_available_checks_lists_plugins_without_importing(plugin):
+    """Plugin checks are listed by entry point name, without importing the plugin."""
+    names = api.available_checks()
+    assert {'temp-plugin', 'smart-quotes'} <= names
+    assert 'temp-plugin' not in api.ALL_CHECKS
+    assert 'jq_temp_plugin' not in sys.modules
+
+
+def test_lint_quotes_loads_plugin_on_first_use(plugin):
+    """A plugin check is imported and registered when lint_quotes first runs it."""
+    quotes = [_make_quote()]
+    assert lint_quotes(quotes, ['no-tags'], _make_config())
+    assert 'jq_temp_plugin' not in sys.modules
+
+    issues = lint_quotes(quotes, ['temp-plugin'], _make_config())
+    assert [(i.check, i.message) for i in issues] == [('temp-plugin', 'plugin ran')]
+    assert 'temp-plugin' in CHECKS
+
+
+@pytest.mark.parametrize('name', ['temp-missing', 'temp-not-check'])
+def test_lint_quotes_broken_plugin(plugin, name):
+    """A plugin that cannot be imported, or is not a Check, raises ConfigError."""
+    with pytest.raises(api.ConfigError, match=name):
+        lint_quotes([_make_quote()], [name], _make_config())
@@ -2,8 +2,12 @@
 #  This file is licensed under the terms of the MIT License.  See the LICENSE
 # file in the root of this repository for complete details.
 
+import gc
 import hashlib
+import pickle
 import re
+import threading
+import time
 
 import pytest
 
@@ -280,10 +284,11 @@ def test_get_hash_single_pass():
     assert q.get_hash() == expected
 
 
-def test_get_hash_is_cached_after_first_call():
+def test_get_hash_is_cached_after_first_call(monkeypatch):
     """Repeated get_hash() calls must reuse the cached value rather than recomputing."""
     from unittest.mock import patch
 
+    monkeypatch.setattr(quote_mod, '_hash_memo', {})
     q = api.Quote('Hello World foo', 'Author', None, [])
     with patch('jotquote.api.quote.hashlib.md5', wraps=hashlib.md5) as spy:
         q.get_hash()
@@ -300,3 +305,301 @@ def test_get_hash_invalidates_when_quote_text_changes():
     expected_new = hashlib.md5('dth'.encode()).hexdigest()[:16]
     assert q.get_hash() == expected_new
     assert q.get_hash() != original
+
+
+def _parse_extended(line, linenum):
+    return api.parse_quote(line, simple_format=False)
+
+
+def test_lazy_quote_parses_on_first_access():
+    """A LazyQuote should not parse its line until a field is read."""
+    calls = []
+
+    def parse(line, linenum):
+        calls.append(linenum)
+        return _parse_extended(line, linenum)
+
+    q = api.LazyQuote('A quote. | Author | Book | b, a', 7, parse)
+    assert q.get_line_number() == 7
+    assert not q.is_parsed()
+    assert calls == []
+
+    assert q.author == 'Author'
+    assert q.is_parsed()
+    assert q.quote == 'A quote.'
+    assert q.publication == 'Book'
+    assert q.tags == ['a', 'b']
+    assert q == api.Quote('A quote.', 'Author', 'Book', ['a', 'b'])
+    assert calls == [7]
+
+
+def test_lazy_quote_get_hash_matches_quote():
+    """get_hash() on a LazyQuote should match the hash of the parsed quote."""
+    q = api.LazyQuote('A quote. | Author | |', 1, _parse_extended)
+    assert q.get_hash() == api.Quote('A quote.', 'Author', None, []).get_hash()
+
+
+def test_lazy_quote_keeps_fields_set_before_parsing():
+    """Fields assigned before the line is parsed should not be overwritten by it."""
+    q = api.LazyQuote('A quote. | Author | | a', 1, _parse_extended)
+    q.set_tags(['x'])
+    q.quote = 'New text.'
+    assert q.tags == ['x']
+    assert q.quote == 'New text.'
+    assert q.author == 'Author'
+
+
+def test_lazy_quote_invalid_line_raises_on_access():
+    """A malformed line should raise on each access and leave the quote unparsed."""
+    q = api.LazyQuote('Too few | pipes', 3, _parse_extended)
+    for _ in range(2):
+        with pytest.raises(api.QuoteValidationError):
+            q.quote
+    assert not q.is_parsed()
+
+
+def test_lazy_quote_parsed_once_across_threads():
+    """Threads reading one LazyQuote at once all get its fields, and the line is parsed once."""
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def parse(line, linenum):
+        calls.append(linenum)
+        time.sleep(0.01)
+        return _parse_extended(line, linenum)
+
+    q = api.LazyQuote('A quote. | Author | Book | a', 1, parse)
+    results = []
+    errors = []
+
+    def read():
+        barrier.wait()
+        try:
+            results.append((q.quote, q.author, q.publication, q.tags, q.get_hash()))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert calls == [1]
+    expected = api.Quote('A quote.', 'Author', 'Book', ['a'])
+    assert results == [('A quote.', 'Author', 'Book', ['a'], expected.get_hash())] * 8
+
+
+def test_lazy_quote_unknown_attribute():
+    """Attributes that Quote does not have should raise AttributeError without parsing."""
+    q = api.LazyQuote('A quote. | Author | |', 1, _parse_extended)
+    with pytest.raises(AttributeError):
+        q.missing
+    assert not q.is_parsed()
+
+
+def test_peek_tags_does_not_parse_lazy_quotes():
+    """_peek_tags() should read an unparsed quote's tags from its tag field only."""
+    lazy = [
+        api.LazyQuote('A quote. | Author | | b, 5stars', 1, _parse_extended),
+        api.LazyQuote('Too few | b', 2, _parse_extended),
+        api.LazyQuote('A quote. | Author | | bad-tag', 3, _parse_extended),
+        api.LazyQuote('A quote. | Author | | a', 4, _parse_extended),
+    ]
+    lazy[3].set_tags(['x'])
+    parsed = api.Quote('Other.', 'Author', None, ['2stars'])
+
+    tags = quote_mod._peek_tags(lazy + [parsed])
+    assert [list(t) for t in tags] == [['5stars', 'b'], ['b'], [], ['x'], ['2stars']]
+    assert [t.num_stars for t in tags] == [5, 0, 0, 0, 2]
+    assert not any(q.is_parsed() for q in lazy)
+
+
+def test_quote_uses_slots():
+    """Quote should not carry a per-instance __dict__."""
+    q = api.Quote('A quote.', 'Author', None, ['a'])
+    assert not hasattr(q, '__dict__')
+    with pytest.raises(AttributeError):
+        q.unknown_attribute = 1
+
+
+def test_quotes_share_tag_tuples_and_author_strings():
+    """Quotes with the same tags share one tuple, and equal authors are one string."""
+    author = ''.join(['Some', ' ', 'Author'])
+    q1 = api.parse_quote('One. | Some Author | | b, a', simple_format=False)
+    q2 = api.Quote('Two.', author, None, ['a', 'b'])
+    assert q1._tags is q2._tags
+    assert q1.author is q2.author
+
+
+def test_tags_changed_in_place():
+    """Changing the list returned by tags in place changes the quote's tags."""
+    q = api.Quote('A quote.', 'Author', None, ['a', 'b'])
+    q.tags.append('c')
+    assert q.tags == ['a', 'b', 'c']
+    assert q.has_tag('c')
+    q.tags.remove('a')
+    assert q.tags == ['b', 'c']
+    assert not q.has_tag('a')
+    tags = q.tags
+    tags[0] = 'd'
+    tags.sort(reverse=True)
+    assert q.tags == ['d', 'c']
+    assert tags.pop() == 'c'
+    del tags[:]
+    assert q.tags == []
+    assert q.get_num_stars() == 0
+    q.tags.extend(['3stars', 'x'])
+    assert q.get_num_stars() == 3
+    assert pickle.loads(pickle.dumps(q.tags)) == ['3stars', 'x']
+    assert type(pickle.loads(pickle.dumps(q.tags))) is list
+
+
+def test_tags_changed_in_place_on_lazy_quote():
+    """A lazily read quote keeps a tag added in place."""
+    lazy = api.LazyQuote('A quote. | Author | | a', 1, _parse_extended)
+    lazy.tags.append('b')
+    assert lazy.tags == ['a', 'b']
+    assert lazy.has_tags(['a', 'b'])
+
+
+def test_tags_list_detached_after_assignment():
+    """A tags list taken before the tags were assigned no longer changes the quote."""
+    q = api.Quote('A quote.', 'Author', None, ['a'])
+    old = q.tags
+    q.tags = ['b']
+    old.append('c')
+    assert old == ['a', 'c']
+    assert q.tags == ['b']
+
+
+def test_tags_augmented_assignment():
+    """quote.tags += [...] and += on a saved tags list both change the quote."""
+    q = api.Quote('A quote.', 'Author', None, ['a', 'b'])
+    q.tags += ['c']
+    assert q.tags == ['a', 'b', 'c']
+    assert q.has_tag('c')
+    q.tags += ('d',)
+    assert q.tags == ['a', 'b', 'c', 'd']
+    tags = q.tags
+    tags += ['e']
+    assert q.tags == ['a', 'b', 'c', 'd', 'e']
+    tags *= 1
+    assert q.tags == ['a', 'b', 'c', 'd', 'e']
+
+
+def test_shared_tag_tuples_bounded(monkeypatch):
+    """The table of shared tag tuples is cleared when it reaches its limit."""
+    monkeypatch.setattr(quote_mod, '_TAG_TUPLES_LIMIT', 2)
+    monkeypatch.setattr(quote_mod, '_tag_tuples', {})
+    first = api.Quote('A quote.', 'Author', None, ['a'])
+    api.Quote('A quote.', 'Author', None, ['b'])
+    third = api.Quote('A quote.', 'Author', None, ['c'])
+    assert list(quote_mod._tag_tuples) == [('c',)]
+    assert first.has_tag('a') and third.has_tag('c')
+
+
+@pytest.mark.parametrize(
+    'text',
+    [
+        'The quick brown fox',
+        "Don't stop -- it's 2 a.m.!",
+        'x',
+        '123 ... ---',
+        '',
+        'Caf\u00e9 na\u00efve \u00c9cole',
+        'A\u00b2B \u00bd C',
+    ],
+)
+def test_compute_hashes_matches_get_hash(monkeypatch, text):
+    """compute_hashes() should return exactly what get_hash() computes one character at a time."""
+    monkeypatch.setattr(quote_mod, '_hash_memo', {})
+    quotes = [
+        quote_mod.Quote._from_valid_fields(t, 'A', None, quote_mod._shared_tags([]))
+        for t in (text, 'Other words here', text)
+    ]
+    expected = [quote_mod._fuzzy_hash(q.quote) for q in quotes]
+    assert api.compute_hashes(quotes) == expected
+    assert [q.get_hash() for q in quotes] == expected
+
+
+def test_compute_hashes_reuses_memo(monkeypatch):
+    """Quotes whose text was hashed by an earlier read should not be hashed again."""
+    from unittest.mock import patch
+
+    monkeypatch.setattr(quote_mod, '_hash_memo', {})
+    api.compute_hashes([api.Quote('Hello World foo', 'Author', None, [])])
+    reread = [api.Quote('Hello World foo', 'Author', None, [])]
+    with patch('jotquote.api.quote.hashlib.md5', wraps=hashlib.md5) as spy:
+        hashes = api.compute_hashes(reread)
+    assert spy.call_count == 0
+    assert hashes == [reread[0].get_hash()]
+
+
+def test_hash_memo_is_bounded(monkeypatch):
+    """The hash memo should be cleared rather than grow past its limit."""
+    monkeypatch.setattr(quote_mod, '_hash_memo', {})
+    monkeypatch.setattr(quote_mod, '_HASH_MEMO_LIMIT', 3)
+    for i in range(5):
+        api.compute_hashes([api.Quote('Quote number {0}'.format(i), 'A', None, [])])
+        assert len(quote_mod._hash_memo) <= 3
+    api.compute_hashes([api.Quote('Another quote {0}'.format(i), 'A', None, []) for i in range(5)])
+    assert len(quote_mod._hash_memo) <= 3
+
+
+def test_tag_tests_use_precomputed_masks():
+    """has_tag(), has_tags() and get_num_stars() should agree with the tag list."""
+    q = api.Quote('A quote.', 'Author', None, ['funny', '4stars', '2stars'])
+    assert q._tags.masked == (quote_mod._tag_bits, quote_mod._tag_mask(q._tags, quote_mod._tag_bits))
+    assert q.has_tag('funny')
+    assert not q.has_tag('never_used_tag_xyz')
+    assert q.has_tags(['2stars', 'funny'])
+    assert q.has_tags([])
+    assert not q.has_tags(['funny', 'never_used_tag_xyz'])
+    assert q.get_num_stars() == 2
+    q.set_tags(['5stars'])
+    assert q.get_num_stars() == 5
+    assert not q.has_tag('funny')
+    q.set_tags(None)
+    assert q.get_num_stars() == 0
+    assert not q.has_tags(['5stars'])
+
+
+def test_reading_a_file_starts_a_new_tag_snapshot(tmp_path, monkeypatch):
+    """Each read starts an empty tag bit table; quotes of earlier reads are masked again when tested."""
+    monkeypatch.setattr(quote_mod, '_tag_bits', {})
+    monkeypatch.setattr(quote_mod, '_stale_masks_possible', False)
+    first = tmp_path / 'first.txt'
+    first.write_text('One. | A | | snapshot_old, shared\n', encoding='utf-8')
+    second = tmp_path / 'second.txt'
+    second.write_text('Two. | B | | shared\n', encoding='utf-8')
+
+    old_quotes = api.read_quotes(str(first))
+    new_quotes = api.read_quotes(str(second))
+    assert set(quote_mod._tag_bits) == {'shared'}
+    assert new_quotes[0]._tags.masked[1] == 1
+
+    assert old_quotes[0].has_tags(['snapshot_old', 'shared'])
+    assert set(quote_mod._tag_bits) == {'shared', 'snapshot_old'}
+    api.read_quotes(str(second))
+    assert api.get_first_match(old_quotes, tags='snapshot_old') is old_quotes[0]
+    assert api.get_first_match(old_quotes, excluded_tags='snapshot_old') is None
+
+
+def test_gc_paused_restores_collector_state():
+    """_gc_paused() pauses the collector and restores its earlier state, even on error."""
+    assert gc.isenabled()
+    with pytest.raises(ValueError):
+        with quote_mod._gc_paused():
+            assert not gc.isenabled()
+            raise ValueError
+    assert gc.isenabled()
+
+    gc.disable()
+    try:
+        with quote_mod._gc_paused():
+            pass
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
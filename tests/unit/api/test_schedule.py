@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+#  This file is licensed under the terms of the MIT License.  See the LICENSE
+# file in the root of this repository for complete details.
+
+import datetime
+import io
+
+import pytest
+
+import tests.test_util
+from jotquote import api
+from jotquote.api import selection as selection_mod
+
+
+def _quotes(tmp_path):
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes9.txt')
+    return api.read_quotes(path)
+
+
+def test_build_schedule_matches_daily_choice(tmp_path):
+    """Each scheduled quote is the one the date-seeded rotation picks for that day."""
+    quotes = _quotes(tmp_path)
+    start = datetime.date(2026, 2, 27)
+    entries = api.build_schedule(quotes, start, 40)
+
+    assert len(entries) == 40
+    assert entries[0].date == '20260227'
+    assert entries[2].date == '20260301'
+    for offset, entry in enumerate(entries):
+        days = (start - datetime.date(2016, 1, 1)).days + offset
+        index = selection_mod._get_random_value(days, len(quotes))
+        assert entry.number == index + 1
+        assert entry.hash == quotes[index].get_hash()
+        assert entry.source == 'random'
+        assert entry.quote == quotes[index].quote
+        assert entry.author == quotes[index].author
+
+
+def test_build_schedule_resolver_overrides(tmp_path):
+    """A resolver hash that matches a quote replaces the random choice for that date."""
+    quotes = _quotes(tmp_path)
+    target = quotes[4]
+    overrides = {'20260302': target.get_hash(), '20260303': 'aaaaaaaaaaaaaaaa'}
+    entries = api.build_schedule(quotes, datetime.date(2026, 3, 1), 3, resolver=overrides.get)
+
+    plain = api.build_schedule(quotes, datetime.date(2026, 3, 1), 3)
+    assert entries[0] == plain[0]
+    assert (entries[1].number, entries[1].hash, entries[1].source) == (5, target.get_hash(), 'resolver')
+    assert entries[2] == plain[2]
+
+
+def test_build_schedule_empty():
+    """No quotes, or no days, gives an empty schedule."""
+    assert api.build_schedule([], datetime.date(2026, 3, 1), 10) == []
+    assert api.build_schedule([api.Quote('a', 'b', None, [])], datetime.date(2026, 3, 1), 0) == []
+
+
+@pytest.mark.parametrize(
+    'now, expected',
+    [
+        (datetime.datetime(2026, 3, 14, 23, 44, 59), datetime.date(2026, 3, 14)),
+        (datetime.datetime(2026, 3, 14, 23, 45, 0), datetime.date(2026, 3, 15)),
+        (datetime.datetime(2026, 12, 31, 23, 50, 0), datetime.date(2027, 1, 1)),
+    ],
+)
+def test_get_quote_date_rolls_over_at_cutoff(now, expected):
+    """From 11:45 PM on, the quote date is the next day."""
+    assert api.get_quote_date(now=now) == expected
+
+
+def test_get_quote_date_matches_get_random_choice(monkeypatch):
+    """get_random_choice() picks the quote of the date get_quote_date() returns."""
+
+    class FakeDatetime(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.datetime(2026, 3, 14, 23, 50, 0)
+
+    monkeypatch.setattr('jotquote.api.schedule.datetime.datetime', FakeDatetime)
+    days = (api.get_quote_date() - datetime.date(2016, 1, 1)).days
+    assert api.get_random_choice(100) == selection_mod._get_random_value(days, 100)
+
+
+def test_get_quote_date_invalid_timezone():
+    """An unknown timezone is a ConfigError."""
+    with pytest.raises(api.ConfigError, match='timezone'):
+        api.get_quote_date('Not/AZone')
+
+
+def test_is_entry_current(tmp_path):
+    """An entry is current while its quote is unchanged and, for a random entry, still the seeded choice."""
+    quotes = _quotes(tmp_path)
+    random_entry, resolver_entry = api.build_schedule(
+        quotes, datetime.date(2026, 3, 1), 2, resolver={'20260302': quotes[4].get_hash()}.get
+    )
+    assert api.is_entry_current(quotes, random_entry)
+    assert api.is_entry_current(quotes, resolver_entry)
+
+    # Another quote count moves the seeded choice, but not the resolver's
+    extra = api.Quote('An added quote.', 'Someone', None, [])
+    more = quotes + [extra]
+    while api.build_schedule(more, datetime.date(2026, 3, 1), 1)[0].number == random_entry.number:
+        more.append(extra)
+    assert not api.is_entry_current(more, random_entry)
+    assert api.is_entry_current(more, resolver_entry)
+
+    edited = list(quotes)
+    edited[4] = api.Quote('A different quote.', 'Someone', None, [])
+    assert not api.is_entry_current(edited, resolver_entry)
+    assert not api.is_entry_current(quotes[:3], resolver_entry)
+
+
+@pytest.mark.parametrize('fmt, filename', [('csv', 'schedule.csv'), ('json', 'schedule.json')])
+def test_write_and_load_round_trip(tmp_path, fmt, filename):
+    """A written schedule loads back into the same entries, keyed by date."""
+    entries = api.build_schedule(_quotes(tmp_path), datetime.date(2026, 3, 1), 5)
+    path = tmp_path / filename
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        api.write_schedule(entries, f, fmt)
+
+    loaded = api.load_schedule(str(path))
+    assert loaded == {entry.date: entry for entry in entries}
+
+
+def test_write_schedule_csv_header():
+    """CSV output starts with a header row naming every column."""
+    stream = io.StringIO()
+    api.write_schedule([api.ScheduleEntry('20260301', 2, 'abcd', 'random', 'Anon', 'Hi, there.')], stream)
+    assert stream.getvalue() == 'date,number,hash,source,author,quote\n20260301,2,abcd,random,Anon,"Hi, there."\n'
+
+
+def test_write_schedule_unknown_format():
+    """An unknown format raises ValueError."""
+    with pytest.raises(ValueError, match='xml'):
+        api.write_schedule([], io.StringIO(), 'xml')
+
+
+@pytest.mark.parametrize(
+    'filename, content',
+    [
+        ('bad.json', '[{"date": "20260301"}]'),
+        ('bad.json', 'not json'),
+        ('bad.csv', 'date,number,hash,source\n20260301,two,abcd,random\n'),
+    ],
+)
+def test_load_schedule_invalid(tmp_path, filename, content):
+    """A malformed schedule file raises StorageError."""
+    path = tmp_path / filename
+    path.write_text(content, encoding='utf-8')
+    with pytest.raises(api.StorageError, match='schedule'):
+        api.load_schedule(str(path))
+
+
+def test_load_schedule_missing(tmp_path):
+    """A missing schedule file raises StorageError."""
+    with pytest.raises(api.StorageError):
+        api.load_schedule(str(tmp_path / 'missing.csv'))
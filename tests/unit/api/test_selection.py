@@ -2,11 +2,15 @@
 #  This file is licensed under the terms of the MIT License.  See the LICENSE
 # file in the root of this repository for complete details.
 
+import collections
 import datetime as real_datetime
+import random
+from fractions import Fraction
 
 import pytest
 
 from jotquote import api
+from jotquote.api import quote as quote_mod
 from jotquote.api import selection as selection_mod
 
 
@@ -35,7 +39,7 @@ def test_get_random_choice_uses_today_before_cutoff(monkeypatch):
         def now(cls, tz=None):
             return real_datetime.datetime(2026, 3, 14, 23, 44, 0)
 
-    monkeypatch.setattr('jotquote.api.selection.datetime.datetime', FakeDatetime)
+    monkeypatch.setattr('jotquote.api.schedule.datetime.datetime', FakeDatetime)
     result = api.get_random_choice(100)
     beginday = real_datetime.date(2016, 1, 1)
     days = (real_datetime.date(2026, 3, 14) - beginday).days
@@ -50,7 +54,7 @@ def test_get_random_choice_uses_tomorrow_at_cutoff(monkeypatch):
         def now(cls, tz=None):
             return real_datetime.datetime(2026, 3, 14, 23, 45, 0)
 
-    monkeypatch.setattr('jotquote.api.selection.datetime.datetime', FakeDatetime)
+    monkeypatch.setattr('jotquote.api.schedule.datetime.datetime', FakeDatetime)
     result = api.get_random_choice(100)
     beginday = real_datetime.date(2016, 1, 1)
     days = (real_datetime.date(2026, 3, 15) - beginday).days
@@ -70,7 +74,7 @@ def test_get_random_choice_uses_timezone_before_cutoff(monkeypatch):
                 return real_datetime.datetime(2026, 3, 15, 4, 44, 0)
             return real_datetime.datetime(2026, 3, 14, 23, 44, 0, tzinfo=chicago)
 
-    monkeypatch.setattr('jotquote.api.selection.datetime.datetime', FakeDatetime)
+    monkeypatch.setattr('jotquote.api.schedule.datetime.datetime', FakeDatetime)
     result = api.get_random_choice(100, timezone='America/Chicago')
     beginday = real_datetime.date(2016, 1, 1)
     days = (real_datetime.date(2026, 3, 14) - beginday).days
@@ -90,7 +94,7 @@ def test_get_random_choice_uses_timezone_advances_at_cutoff(monkeypatch):
                 return real_datetime.datetime(2026, 3, 15, 4, 45, 0)
             return real_datetime.datetime(2026, 3, 14, 23, 45, 0, tzinfo=chicago)
 
-    monkeypatch.setattr('jotquote.api.selection.datetime.datetime', FakeDatetime)
+    monkeypatch.setattr('jotquote.api.schedule.datetime.datetime', FakeDatetime)
     result = api.get_random_choice(100, timezone='America/Chicago')
     beginday = real_datetime.date(2016, 1, 1)
     days = (real_datetime.date(2026, 3, 15) - beginday).days
@@ -114,7 +118,7 @@ def test_get_random_choice_timezone_fixes_utc_rollover_bug(monkeypatch):
                 return real_datetime.datetime(2026, 3, 15, 2, 0, 0)
             return real_datetime.datetime(2026, 3, 14, 21, 0, 0, tzinfo=chicago)
 
-    monkeypatch.setattr('jotquote.api.selection.datetime.datetime', FakeDatetime)
+    monkeypatch.setattr('jotquote.api.schedule.datetime.datetime', FakeDatetime)
     result_tz = api.get_random_choice(100, timezone='America/Chicago')
     result_naive = api.get_random_choice(100)
     beginday = real_datetime.date(2016, 1, 1)
@@ -253,7 +257,218 @@ def test_get_first_match_rand_single_match(sample_quotes):
     assert result == sample_quotes[2]
 
 
+@pytest.mark.parametrize('number', [0, -1, 5, 100])
+def test_get_first_match_number_outside_list(sample_quotes, number):
+    """A position outside the list matches nothing, with or without other criteria."""
+    assert api.get_first_match(sample_quotes, number=number) is None
+    assert api.get_first_match(sample_quotes, number=number, tags='fun', rand=True) is None
+
+
+def test_get_first_match_stops_at_first_hit(sample_quotes):
+    """The first-match path does not examine quotes after the first match."""
+    sentinel = object()
+    assert api.get_first_match(sample_quotes + [sentinel], tags='fun') == sample_quotes[0]
+
+
+def test_get_first_match_rand_is_uniform():
+    """rand=True picks each matching quote about equally often."""
+    quotes = [api.Quote('Q{}.'.format(i), 'Anon', None, ['odd'] if i % 2 else ['even']) for i in range(30)]
+    random.seed(1)
+    counts = collections.Counter(api.get_first_match(quotes, tags='odd', rand=True).quote for _ in range(15000))
+    assert set(counts) == {'Q{}.'.format(i) for i in range(1, 30, 2)}
+    assert max(counts.values()) - min(counts.values()) < 300
+
+
+@pytest.mark.parametrize('count', [1, 2, 10, 1000])
+def test_sample_one_is_uniform(count):
+    """_sample_one() returns every element with probability 1/count."""
+    random.seed(2)
+    draws = 20000
+    counts = collections.Counter(selection_mod._sample_one(iter(range(count))) for _ in range(draws))
+    assert set(counts) <= set(range(count))
+    if count <= 10:
+        assert set(counts) == set(range(count))
+        assert all(abs(c - draws / count) < 5 * (draws / count) ** 0.5 for c in counts.values())
+    else:
+        assert abs(sum(counts.elements()) / draws - (count - 1) / 2) < 10
+
+
+def test_sample_one_empty_and_none_elements():
+    """_sample_one() returns None for no elements and handles None as an element."""
+    assert selection_mod._sample_one([]) is None
+    assert selection_mod._sample_one([None]) is None
+    assert selection_mod._sample_one([None, 1, 2]) in (None, 1, 2)
+
+
 def test_get_first_match_empty_list():
     """Empty quote list returns None for any criteria."""
     assert api.get_first_match([]) is None
     assert api.get_first_match([], keyword='anything') is None
+
+
+def test_get_first_match_tags_on_unparsed_lazy_quotes():
+    """Tag filters should work before lazily read quotes have registered their tags."""
+
+    def parse(line, linenum):
+        return api.parse_quote(line, simple_format=False)
+
+    quotes = [
+        api.LazyQuote('First. | A | | selection_lazy_other', 1, parse),
+        api.LazyQuote('Second. | B | | selection_lazy_wanted', 2, parse),
+        api.LazyQuote('Third. | C | | selection_lazy_skipped, selection_lazy_wanted', 3, parse),
+    ]
+    result = api.get_first_match(quotes, tags='selection_lazy_wanted')
+    assert result is quotes[1]
+    result = api.get_first_match(quotes, excluded_tags='selection_lazy_other, selection_lazy_wanted')
+    assert result is None
+
+
+def test_get_first_match_unknown_tags_not_registered(sample_quotes):
+    """Tags that no quote has match nothing and are not given a tag bit."""
+    bits = dict(quote_mod._tag_bits)
+    assert api.get_first_match(sample_quotes, tags='selection_query_only_tag') is None
+    assert api.get_first_match(sample_quotes, excluded_tags='selection_query_excluded') is sample_quotes[0]
+    assert quote_mod._tag_bits == bits
+
+
+def test_get_permutation_matches_global_seed():
+    """The cached permutation is the shuffle the rotation has always used, and leaves the global RNG alone."""
+    numlist = list(range(50))
+    random.seed(0)
+    random.shuffle(numlist)
+    state = random.getstate()
+    selection_mod._get_permutation.cache_clear()
+    assert selection_mod._get_permutation(50) == tuple(numlist)
+    assert random.getstate() == state
+
+
+def _channel_quotes():
+    lines = [
+        'A. | Anon | | poetry',
+        'B. | Anon | | funny',
+        'C. | Anon | | poetry, funny',
+        'D. | Anon | |',
+        'E. | Anon | | poetry',
+    ]
+    return api.parse_quotes(lines, 'f', simple_format=False)
+
+
+@pytest.mark.parametrize('tag, positions', [('poetry', [0, 2, 4]), ('funny', [1, 2])])
+def test_get_channel_choice(monkeypatch, tag, positions):
+    """A channel picks from its tag's quotes with the daily rotation over that many quotes."""
+    quotes = _channel_quotes()
+    for days in range(7):
+        monkeypatch.setattr(selection_mod, '_get_days_since_epoch', lambda timezone: days)
+        index = api.get_channel_choice(quotes, tag)
+        assert index == positions[selection_mod._get_random_value(days, len(positions))]
+
+
+def test_get_channel_choice_unknown_tag():
+    """A tag no quote has gives None."""
+    assert api.get_channel_choice(_channel_quotes(), 'missing') is None
+    assert api.get_channel_choice([], 'poetry') is None
+
+
+def test_get_channel_choice_rebuilt_for_new_list(monkeypatch):
+    """Channels are cached per quote list and rebuilt when the list changes."""
+    monkeypatch.setattr(selection_mod, '_get_days_since_epoch', lambda timezone: 0)
+    quotes = _channel_quotes()
+    assert api.get_channel_choice(quotes, 'funny') is not None
+    assert selection_mod._channels.quotes is quotes
+
+    quotes.append(api.Quote('F.', 'Anon', None, ['history']))
+    assert api.get_channel_choice(quotes, 'history') == 5
+
+    other = _channel_quotes()
+    assert api.get_channel_choice(other, 'history') is None
+    assert selection_mod._channels.quotes is other
+
+
+def test_get_channel_random_choice():
+    """Random channel draws cover exactly the tag's quotes."""
+    quotes = _channel_quotes()
+    rng = random.Random(0)
+    assert {api.get_channel_random_choice(quotes, 'poetry', rng) for _ in range(100)} == {0, 2, 4}
+    assert api.get_channel_random_choice(quotes, 'missing', rng) is None
+
+
+@pytest.mark.parametrize('weights', [[1], [3, 3], [1, 2, 3, 4, 5], [5, 1, 1, 1], [1, 1, 1, 5, 2, 2, 4]])
+def test_alias_table_is_exact(weights):
+    """Each index is drawn with probability exactly proportional to its weight."""
+    table = selection_mod._AliasTable(weights)
+    count = len(weights)
+    probability = [Fraction(0)] * count
+    for index in range(count):
+        kept = Fraction(table.prob[index], table.total)
+        probability[index] += kept / count
+        probability[table.alias[index]] += (1 - kept) / count
+    assert probability == [Fraction(weight, sum(weights)) for weight in weights]
+
+
+def test_get_star_weighted_choice():
+    """Draws favor higher-rated quotes; unrated quotes count as one star."""
+    lines = [
+        'A. | Anon | | 5stars',
+        'B. | Anon | | 1star',
+        'C. | Anon | |',
+    ]
+    quotes = api.parse_quotes(lines, 'f', simple_format=False)
+    rng = random.Random(0)
+    counts = collections.Counter(api.get_star_weighted_choice(quotes, rng) for _ in range(7000))
+    assert set(counts) == {0, 1, 2}
+    assert counts[0] > 4 * counts[1]
+    assert abs(counts[1] - counts[2]) < 200
+
+
+def test_get_star_weighted_choice_cached_per_list():
+    """The alias table is reused for the same list and rebuilt for a new one."""
+    quotes = _channel_quotes()
+    assert api.get_star_weighted_choice([]) is None
+    api.get_star_weighted_choice(quotes)
+    table = selection_mod._star_table[2]
+    api.get_star_weighted_choice(quotes)
+    assert selection_mod._star_table[2] is table
+
+    quotes.append(api.Quote('F.', 'Anon', None, ['5stars']))
+    api.get_star_weighted_choice(quotes)
+    assert selection_mod._star_table[2] is not table
+    assert len(selection_mod._star_table[2].prob) == 6
+
+
+def test_get_rotation_choice_shows_every_quote_once_per_pass():
+    """Each pass of the rotation is a permutation, and passes use different shuffles."""
+    first = [api.get_rotation_choice(20, cursor) for cursor in range(20)]
+    second = [api.get_rotation_choice(20, cursor) for cursor in range(20, 40)]
+    assert sorted(first) == list(range(20))
+    assert sorted(second) == list(range(20))
+    assert first != second
+    assert first != list(selection_mod._get_permutation(20))
+    assert api.get_rotation_choice(20, 5) == first[5]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 1000])
+@pytest.mark.parametrize('key', [0, 1, 12345])
+def test_permute_is_a_permutation(size, key):
+    """_permute() maps range(size) onto itself one-to-one."""
+    assert sorted(selection_mod._permute(i, size, key) for i in range(size)) == list(range(size))
+
+
+def test_get_first_match_hash_arg_hashes_only_candidates(monkeypatch):
+    """hash_arg only hashes, and so parses, the quotes left by the number and tag filters."""
+
+    def parse(line, linenum):
+        return api.parse_quote(line, simple_format=False)
+
+    words = ('one', 'two', 'three', 'four', 'five', 'six')
+    quotes = [
+        api.LazyQuote('Quote {0}. | A | | {1}'.format(word, 'wanted' if i % 2 else ''), i, parse)
+        for i, word in enumerate(words, 1)
+    ]
+    target_hash = api.Quote('Quote three.', 'A', None, []).get_hash()
+
+    assert api.get_first_match(quotes, number=3, hash_arg=target_hash) is quotes[2]
+    assert [q.is_parsed() for q in quotes] == [False, False, True, False, False, False]
+
+    monkeypatch.setattr(selection_mod, '_HASH_BATCH_QUOTES', 1)
+    assert api.get_first_match(quotes, tags='wanted', hash_arg=target_hash) is quotes[2]
+    assert not any(q.is_parsed() for q in quotes[3:])
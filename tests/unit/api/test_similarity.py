@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+#  This file is licensed under the terms of the MIT License.  See the LICENSE
+# file in the root of this repository for complete details.
+
+import hashlib
+import struct
+
+import pytest
+
+from jotquote import api
+from jotquote.api import similarity
+
+_ORIGINAL = 'The only way to do great work is to love what you do and never stop.'
+
+
+def _quotes(*texts):
+    return [api.Quote(text, 'Author', None, []) for text in texts]
+
+
+def test_find_near_duplicates_word_added():
+    """A quote with a word added is reported against the earlier quote."""
+    quotes = _quotes(
+        _ORIGINAL,
+        'Be yourself; everyone else is already taken.',
+        'The only way to do truly great work is to love what you do and never stop.',
+    )
+    found = api.find_near_duplicates(quotes, 0.7)
+    assert [(f.index, f.original) for f in found] == [(2, 0)]
+    assert found[0].similarity == pytest.approx(14 / 17)
+
+
+def test_find_near_duplicates_ignores_case_and_punctuation():
+    """Texts differing only in case and punctuation are identical."""
+    quotes = _quotes(_ORIGINAL, 'the ONLY way to do great work, is to love what you do -- and never stop!')
+    assert api.find_near_duplicates(quotes, 0.7) == [api.NearDuplicate(1, 0, 1.0)]
+
+
+def test_find_near_duplicates_threshold():
+    """Pairs below the threshold are not reported."""
+    quotes = _quotes(_ORIGINAL, 'The only way to do truly great work is to love what you do and never stop.')
+    assert api.find_near_duplicates(quotes, 0.85) == []
+
+
+def test_find_near_duplicates_unrelated_and_short():
+    """Unrelated quotes, and quotes under four words, are never reported."""
+    quotes = _quotes(_ORIGINAL, 'Be yourself; everyone else is already taken.', 'Just do it.', 'Just do it.')
+    assert api.find_near_duplicates(quotes, 0.1) == []
+
+
+def test_find_near_duplicates_earliest_original():
+    """Each quote is reported once, against an earlier quote, in quote order."""
+    quotes = _quotes(_ORIGINAL, _ORIGINAL, _ORIGINAL + ' Ever.')
+    found = api.find_near_duplicates(quotes, 0.7)
+    assert [(f.index, f.original) for f in found] == [(1, 0), (2, 0)]
+
+
+def test_signature_rows():
+    """Each signature row is the minimum of the pairs' tabulation hashes in that row."""
+    unpack = struct.Struct('<32H').unpack
+    words = ['the', 'only', 'way', 'to', 'do', 'the', 'work']
+
+    def rows(word, person):
+        return unpack(hashlib.blake2b(word.encode('utf-8'), digest_size=64, person=person).digest())
+
+    expected = [
+        min(pair)
+        for pair in zip(
+            *[
+                [a ^ b for a, b in zip(rows(first, b'first'), rows(second, b'second'))]
+                for first, second in zip(words, words[1:])
+            ]
+        )
+    ]
+    signature = similarity._signature(' '.join(words), {})
+    assert [(signature >> (17 * lane)) & 0xFFFF for lane in range(32)] == expected
+    assert signature & similarity._GUARDS == 0
+
+
+def test_find_near_duplicates_reuses_signatures(monkeypatch):
+    """Signatures in the dict are reused, and the dict is left holding those of the given quotes."""
+    signatures = {}
+    quotes = _quotes(_ORIGINAL, 'Be yourself; everyone else is already taken.')
+    api.find_near_duplicates(quotes, 0.7, signatures)
+    assert len(signatures) == 2
+
+    computed = []
+    signature = similarity._signature
+    monkeypatch.setattr(
+        similarity, '_signature', lambda text, word_hashes: computed.append(text) or signature(text, word_hashes)
+    )
+    quotes[1] = api.Quote(_ORIGINAL + ' Ever.', 'Author', None, [])
+    found = api.find_near_duplicates(quotes, 0.7, signatures)
+
+    assert computed == [_ORIGINAL + ' Ever.']
+    assert [(f.index, f.original) for f in found] == [(1, 0)]
+    assert len(signatures) == 2
+
+
+def test_signatures_round_trip(tmp_path):
+    """write_signatures() output is read back by read_signatures()."""
+    signatures = {}
+    api.find_near_duplicates(_quotes(_ORIGINAL, 'Be yourself; everyone else is already taken.', 'Hi.'), 0.7, signatures)
+    path = str(tmp_path / 'cache' / 'near-duplicate.bin')
+
+    api.write_signatures(path, signatures)
+
+    assert api.read_signatures(path) == signatures
+
+
+def test_read_signatures_unusable(tmp_path):
+    """A missing, foreign or truncated signature file reads as no signatures."""
+    assert api.read_signatures(str(tmp_path / 'missing.bin')) == {}
+    (tmp_path / 'foreign.bin').write_bytes(b'something else\n')
+    assert api.read_signatures(str(tmp_path / 'foreign.bin')) == {}
+    (tmp_path / 'short.bin').write_bytes(similarity._SIGNATURE_HEADER + b'\x00' * 10)
+    assert api.read_signatures(str(tmp_path / 'short.bin')) == {}
+
+
+def test_write_signatures_error(tmp_path):
+    """A signature file that cannot be written raises StorageError."""
+    (tmp_path / 'file').write_text('', encoding='utf-8')
+    with pytest.raises(api.StorageError, match='signature file'):
+        api.write_signatures(str(tmp_path / 'file' / 'near-duplicate.bin'), {1: 2})
+
+
+def _author_quotes(*authors):
+    return [api.Quote('Some quote.', author, None, []) for author in authors]
+
+
+def test_find_author_variants():
+    """Initials, reordered names, titles, suffixes and accents are variants of the most quoted name."""
+    quotes = _author_quotes(
+        'Ralph Waldo Emerson',
+        'Ralph Waldo Emerson',
+        'R. W. Emerson',
+        'RW Emerson',
+        'Ralph Emerson',
+        'Emerson, Ralph Waldo',
+        'Martin Luther King, Jr.',
+        'Dr. Martin Luther King',
+        'José Martí',
+        'Jose Marti',
+        'Jose Marti',
+    )
+    assert api.find_author_variants(quotes) == {
+        'Dr. Martin Luther King': 'Martin Luther King, Jr.',
+        'Emerson, Ralph Waldo': 'Ralph Waldo Emerson',
+        'José Martí': 'Jose Marti',
+        'R. W. Emerson': 'Ralph Waldo Emerson',
+        'RW Emerson': 'Ralph Waldo Emerson',
+        'Ralph Emerson': 'Ralph Waldo Emerson',
+    }
+
+
+def test_find_author_variants_different_people():
+    """Different first names, names in another order and single names are not variants."""
+    quotes = _author_quotes(
+        'John Smith', 'Jane Smith', 'Waldo Emerson', 'Ralph Waldo Emerson', 'Voltaire', 'Voltaire.', 'Smith, J.'
+    )
+    assert api.find_author_variants(quotes) == {'Smith, J.': 'John Smith'}
+
+
+def test_find_author_variants_misspelled_surname():
+    """Surnames one letter apart are variants for the same first name, except short ones or in the first letter."""
+    quotes = _author_quotes(
+        'Ralph Waldo Emerson',
+        'Ralph Waldo Emerson',
+        'Ralph Waldo Emmerson',
+        'Ralph Emersen',
+        'R. W. Emersen',
+        'Ralph Waldo Amerson',
+        'John Hill',
+        'John Hall',
+    )
+    assert api.find_author_variants(quotes) == {
+        'R. W. Emersen': 'Ralph Emersen',
+        'Ralph Emersen': 'Ralph Waldo Emerson',
+        'Ralph Waldo Emmerson': 'Ralph Waldo Emerson',
+    }
@@ -3,7 +3,9 @@
 # file in the root of this repository for complete details.
 
 import builtins
+import gzip
 import hashlib
+import lzma
 import os
 import re
 
@@ -85,6 +87,196 @@ def test_read_quotes_with_double_quote_in_quotefile(tmp_path):
         api.read_quotes(path)
 
 
+@pytest.mark.parametrize('extension,opener', [('.gz', gzip.open), ('.xz', lzma.open)])
+def test_read_quotes_compressed(tmp_path, extension, opener):
+    """read_quotes() should decompress .gz and .xz quote files and hash the compressed bytes."""
+    plain_path = tests.test_util.init_quotefile(str(tmp_path), 'quotes3.txt')
+    with open(plain_path, 'rb') as f:
+        contents = f.read()
+    path = os.path.join(str(tmp_path), 'quotes' + extension)
+    with opener(path, 'wb') as f:
+        f.write(contents)
+
+    quotes, sha256 = api.read_quotes_with_hash(path)
+
+    expected = api.read_quotes(plain_path)
+    assert tests.test_util.compare_quotes(expected, quotes)
+    assert [q.line_number for q in quotes] == [q.line_number for q in expected]
+    with open(path, 'rb') as f:
+        assert sha256 == hashlib.sha256(f.read()).hexdigest()
+
+
+def test_read_quotes_compressed_syntax_error_line_number(tmp_path):
+    """Syntax errors in compressed files should report the same line number as plain files."""
+    path = os.path.join(str(tmp_path), 'quotes.txt.gz')
+    with gzip.open(path, 'wb') as f:
+        f.write(b'# comment\n\nA quote. | Author | |\nNot a quote\n')
+
+    with pytest.raises(api.QuoteValidationError, match='syntax error on line 4 of'):
+        api.read_quotes(path)
+
+
+def test_read_quotes_corrupt_compressed_file(tmp_path):
+    path = os.path.join(str(tmp_path), 'quotes.txt.gz')
+    with open(path, 'wb') as f:
+        f.write(b'this is not gzip data')
+
+    with pytest.raises(api.StorageError, match='could not be decompressed'):
+        api.read_quotes(path)
+
+
+@pytest.mark.parametrize('extension,opener', [('.gz', gzip.open), ('.xz', lzma.open)])
+def test_add_quote_compressed(config, tmp_path, extension, opener):
+    """add_quote() should write compressed quote files back in the same format."""
+    plain_path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    path = os.path.join(str(tmp_path), 'quotes' + extension)
+    with open(plain_path, 'rb') as src, opener(path, 'wb') as dst:
+        dst.write(src.read())
+
+    api.add_quote(path, api.Quote('A brand new quote.', 'Author', None, ['new']))
+
+    with opener(path, 'rb') as f:
+        lines = f.read().decode('utf-8').splitlines()
+    assert len(lines) == 5
+    assert lines[-1] == 'A brand new quote. | Author |  | new'
+    assert len(api.read_quotes(path)) == 5
+
+
+_BATCH_PARSER_LINES = [
+    'A quote. | An Author | A Book | b, a, b,  c_1',
+    '   Leading and trailing space.  |  Author  |  |  ',
+    '\u3000Unicode space.\u3000|\u00a0Author\u00a0| |',
+    '# A comment | with | three | pipes',
+    '   # An indented comment',
+    '',
+    '   ',
+    'No tags. | Author | |',
+    'Empty tags, commas only. | Author | | , ,',
+]
+
+_BATCH_PARSER_BAD_LINES = [
+    'Too | many | pipes | here | x',
+    'Too few | pipes',
+    'Bad tag. | Author | | good, bad-tag',
+    'A "quoted" quote. | Author | |',
+    ' | Author | |',
+    'No author. |  | |',
+]
+
+
+def test_batch_parser_matches_general_parser():
+    """The batch parser used by read_quotes() should build the same quotes as parse_quotes()."""
+    expected = api.parse_quotes(_BATCH_PARSER_LINES, 'f', simple_format=False)
+    actual = store_mod._parse_split_lines(_BATCH_PARSER_LINES, 'f')
+    assert tests.test_util.compare_quotes(expected, actual)
+    assert [q.line_number for q in actual] == [q.line_number for q in expected]
+    assert [q.publication for q in actual] == [q.publication for q in expected]
+
+
+@pytest.mark.parametrize('bad_line', _BATCH_PARSER_BAD_LINES)
+def test_batch_parser_error_matches_general_parser(bad_line):
+    """The batch parser should raise the exact error message parse_quotes() raises."""
+    lines = ['A quote. | Author | |', bad_line]
+    with pytest.raises(api.QuoteValidationError) as expected:
+        api.parse_quotes(lines, 'f', simple_format=False)
+    with pytest.raises(api.QuoteValidationError) as actual:
+        store_mod._parse_split_lines(lines, 'f')
+    assert str(actual.value) == str(expected.value)
+
+
+def test_batch_parser_does_not_share_tag_lists():
+    """Quotes with the same tag string should each get their own tags list."""
+    quotes = store_mod._parse_split_lines(['One. | A | | x, y', 'Two. | B | | x, y'], 'f')
+    assert quotes[0].tags == quotes[1].tags
+    assert quotes[0].tags is not quotes[1].tags
+
+
+def test_read_quotes_lazy_matches_read_quotes(tmp_path):
+    """read_quotes_lazy() should return the same quotes and line numbers as read_quotes()."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    expected = api.read_quotes(path)
+    actual = api.read_quotes_lazy(path)
+    assert not any(q.is_parsed() for q in actual)
+    assert [q.line_number for q in actual] == [q.line_number for q in expected]
+    assert tests.test_util.compare_quotes(expected, actual)
+
+
+def test_read_quotes_lazy_parses_only_touched_quotes(tmp_path):
+    """A malformed line should only raise when its quote is used, unless strict is set."""
+    path = os.path.join(str(tmp_path), 'quotes.txt')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('# comment\nGood. | Author | |\n\nToo few | pipes\n')
+
+    quotes = api.read_quotes_lazy(path)
+    assert len(quotes) == 2
+    assert quotes[0].quote == 'Good.'
+    assert not quotes[1].is_parsed()
+    with pytest.raises(api.QuoteValidationError) as lazy_error:
+        quotes[1].author
+    with pytest.raises(api.QuoteValidationError) as strict_error:
+        api.read_quotes_lazy(path, strict=True)
+    assert str(lazy_error.value) == str(strict_error.value)
+    assert 'syntax error on line 4' in str(lazy_error.value)
+
+
+def test_read_quotes_lazy_fnf(tmp_path):
+    """read_quotes_lazy() should raise StorageError if the file is not found."""
+    with pytest.raises(api.StorageError):
+        api.read_quotes_lazy(os.path.join(str(tmp_path), 'fakename.txt'))
+
+
+def _write_lines(tmp_path, lines):
+    path = os.path.join(str(tmp_path), 'quotes.txt')
+    with open(path, 'wb') as f:
+        f.write(('\n'.join(lines) + '\n').encode('utf-8'))
+    return path
+
+
+@pytest.mark.parametrize('workers', [2, 3, 7])
+def test_read_quotes_parallel_matches_serial(tmp_path, monkeypatch, workers):
+    """read_quotes(workers=N) should return the same quotes and line numbers as a serial read."""
+    monkeypatch.setattr(store_mod, '_MIN_PARALLEL_PARSE_CHARS', 0)
+    path = _write_lines(tmp_path, _BATCH_PARSER_LINES * 5)
+
+    expected, expected_hash = api.read_quotes_with_hash(path)
+    actual, actual_hash = api.read_quotes_with_hash(path, workers=workers)
+    assert tests.test_util.compare_quotes(expected, actual)
+    assert [q.line_number for q in actual] == [q.line_number for q in expected]
+    assert actual_hash == expected_hash
+
+
+def test_read_quotes_parallel_reports_first_error(tmp_path, monkeypatch):
+    """A parallel read should report the same syntax error and line number as a serial read."""
+    monkeypatch.setattr(store_mod, '_MIN_PARALLEL_PARSE_CHARS', 0)
+    lines = ['Quote {0}. | Author | |'.format(i) for i in range(40)]
+    lines[25] = 'Too few | pipes'
+    lines[35] = 'Bad tag. | Author | | bad-tag'
+    path = _write_lines(tmp_path, lines)
+
+    with pytest.raises(api.QuoteValidationError) as expected:
+        api.read_quotes(path)
+    with pytest.raises(api.QuoteValidationError) as actual:
+        api.read_quotes(path, workers=4)
+    assert str(actual.value) == str(expected.value)
+    assert 'line 26' in str(actual.value)
+
+
+def test_read_quotes_parallel_invalid_workers(tmp_path):
+    """read_quotes() should reject a worker count below one."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    with pytest.raises(ValueError, match='workers must be a positive integer'):
+        api.read_quotes(path, workers=0)
+
+
+def test_split_on_line_boundaries():
+    """Chunks should end on newlines and concatenate back to the original text."""
+    text = 'a\nbb\n\nccc\ndddd'
+    for count in range(1, 8):
+        chunks = store_mod._split_on_line_boundaries(text, count)
+        assert ''.join(chunks) == text
+        assert all(chunk.endswith('\n') for chunk in chunks[:-1])
+
+
 def test_add_quote(config, tmp_path):
     """add_quote() method should add single quote to end of quote file."""
     path = tests.test_util.init_quotefile(str(tmp_path), 'quotes5.txt')
@@ -360,6 +552,138 @@ def test__write_quotes__should_replace_backup_file(config, tmp_path):
     assert backup_quotes[0] == quotes2[0]
 
 
+def test__write_quotes__should_keep_backup_generations(config, tmp_path):
+    # Given a quote file and backup_count set to 2
+    config[api.SECTION_GENERAL]['backup_count'] = '2'
+    quote_path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    quotes = api.read_quotes(quote_path)
+
+    # When write_quotes() called three times, each adding a quote
+    for text in ('First new quote.', 'Second new quote.', 'Third new quote.'):
+        quotes.append(api.Quote(text, 'Author', None, []))
+        api.write_quotes(quote_path, quotes)
+
+    # Then only the two most recent prior versions are kept, newest first
+    backups = api.list_backups(quote_path)
+    assert [b.generation for b in backups] == [1, 2]
+    assert len(api.read_quotes(backups[0].path)) == 6
+    assert len(api.read_quotes(backups[1].path)) == 5
+
+
+def test__write_quotes__should_hardlink_backup(config, tmp_path):
+    # Given a quote file
+    quote_path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    quotes = api.read_quotes(quote_path)
+    original_inode = os.stat(quote_path).st_ino
+
+    # When write_quotes() called
+    api.write_quotes(quote_path, quotes)
+
+    # Then the backup is the original inode rather than a copy
+    assert os.stat(api.list_backups(quote_path)[0].path).st_ino == original_inode
+
+
+def test__write_quotes__should_copy_backup_when_hardlinks_unsupported(config, monkeypatch, tmp_path):
+    # Given a quote file and os.link() failing as it does on filesystems without hardlinks
+    quote_path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    quotes = api.read_quotes(quote_path)
+
+    def fake_link(src, dst):
+        raise OSError('Operation not permitted')
+
+    monkeypatch.setattr(os, 'link', fake_link)
+
+    # When write_quotes() called
+    api.write_quotes(quote_path, quotes)
+
+    # Then a backup copy still exists
+    backups = api.list_backups(quote_path)
+    assert len(backups) == 1
+    assert tests.test_util.compare_quotes(quotes, api.read_quotes(backups[0].path))
+
+
+def test__write_quotes__should_not_create_backup_when_backup_count_zero(config, tmp_path):
+    config[api.SECTION_GENERAL]['backup_count'] = '0'
+    quote_path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    api.write_quotes(quote_path, api.read_quotes(quote_path))
+    assert api.list_backups(quote_path) == []
+
+
+def test__write_quotes__invalid_backup_count(config, tmp_path):
+    config[api.SECTION_GENERAL]['backup_count'] = 'many'
+    quote_path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    with pytest.raises(api.ConfigError, match="'many' is not valid value for the backup_count property"):
+        api.write_quotes(quote_path, api.read_quotes(quote_path))
+
+
+@pytest.mark.parametrize('durability,expected_fsyncs', [('none', 0), ('file', 1), ('full', 2)])
+def test__write_quotes__durability_modes(config, monkeypatch, tmp_path, durability, expected_fsyncs):
+    # Given a quote file and a durability mode
+    config[api.SECTION_GENERAL]['durability'] = durability
+    quote_path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    quotes = api.read_quotes(quote_path)
+
+    # And given os.fsync() wrapped to count calls
+    fsync_calls = []
+    original_fsync = os.fsync
+
+    def counting_fsync(fd):
+        fsync_calls.append(fd)
+        return original_fsync(fd)
+
+    monkeypatch.setattr(os, 'fsync', counting_fsync)
+
+    # When write_quotes() called
+    api.write_quotes(quote_path, quotes)
+
+    # Then the temp file (file, full) and the directory (full) are synced
+    if os.name == 'nt' and durability == 'full':
+        expected_fsyncs = 1
+    assert len(fsync_calls) == expected_fsyncs
+    assert tests.test_util.compare_quotes(quotes, api.read_quotes(quote_path))
+
+
+def test__write_quotes__no_fsync_by_default(config, monkeypatch, tmp_path):
+    # Given a quote file and no durability property
+    config.remove_option(api.SECTION_GENERAL, 'durability')
+    quote_path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    quotes = api.read_quotes(quote_path)
+    monkeypatch.setattr(os, 'fsync', lambda fd: pytest.fail('fsync called'))
+
+    # When write_quotes() called, then nothing is fsynced, as before durability existed
+    api.write_quotes(quote_path, quotes)
+    assert tests.test_util.compare_quotes(quotes, api.read_quotes(quote_path))
+
+
+def test__write_quotes__invalid_durability(config, tmp_path):
+    config[api.SECTION_GENERAL]['durability'] = 'paranoid'
+    quote_path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    with pytest.raises(api.ConfigError, match="'paranoid' is not valid value for the durability property"):
+        api.write_quotes(quote_path, api.read_quotes(quote_path))
+
+
+def test_restore_backup(config, tmp_path):
+    # Given a quote file that has been rewritten with an extra quote
+    quote_path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    original = api.read_quotes(quote_path)
+    api.write_quotes(quote_path, original + [api.Quote('A new quote.', 'Author', None, [])])
+
+    # When the most recent backup is restored
+    api.restore_backup(quote_path, 1)
+
+    # Then the original quotes are back and the replaced version became the newest backup
+    assert tests.test_util.compare_quotes(original, api.read_quotes(quote_path))
+    backups = api.list_backups(quote_path)
+    assert len(api.read_quotes(backups[0].path)) == 5
+    assert tests.test_util.compare_quotes(original, api.read_quotes(backups[1].path))
+
+
+def test_restore_backup_missing_generation(config, tmp_path):
+    quote_path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    with pytest.raises(api.StorageError, match='no backup generation 3 exists'):
+        api.restore_backup(quote_path, 3)
+
+
 def test__write_quotes__should_not_modify_quote_file_on_write_error(config, monkeypatch, tmp_path):
     # Given two quote files with a few quotes in each
     quote_path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
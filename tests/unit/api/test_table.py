@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+#  This file is licensed under the terms of the MIT License.  See the LICENSE
+# file in the root of this repository for complete details.
+
+import collections
+
+import pytest
+
+import tests.test_util
+from jotquote import api
+
+
+def _quotes():
+    lines = [
+        'The best way out is always through. | Robert Frost | A Servant to Servants | poetry, 5stars',
+        'Onward and upward. | Anon | | motivational',
+        'Two roads diverged in a wood. | Robert Frost | The Road Not Taken | poetry',
+        'A wall is a good tennis partner. | Mitch Hedberg | | funny, 3stars',
+        'Keep going through it. | Anon | Wall Calendar |',
+    ]
+    return api.parse_quotes(lines, 'f', simple_format=False)
+
+
+def _has_keyword(quote, keyword):
+    fields = (quote.quote, quote.author, quote.publication or '')
+    return any(keyword in field for field in fields) or quote.has_tag(keyword)
+
+
+def _filter_quotes(quotes, tags=None, keyword=None, author=None, excluded_tags=None):
+    """Reference implementation of QuoteTable.filter() over Quote objects."""
+    return [
+        row
+        for row, quote in enumerate(quotes)
+        if (tags is None or quote.has_tags(tags))
+        and (keyword is None or _has_keyword(quote, keyword))
+        and (author is None or quote.author == author)
+        and not any(quote.has_tag(tag) for tag in excluded_tags or [])
+    ]
+
+
+def test_round_trip():
+    """Quotes converted back from a table should equal the originals."""
+    quotes = _quotes()
+    table = api.QuoteTable.from_quotes(quotes)
+    assert len(table) == len(quotes)
+    converted = table.to_quotes()
+    assert tests.test_util.compare_quotes(quotes, converted)
+    assert [q.line_number for q in converted] == [q.line_number for q in quotes]
+    assert table.get_quote(2) == quotes[2]
+
+
+def test_from_read_quotes(tmp_path):
+    """A table should be constructible from the quotes read from a file."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    quotes = api.read_quotes(path)
+    table = api.QuoteTable.from_quotes(quotes)
+    assert tests.test_util.compare_quotes(quotes, table.to_quotes())
+
+
+def test_empty_table():
+    """An empty table should have no rows and empty counts."""
+    table = api.QuoteTable.from_quotes([])
+    assert len(table) == 0
+    assert table.to_quotes() == []
+    assert table.filter(keyword='x') == []
+    assert table.filter(keyword='') == []
+    assert table.tag_counts() == collections.Counter()
+
+
+@pytest.mark.parametrize(
+    'criteria',
+    [
+        {},
+        {'tags': ['poetry']},
+        {'tags': ['poetry', '5stars']},
+        {'tags': ['missing']},
+        {'keyword': 'wall'},
+        {'keyword': 'Wall'},
+        {'keyword': 'Frost'},
+        {'keyword': 'funny'},
+        {'keyword': 'through'},
+        {'keyword': 'o'},
+        {'keyword': ''},
+        {'author': 'Anon'},
+        {'author': 'Nobody'},
+        {'excluded_tags': ['poetry']},
+        {'tags': ['poetry'], 'keyword': 'wood'},
+        {'author': 'Anon', 'excluded_tags': ['motivational']},
+    ],
+)
+def test_filter_matches_quote_objects(criteria):
+    """filter() should select the same rows as testing each Quote."""
+    quotes = _quotes()
+    table = api.QuoteTable.from_quotes(quotes)
+    assert table.filter(**criteria) == _filter_quotes(quotes, **criteria)
+
+
+def test_keyword_does_not_match_across_quotes():
+    """A keyword should not match text spanning the end of one quote and the start of the next."""
+    table = api.QuoteTable.from_quotes(_quotes())
+    assert table.filter(keyword='through.Onward') == []
+    assert table.filter(keyword='through.\nOnward') == []
+
+
+def test_author_and_tag_counts():
+    """Group-by counts should match counting Quote objects."""
+    quotes = _quotes()
+    table = api.QuoteTable.from_quotes(quotes)
+    assert table.author_counts() == collections.Counter(q.author for q in quotes)
+    assert table.tag_counts() == collections.Counter(tag for q in quotes for tag in q.tags)
+    assert table.count_author('Robert Frost') == 2
+    assert table.count_author('Nobody') == 0
+
+
+def test_get_quote_out_of_range():
+    """get_quote() should raise IndexError for rows outside the table."""
+    table = api.QuoteTable.from_quotes(_quotes())
+    with pytest.raises(IndexError):
+        table.get_quote(5)
+    with pytest.raises(IndexError):
+        table.get_quote(-1)
@@ -2,11 +2,16 @@
 #  This file is licensed under the terms of the MIT License.  See the LICENSE
 # file in the root of this repository for complete details.
 
+import datetime
+import json
 import os
+import subprocess
+import sys
 import time
 from unittest.mock import patch
 
 import click
+import pytest
 from click.testing import CliRunner
 
 import tests.test_util
@@ -277,6 +282,34 @@ def test_today_passes_timezone_to_get_random_choice(config, tmp_path, monkeypatc
     assert captured['timezone'] == 'America/Chicago'
 
 
+def test_today_tag(config, tmp_path):
+    """today -t prints the daily quote of the tag's channel."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes2.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    runner = CliRunner()
+    result = runner.invoke(cli.jotquote, ['today', '-t', 'funny'], obj={})
+
+    assert result.exit_code == 0
+    quotes = api.read_quotes(path)
+    expected = quotes[api.get_channel_choice(quotes, 'funny')]
+    assert result.output.startswith(expected.quote)
+    assert expected.has_tag('funny')
+
+
+def test_today_unknown_tag(config, tmp_path):
+    """today -t fails when no quote has the tag."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes2.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    runner = CliRunner()
+    result = runner.invoke(cli.jotquote, ['today', '-t', 'missing'], obj={})
+
+    assert result.exit_code == 1
+    assert result.stdout == ''
+    assert "no quotes tagged 'missing'" in result.stderr
+
+
 def test_today_empty_file(config, tmp_path):
     """today subcommand exits silently when the quote file is empty."""
     empty = tmp_path / 'empty.txt'
@@ -290,6 +323,130 @@ def test_today_empty_file(config, tmp_path):
     assert result.output.strip() == ''
 
 
+def test_cli_import_skips_optional_modules():
+    """Importing the CLI does not import the modules that only some commands need."""
+    optional = [
+        'gzip',
+        'jotquote.api.backup',
+        'jotquote.api.lint',
+        'jotquote.api.schedule',
+        'jotquote.api.similarity',
+        'jotquote.api.table',
+        'logging',
+    ]
+    code = 'import sys, jotquote.cli; print(sorted(name for name in {0!r} if name in sys.modules))'.format(optional)
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+
+def test_schedule_formats_match_api():
+    """The schedule command offers the formats the API can write."""
+    assert cli._SCHEDULE_FORMATS == api.SCHEDULE_FORMATS
+
+
+def test_schedule(config, tmp_path):
+    """schedule prints one CSV row per day, matching build_schedule."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    runner = CliRunner()
+    result = runner.invoke(cli.jotquote, ['schedule', '--from', '20261101', '--days', '3'], obj={})
+
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert lines[0] == 'date,number,hash,source,author,quote'
+    assert [line.split(',')[0] for line in lines[1:]] == ['20261101', '20261102', '20261103']
+    entries = api.build_schedule(api.read_quotes(path), datetime.date(2026, 11, 1), 3)
+    assert [line.split(',')[1] for line in lines[1:]] == [str(entry.number) for entry in entries]
+
+
+def test_schedule_json_output_file_with_resolver(config, tmp_path, monkeypatch):
+    """schedule writes JSON to --output and applies the configured quote resolver."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+    config[api.SECTION_WEB]['quote_resolver_extension'] = 'tests.fixtures.test_resolver'
+    monkeypatch.setenv('TEST_RESOLVER_MAP', '20261102=a3bff52cabf7e859')
+    output = tmp_path / 'schedule.json'
+
+    runner = CliRunner()
+    args = ['schedule', '--from', '20261101', '--days', '2', '--format', 'json', '-o', str(output)]
+    result = runner.invoke(cli.jotquote, args, obj={})
+
+    assert result.exit_code == 0
+    assert result.output == ''
+    schedule = api.load_schedule(str(output))
+    assert sorted(schedule) == ['20261101', '20261102']
+    assert schedule['20261102'].source == 'resolver'
+    assert schedule['20261102'].number == 3
+    assert schedule['20261101'].source == 'random'
+
+
+def test_schedule_defaults_to_today_in_timezone(config, tmp_path):
+    """Without --from, schedule starts today in the configured timezone."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+    config[api.SECTION_GENERAL]['timezone'] = 'Pacific/Kiritimati'
+
+    runner = CliRunner()
+    result = runner.invoke(cli.jotquote, ['schedule', '--days', '1'], obj={})
+
+    assert result.exit_code == 0
+    today = api.get_quote_date('Pacific/Kiritimati').strftime('%Y%m%d')
+    assert result.output.splitlines()[1].startswith(today + ',')
+
+
+def test_schedule_defaults_to_next_day_at_cutoff(config, tmp_path, monkeypatch):
+    """From 11:45 PM on, schedule starts with the next day, like 'today' and the web viewer."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    class FakeDatetime(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.datetime(2026, 3, 14, 23, 50, 0)
+
+    monkeypatch.setattr('jotquote.api.schedule.datetime.datetime', FakeDatetime)
+    result = CliRunner().invoke(cli.jotquote, ['schedule', '--days', '1'], obj={})
+
+    assert result.exit_code == 0
+    row = result.output.splitlines()[1].split(',')
+    assert row[0] == '20260315'
+    today = CliRunner().invoke(cli.jotquote, ['today'], obj={})
+    assert api.read_quotes(path)[int(row[1]) - 1].quote in today.output
+
+
+@pytest.mark.parametrize(
+    'args, message',
+    [
+        (['--from', '2026-11-01'], 'invalid --from date'),
+        (['--days', '0'], '--days'),
+    ],
+)
+def test_schedule_invalid_arguments(config, tmp_path, args, message):
+    """schedule rejects malformed dates and non-positive day counts."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    runner = CliRunner()
+    result = runner.invoke(cli.jotquote, ['schedule'] + args, obj={})
+
+    assert result.exit_code != 0
+    assert message in result.output
+
+
+def test_schedule_bad_resolver(config, tmp_path):
+    """schedule reports a quote resolver that cannot be loaded."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+    config[api.SECTION_WEB]['quote_resolver_extension'] = 'tests.fixtures.no_such_resolver'
+
+    runner = CliRunner()
+    result = runner.invoke(cli.jotquote, ['schedule'], obj={})
+
+    assert result.exit_code == 1
+    assert "unable to load quote resolver 'tests.fixtures.no_such_resolver'" in result.output
+
+
 def test_quotefile_not_on_disk_shows_error(config, tmp_path):
     """When the configured quote file path doesn't exist on disk, jotquote
     prints a friendly error and exits non-zero."""
@@ -745,6 +902,23 @@ def test_lint_ignore(config, tmp_path):
     assert 'No issues found.' in result.output
 
 
+def test_lint_ignore_leaves_out_opt_in_checks(config, tmp_path, monkeypatch):
+    """lint --ignore runs the default checks, not the opt-in ones."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes2.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    def _fail(self, target, *, config=None):
+        raise AssertionError('{0} ran'.format(self.name))
+
+    for name in ('spelling', 'near-duplicate', 'author-variants'):
+        monkeypatch.setattr(type(api.lint.CHECKS[name]), 'check', _fail)
+
+    runner = CliRunner()
+    result = runner.invoke(cli.jotquote, ['lint', '--ignore', 'no-tags'], obj={})
+
+    assert result.exit_code == 0, result.output
+
+
 def test_lint_unknown_check(config, tmp_path):
     """lint rejects unknown check names."""
     path = tests.test_util.init_quotefile(str(tmp_path), 'quotes2.txt')
@@ -757,6 +931,21 @@ def test_lint_unknown_check(config, tmp_path):
     assert 'Unknown check' in result.output
 
 
+def test_lint_select_plugin_check(config, tmp_path, monkeypatch):
+    """lint --select accepts the name of a check installed as a plugin."""
+    from jotquote.api import lint as lintmod
+
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes2.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+    monkeypatch.setattr(lintmod, '_plugin_entry_points', lambda: {'plugin-check': None})
+    monkeypatch.setitem(lintmod.CHECKS, 'plugin-check', lintmod.CHECKS['no-author'])
+
+    result = CliRunner().invoke(cli.jotquote, ['lint', '--select', 'plugin-check', '--no-cache'], obj={})
+
+    assert 'Unknown check' not in result.output
+    assert result.exit_code == 0
+
+
 def test_lint_ignore_unknown_check_raises_error(config, tmp_path):
     """lint --ignore with an unrecognised check name raises a ClickException."""
     path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
@@ -769,6 +958,271 @@ def test_lint_ignore_unknown_check_raises_error(config, tmp_path):
     assert 'Unknown check' in result.output
 
 
+def test_lint_jobs_matches_single_process(config, tmp_path, monkeypatch):
+    """lint --jobs reports the same issues as a single-process run."""
+    monkeypatch.setattr('jotquote.api.lint._MIN_CHUNK_QUOTES', 2)
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes9.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    runner = CliRunner()
+    serial = runner.invoke(cli.jotquote, ['lint'], obj={})
+    parallel = runner.invoke(cli.jotquote, ['lint', '--jobs', '2'], obj={})
+
+    assert serial.exit_code == parallel.exit_code == 1
+    assert parallel.output == serial.output
+
+
+def test_lint_jobs_negative(config, tmp_path):
+    """lint rejects a negative --jobs value."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes2.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    result = CliRunner().invoke(cli.jotquote, ['lint', '-j', '-1'], obj={})
+
+    assert result.exit_code == 2
+    assert '--jobs' in result.output
+
+
+def test_lint_reuses_cache(config, tmp_path, monkeypatch):
+    """A second lint run reports the same issues from the saved results."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes9.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    runner = CliRunner()
+    first = runner.invoke(cli.jotquote, ['lint'], obj={})
+    assert os.listdir(str(tmp_path / 'config' / 'lint_cache'))
+
+    monkeypatch.setattr('jotquote.api.lint._lint_each_quote', lambda *args: pytest.fail('quote checked again'))
+    second = runner.invoke(cli.jotquote, ['lint'], obj={})
+
+    assert first.exit_code == second.exit_code == 1
+    assert second.output == first.output
+
+
+def test_lint_no_cache(config, tmp_path):
+    """lint --no-cache neither reads nor writes saved results."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes9.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    result = CliRunner().invoke(cli.jotquote, ['lint', '--no-cache'], obj={})
+
+    assert result.exit_code == 1
+    assert not (tmp_path / 'config').exists()
+
+
+def test_lint_max_issues(config, tmp_path):
+    """lint --max-issues stops after that many issues and says so."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes9.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    result = CliRunner().invoke(cli.jotquote, ['lint', '--select', 'no-tags', '--max-issues', '2'], obj={})
+
+    assert result.exit_code == 1
+    assert result.output == (
+        'line 1: [no-tags] Quote has no tags\n'
+        'line 2: [no-tags] Quote has no tags\n'
+        '2 issues found, 0 are fixable.\n'
+        'Stopped after 2 issues; there may be more.\n'
+    )
+
+
+def test_lint_text_order(config, tmp_path):
+    """Text output lists issues check by check, or quote by quote when a limit is given."""
+    path = tmp_path / 'quotes.txt'
+    path.write_text('A  quote. | Author | |\nAnother  quote. | Author | |\n', encoding='utf-8')
+    config[api.SECTION_GENERAL]['quote_file'] = str(path)
+
+    def _issues(*args):
+        result = CliRunner().invoke(cli.jotquote, ['lint', '--select', 'no-tags,double-spaces', *args], obj={})
+        assert result.exit_code == 1
+        return [tuple(line.split(': ')[0:2]) for line in result.output.splitlines() if line.startswith('line ')]
+
+    by_check = _issues()
+    assert [line for line, _ in by_check] == ['line 1', 'line 2', 'line 1', 'line 2']
+    assert by_check[0][1] == by_check[1][1] != by_check[2][1] == by_check[3][1]
+
+    by_quote = _issues('--max-issues', '10')
+    assert [line for line, _ in by_quote] == ['line 1', 'line 1', 'line 2', 'line 2']
+
+
+def test_lint_fail_fast(config, tmp_path):
+    """lint --fail-fast stops at the first issue, and cannot be combined with --max-issues."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes9.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    result = CliRunner().invoke(cli.jotquote, ['lint', '--select', 'no-tags', '--fail-fast'], obj={})
+    assert result.exit_code == 1
+    assert result.output.splitlines()[0] == 'line 1: [no-tags] Quote has no tags'
+    assert 'Stopped after 1 issue;' in result.output
+
+    result = CliRunner().invoke(cli.jotquote, ['lint', '--fail-fast', '--max-issues', '3'], obj={})
+    assert result.exit_code != 0
+    assert 'mutually exclusive' in result.output
+
+
+def test_lint_format_json(config, tmp_path):
+    """lint --format json writes one JSON object per issue, and nothing else, to stdout."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes9.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    result = CliRunner().invoke(
+        cli.jotquote, ['lint', '--select', 'no-tags', '--format', 'json', '--max-issues', '3'], obj={}
+    )
+
+    assert result.exit_code == 1
+    issues = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [issue['line_number'] for issue in issues] == [1, 2, 3]
+    assert issues[0] == {
+        'line_number': 1,
+        'check': 'no-tags',
+        'field': 'tags',
+        'message': 'Quote has no tags',
+        'fixable': False,
+        'fix_value': None,
+    }
+    assert 'Stopped after 3 issues' in result.stderr
+
+
+def test_lint_format_sarif(config, tmp_path):
+    """lint --format sarif writes a SARIF 2.1.0 log with a result per issue."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes9.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    result = CliRunner().invoke(cli.jotquote, ['lint', '--select', 'no-tags', '--format', 'sarif'], obj={})
+
+    assert result.exit_code == 1
+    log = json.loads(result.stdout)
+    assert log['version'] == '2.1.0'
+    run = log['runs'][0]
+    assert run['tool']['driver']['name'] == 'jotquote'
+    assert [rule['id'] for rule in run['tool']['driver']['rules']] == ['no-tags']
+    assert len(run['results']) == 8
+    location = run['results'][1]['locations'][0]['physicalLocation']
+    assert location['artifactLocation']['uri'].endswith('/quotes9.txt')
+    assert location['region'] == {'startLine': 2}
+    assert run['results'][1]['ruleId'] == 'no-tags'
+
+
+def test_lint_format_sarif_no_issues(config, tmp_path):
+    """A SARIF log without issues has an empty results list."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes9.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    result = CliRunner().invoke(cli.jotquote, ['lint', '--select', 'smart-dashes', '--format', 'sarif'], obj={})
+
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)['runs'][0]['results'] == []
+
+
+def test_lint_fix_rechecks_only_fixed_quotes(config, tmp_path, monkeypatch):
+    """After --fix, only the quotes that were fixed are checked again."""
+    from jotquote.api import lint as lintmod
+
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes9.txt')
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('Two  spaces here.|Someone||\n')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+    checked = []
+    each = lintmod._lint_each_quote
+    monkeypatch.setattr(lintmod, '_lint_each_quote', lambda qs, *args: checked.append(len(qs)) or each(qs, *args))
+
+    result = CliRunner().invoke(
+        cli.jotquote, ['lint', '--select', 'double-spaces,no-tags', '--fix', '--no-cache'], obj={}
+    )
+
+    assert result.exit_code == 1
+    assert checked == [9, 1]
+    assert '1 fix applied.' in result.output
+    assert '9 issues found, 0 are fixable.' in result.output
+    assert 'Two spaces here.' in open(path, encoding='utf-8').read()
+
+
+def test_dedupe(config, tmp_path):
+    """dedupe prints each near duplicate with the earlier quote, and saves the signatures."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes9.txt')
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('It does not matter how slowly you go, as long as you do not ever stop.|Confucius||\n')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    result = CliRunner().invoke(cli.jotquote, ['dedupe'], obj={})
+
+    assert result.exit_code == 0
+    assert result.output.endswith(
+        'line 6 and line 9 are 81% similar:\n'
+        'It does not matter how slowly you go as long as you do not stop.  - Confucius\n'
+        'It does not matter how slowly you go, as long as you do not ever stop.  - Confucius\n'
+        '\n'
+        '1 near duplicate found.\n'
+    )
+    assert (tmp_path / 'config' / 'lint_cache' / 'near-duplicate.bin').exists()
+
+
+def test_lint_saves_near_duplicate_signatures(config, tmp_path, monkeypatch):
+    """lint saves the near-duplicate signatures for the next run, unless --no-cache is given."""
+    from jotquote.api import lint as lintmod
+
+    monkeypatch.setattr(lintmod, '_signatures', None)
+    monkeypatch.setattr(lintmod, '_signatures_changed', False)
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes9.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+    signature_file = tmp_path / 'config' / 'lint_cache' / 'near-duplicate.bin'
+
+    CliRunner().invoke(cli.jotquote, ['lint', '--select', 'near-duplicate', '--no-cache'], obj={})
+    assert not signature_file.exists()
+
+    CliRunner().invoke(cli.jotquote, ['lint', '--select', 'near-duplicate'], obj={})
+    assert signature_file.exists()
+
+
+def test_authorvariants(config, tmp_path):
+    """authorvariants lists each variant under the name with the most quotes."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes9.txt')
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('A foolish consistency is the hobgoblin of little minds.|R. W. Emerson||\n')
+        f.write('To be great is to be misunderstood.|Ralph Waldo Emerson||\n')
+        f.write('What lies behind us are tiny matters.|Ralph Waldo Emerson||\n')
+        f.write('Nothing great was ever achieved without enthusiasm.|Emerson, Ralph Waldo||\n')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    result = CliRunner().invoke(cli.jotquote, ['authorvariants'], obj={})
+
+    assert result.exit_code == 0
+    assert result.output == (
+        'Ralph Waldo Emerson (2 quotes)\n'
+        '    Emerson, Ralph Waldo (1 quote)\n'
+        '    R. W. Emerson (1 quote)\n'
+        '2 author variants found.\n'
+    )
+
+
+def test_authorvariants_none(config, tmp_path):
+    """authorvariants says so when no author names are variants."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes9.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    result = CliRunner().invoke(cli.jotquote, ['authorvariants'], obj={})
+
+    assert result.exit_code == 0
+    assert result.output == 'No author variants found.\n'
+
+
+def test_dedupe_threshold(config, tmp_path):
+    """dedupe --threshold overrides near_duplicate_threshold in settings.conf."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes9.txt')
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('It does not matter how slowly you go, as long as you do not ever stop.|Confucius||\n')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+    config[api.SECTION_LINT]['near_duplicate_threshold'] = '0.5'
+
+    result = CliRunner().invoke(cli.jotquote, ['dedupe', '--threshold', '0.9'], obj={})
+
+    assert result.exit_code == 0
+    assert result.output == 'No near duplicates found.\n'
+
+    result = CliRunner().invoke(cli.jotquote, ['dedupe', '--threshold', '0'], obj={})
+    assert result.exit_code == 2
+
+
 def test_lint_fix_smart_quotes(config, tmp_path):
     """lint --fix replaces smart quotes in the quote file."""
 
@@ -935,3 +1389,49 @@ def test_add_lint_on_add_true_runs_checks(config, tmp_path):
     assert result.exit_code == 0
     assert 'Warning:' in result.output
     assert '1 quote added' in result.output
+
+
+def test_backups_list(config, tmp_path):
+    """The backups list subcommand should print one line per backup generation."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+    quotes = api.read_quotes(path)
+    api.write_quotes(path, quotes)
+    api.write_quotes(path, quotes)
+
+    runner = CliRunner()
+    result = runner.invoke(cli.jotquote, ['backups', 'list'], obj={})
+
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert len(lines) == 2
+    assert lines[0].startswith('1: ')
+    assert lines[1].startswith('2: ')
+
+
+def test_backups_list_none(config, tmp_path):
+    """The backups list subcommand should say so when there are no backups."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+
+    runner = CliRunner()
+    result = runner.invoke(cli.jotquote, ['backups', 'list'], obj={})
+
+    assert result.exit_code == 0
+    assert result.output == 'No backups found.\n'
+
+
+def test_backups_restore_missing_quote_file(config, tmp_path):
+    """The backups restore subcommand should work even if the quote file was deleted."""
+    path = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
+    config[api.SECTION_GENERAL]['quote_file'] = path
+    quotes = api.read_quotes(path)
+    api.write_quotes(path, quotes)
+    os.remove(path)
+
+    runner = CliRunner()
+    result = runner.invoke(cli.jotquote, ['backups', 'restore'], obj={})
+
+    assert result.exit_code == 0
+    assert 'Restored backup generation 1' in result.output
+    assert tests.test_util.compare_quotes(quotes, api.read_quotes(path))
@@ -12,8 +12,10 @@ from jotquote import api
 
 
 @pytest.fixture
-def config(monkeypatch):
+def config(monkeypatch, tmp_path):
     """Provide a test ConfigParser and patch api.get_config to return it."""
+    # Files kept beside settings.conf, like the lint cache, go to a temporary directory
+    monkeypatch.setenv('JOTQUOTE_CONFIG', str(tmp_path / 'config' / 'settings.conf'))
     cfg = ConfigParser()
     cfg.add_section(api.SECTION_GENERAL)
     cfg[api.SECTION_GENERAL]['quote_file'] = 'notset'
@@ -36,7 +38,7 @@ def editor_client(tmp_path, config):
 
     quote_file = tests.test_util.init_quotefile(str(tmp_path), 'quotes1.txt')
     config[api.SECTION_GENERAL]['quote_file'] = str(quote_file)
-    editor._lint_cache = {'sha256': None, 'checks': None, 'issues': []}
+    editor._lint_cache = {'sha256': None, 'checks': None, 'issues': [], 'quotes': {}}
     editor.app.testing = True
     with editor.app.test_client() as client:
         yield client, quote_file
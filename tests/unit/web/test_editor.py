@@ -402,6 +402,37 @@ def test_lint_cache_miss_on_check_change(editor_client, config, monkeypatch):
         assert mock_lint.call_count == 2
 
 
+def test_lint_cache_after_save_rechecks_only_edited_quote(editor_client, config):
+    """After a save, only the edited quote goes through the per-quote checks again."""
+    from unittest.mock import patch
+
+    from jotquote.web import editor as web_editor
+
+    client, quote_file = editor_client
+    config[api.SECTION_LINT]['enabled_checks'] = 'double-spaces, duplicate-hash'
+    client.get('/')
+    quotes = api.read_quotes(quote_file)
+    target = quotes[1]
+
+    with patch.object(web_editor.lint, '_lint_each_quote', wraps=web_editor.lint._lint_each_quote) as each:
+        rv = client.post(
+            '/{}'.format(target.line_number),
+            data={
+                'quote': 'Edited  text.',
+                'author': target.author,
+                'publication': target.publication or '',
+                'tags': ', '.join(target.tags),
+                'sha256': api.get_sha256(quote_file),
+            },
+        )
+        assert rv.status_code == 302
+        body = client.get('/{}'.format(target.line_number)).data.decode('utf-8')
+
+    assert each.call_count == 1
+    assert [q.quote for q in each.call_args.args[0]] == ['Edited  text.']
+    assert 'Multiple consecutive spaces in quote' in body
+
+
 # ---------------------------------------------------------------------------
 # Startup logging
 # ---------------------------------------------------------------------------
@@ -4,12 +4,16 @@
 
 import datetime
 import os
+import sys
+import threading
+import time
 
 import pytest
 from flask import g
 
 import tests.test_util
 from jotquote import api
+from jotquote.api import selection
 from jotquote.web import viewer as web
 
 
@@ -458,7 +462,7 @@ def test_showpage_invalid_timezone_raises_config_error(flask_client, config, mon
 def test_root_with_resolver_today(flask_client, config, monkeypatch):
     """/ with resolver returning hash for today shows mapped quote and permalink."""
     client, quote_file = flask_client
-    today = datetime.datetime.now().strftime('%Y%m%d')
+    today = api.get_quote_date().strftime('%Y%m%d')
     monkeypatch.setattr(web, '_resolver_fn', lambda d: 'd4a5c5a909517953')
     monkeypatch.setattr(web, '_resolver_loaded', True)
     rv = client.get('/')
@@ -633,7 +637,7 @@ def test_refresh_calls_api_endpoint(flask_client):
     """Auto-refresh fetches /api rather than reloading the page."""
     client, quote_file = flask_client
     rv = client.get('/')
-    assert b"fetch('/api'" in rv.data
+    assert b'fetch("/api"' in rv.data
 
 
 def test_no_navigation_navigate(flask_client):
@@ -1125,6 +1129,23 @@ def test_api_quote_file_missing_returns_503(flask_client, config, monkeypatch):
     assert rv.headers.get('Cache-Control', '').startswith('public, max-age=')
 
 
+def test_malformed_selected_quote_is_unavailable(flask_client, config, monkeypatch):
+    """A malformed line is only noticed when selected, and is then reported as unavailable."""
+    client, quote_file = flask_client
+    with open(quote_file, 'w', encoding='utf-8') as f:
+        f.write('Good. | Author | |\nToo few | pipes\n')
+
+    monkeypatch.setattr(api, 'get_random_choice', lambda _n, timezone=None: 0)
+    rv = client.get('/')
+    assert b'Good.' in rv.data
+
+    monkeypatch.setattr(api, 'get_random_choice', lambda _n, timezone=None: 1)
+    rv = client.get('/')
+    assert b'The quotes are not yet available; please try again later.' in rv.data
+    rv = client.get('/api')
+    assert rv.status_code == 503
+
+
 def _swap_quote_file(quote_file, fixture_name):
     """Replace the flask client's QUOTE_FILE with a different testdata fixture."""
     new_path = tests.test_util.init_quotefile(os.path.dirname(quote_file), fixture_name)
@@ -1169,3 +1190,384 @@ def test_api_random_mode_varies(flask_client, config):
     for _ in range(30):
         seen.add(client.get('/api').get_json()['quote'])
     assert len(seen) >= 2
+
+
+def _write_schedule(tmp_path, entries):
+    """Write a CSV schedule file and return its path."""
+    path = tmp_path / 'schedule.csv'
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        api.write_schedule(entries, f)
+    return str(path)
+
+
+def test_schedule_resolver_entry_served_without_resolver(flask_client, config, tmp_path, monkeypatch):
+    """A resolver entry in schedule_file serves its quote with a permalink, without calling the resolver."""
+    client, quote_file = flask_client
+    quotes = api.read_quotes(_swap_quote_file(quote_file, 'quotes9.txt'))
+    today = api.get_quote_date().strftime('%Y%m%d')
+    target = quotes[4]
+    entries = [
+        api.ScheduleEntry(today, 5, target.get_hash(), 'resolver'),
+        api.ScheduleEntry('20260319', 5, target.get_hash(), 'resolver'),
+    ]
+    config[api.SECTION_WEB]['schedule_file'] = _write_schedule(tmp_path, entries)
+    web._reset_schedule()
+
+    def fail(d):
+        raise AssertionError('resolver should not be called for scheduled dates')
+
+    monkeypatch.setattr(web, '_resolver_fn', fail)
+    monkeypatch.setattr(web, '_resolver_loaded', True)
+
+    rv = client.get('/')
+    assert rv.status_code == 200
+    assert target.author.encode() in rv.data
+    assert f'data-permalink="/{today}"'.encode() in rv.data
+    rv = client.get('/20260319')
+    assert rv.status_code == 200
+    assert target.author.encode() in rv.data
+    assert client.get('/api').get_json()['quote'] == target.quote
+
+
+def test_schedule_random_entry(flask_client, config, tmp_path, monkeypatch):
+    """A random entry uses the seeded choice on the root route and is a 404 on its date route."""
+    client, quote_file = flask_client
+    quotes = api.read_quotes(_swap_quote_file(quote_file, 'quotes9.txt'))
+    entries = api.build_schedule(quotes, datetime.date(2026, 3, 19), 1)
+    config[api.SECTION_WEB]['schedule_file'] = _write_schedule(tmp_path, entries)
+    web._reset_schedule()
+    monkeypatch.setattr(web, '_resolver_fn', lambda d: quotes[0].get_hash())
+    monkeypatch.setattr(web, '_resolver_loaded', True)
+
+    assert client.get('/20260319').status_code == 404
+
+
+def test_schedule_random_entry_number_served(flask_client, config, tmp_path, monkeypatch):
+    """The root route serves a current random entry as scheduled."""
+    client, quote_file = flask_client
+    quotes = api.read_quotes(_swap_quote_file(quote_file, 'quotes9.txt'))
+    entries = api.build_schedule(quotes, api.get_quote_date(), 1)
+    target = quotes[entries[0].number - 1]
+    config[api.SECTION_WEB]['schedule_file'] = _write_schedule(tmp_path, entries)
+    web._reset_schedule()
+    monkeypatch.setattr(web, '_resolver_fn', lambda d: None)
+    monkeypatch.setattr(web, '_resolver_loaded', True)
+    monkeypatch.setattr(api, 'get_random_choice', lambda *args, **kwargs: pytest.fail('chosen again'))
+
+    assert client.get('/api').get_json()['quote'] == target.quote
+
+
+def test_schedule_random_entry_stale_after_append(flask_client, config, tmp_path, monkeypatch):
+    """A random entry built before quotes were added is ignored in favor of the seeded choice, as in 'today'."""
+    client, quote_file = flask_client
+    path = _swap_quote_file(quote_file, 'quotes9.txt')
+    quotes = api.read_quotes(path)
+    today = api.get_quote_date()
+    entries = api.build_schedule(quotes, today, 1)
+    config[api.SECTION_WEB]['schedule_file'] = _write_schedule(tmp_path, entries)
+    web._reset_schedule()
+    monkeypatch.setattr(web, '_resolver_fn', lambda d: None)
+    monkeypatch.setattr(web, '_resolver_loaded', True)
+
+    # Add enough quotes for the day's seeded choice to move away from the scheduled quote
+    added = next(
+        n for n in range(1, 50) if api.build_schedule(quotes + quotes[:1] * n, today, 1)[0].number != entries[0].number
+    )
+    with open(path, 'a', encoding='utf-8') as f:
+        for i in range(added):
+            f.write('Added quote {0} was appended here.|Author {0}||\n'.format(i))
+    web._reset_quotes()
+    current = api.read_quotes(path)
+    seeded = api.build_schedule(current, today, 1)[0]
+
+    assert not api.is_entry_current(current, entries[0])
+    assert client.get('/api').get_json()['quote'] == current[seeded.number - 1].quote
+    assert current[seeded.number - 1].quote != quotes[entries[0].number - 1].quote
+
+
+def test_schedule_stale_entry_ignored(flask_client, config, tmp_path, monkeypatch):
+    """An entry whose hash no longer matches the quote file falls back to the resolver."""
+    client, quote_file = flask_client
+    quotes = api.read_quotes(_swap_quote_file(quote_file, 'quotes9.txt'))
+    entries = [api.ScheduleEntry('20260319', 5, 'aaaaaaaaaaaaaaaa', 'resolver')]
+    config[api.SECTION_WEB]['schedule_file'] = _write_schedule(tmp_path, entries)
+    web._reset_schedule()
+    monkeypatch.setattr(web, '_resolver_fn', lambda d: quotes[2].get_hash())
+    monkeypatch.setattr(web, '_resolver_loaded', True)
+
+    rv = client.get('/20260319')
+    assert rv.status_code == 200
+    assert quotes[2].author.encode() in rv.data
+
+
+def test_schedule_reloaded_when_file_changes(flask_client, config, tmp_path):
+    """The cached schedule is reloaded when schedule_file is modified."""
+    client, quote_file = flask_client
+    quotes = api.read_quotes(_swap_quote_file(quote_file, 'quotes9.txt'))
+    path = _write_schedule(tmp_path, [api.ScheduleEntry('20260319', 1, quotes[0].get_hash(), 'resolver')])
+    config[api.SECTION_WEB]['schedule_file'] = path
+    web._reset_schedule()
+    assert quotes[0].author.encode() in client.get('/20260319').data
+
+    _write_schedule(tmp_path, [api.ScheduleEntry('20260319', 2, quotes[1].get_hash(), 'resolver')])
+    mtime = os.stat(path).st_mtime + 1.0
+    os.utime(path, (mtime, mtime))
+    assert quotes[1].author.encode() in client.get('/20260319').data
+
+
+def test_schedule_missing_file_ignored(flask_client, config, tmp_path):
+    """A missing schedule_file is logged and the viewer behaves as if none were configured."""
+    client, quote_file = flask_client
+    config[api.SECTION_WEB]['schedule_file'] = str(tmp_path / 'missing.csv')
+    web._reset_schedule()
+
+    assert client.get('/').status_code == 200
+    assert client.get('/20260319').status_code == 404
+
+
+def test_channel_page_serves_tagged_daily_quote(flask_client, config):
+    """/c/<tag> shows the tag's daily quote and refreshes from /api?tag=<tag>."""
+    client, quote_file = flask_client
+    quotes = api.read_quotes(_swap_quote_file(quote_file, 'quotes2.txt'))
+    tag = 'funny'
+    index = api.get_channel_choice(quotes, tag)
+    assert quotes[index].has_tag(tag)
+
+    rv = client.get(f'/c/{tag}')
+    assert rv.status_code == 200
+    assert quotes[index].author.encode() in rv.data
+    assert f'fetch("/api?tag={tag}"'.encode() in rv.data
+    assert b'data-permalink=' not in rv.data
+
+
+def test_api_channel(flask_client, config):
+    """/api?tag=<tag> returns the tag's daily quote."""
+    client, quote_file = flask_client
+    quotes = api.read_quotes(_swap_quote_file(quote_file, 'quotes2.txt'))
+    tag = 'funny'
+    body = client.get(f'/api?tag={tag}').get_json()
+    assert body['quote'] == quotes[api.get_channel_choice(quotes, tag)].quote
+
+
+def test_channel_ignores_resolver(flask_client, config, monkeypatch):
+    """The quote resolver only applies to the all-quotes channel."""
+    client, quote_file = flask_client
+    quotes = api.read_quotes(_swap_quote_file(quote_file, 'quotes2.txt'))
+    tag = 'funny'
+    untagged = next(quote for quote in quotes if not quote.has_tag(tag))
+    monkeypatch.setattr(web, '_resolver_fn', lambda d: untagged.get_hash())
+    monkeypatch.setattr(web, '_resolver_loaded', True)
+    body = client.get(f'/api?tag={tag}').get_json()
+    assert body['quote'] == quotes[api.get_channel_choice(quotes, tag)].quote
+
+
+def test_channel_random_mode(flask_client, config):
+    """In random mode a channel returns random quotes with its tag."""
+    config[api.SECTION_WEB]['mode'] = 'random'
+    client, quote_file = flask_client
+    quotes = api.read_quotes(_swap_quote_file(quote_file, 'quotes2.txt'))
+    tag = 'funny'
+    tagged = {quote.quote for quote in quotes if quote.has_tag(tag)}
+    for _ in range(10):
+        assert client.get(f'/api?tag={tag}').get_json()['quote'] in tagged
+
+
+def test_channels_built_once_per_quote_file(flask_client, config, monkeypatch):
+    """Channel positions are collected on the first request only, until the quote file changes."""
+    client, quote_file = flask_client
+    _swap_quote_file(quote_file, 'quotes2.txt')
+    builds = []
+
+    class CountingChannels(selection._Channels):
+        def __init__(self, quotes):
+            builds.append(quotes)
+            super().__init__(quotes)
+
+    monkeypatch.setattr(selection, '_Channels', CountingChannels)
+    assert client.get('/api?tag=funny').status_code == 200
+    assert client.get('/api?tag=funny').status_code == 200
+    assert len(builds) == 1
+
+    quote_file = web.app.config['QUOTE_FILE']
+    stat = os.stat(quote_file)
+    os.utime(quote_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert client.get('/api?tag=funny').status_code == 200
+    assert len(builds) == 2
+
+
+def test_shared_quotes_served_from_threads(flask_client, config, monkeypatch):
+    """Concurrent requests share the cached quote list, and its quotes are parsed once."""
+    client, quote_file = flask_client
+    read_quotes_lazy = api.read_quotes_lazy
+    parsed = []
+
+    def slow_parse(line, line_number):
+        # Slow enough that every request reaches the quote while it is being parsed
+        parsed.append(line_number)
+        time.sleep(0.05)
+        return api.parse_quote(line, simple_format=False)
+
+    def read_slowly(path):
+        return [api.LazyQuote(quote._line, quote.line_number, slow_parse) for quote in read_quotes_lazy(path)]
+
+    monkeypatch.setattr(api, 'read_quotes_lazy', read_slowly)
+    barrier = threading.Barrier(4)
+    statuses = []
+
+    def serve():
+        with web.app.test_client() as thread_client:
+            barrier.wait()
+            statuses.append(thread_client.get('/api').status_code)
+
+    threads = [threading.Thread(target=serve) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses == [200] * 4
+    assert len(parsed) == 1
+
+
+def test_unknown_channel_returns_404(flask_client, config):
+    """A tag that no quote has is a 404 for both the page and the API."""
+    client, quote_file = flask_client
+    assert client.get('/c/nosuchtag').status_code == 404
+    assert client.get('/api?tag=nosuchtag').status_code == 404
+
+
+def test_mode_random_star_weighting(flask_client, config, monkeypatch):
+    """random_weighting = stars draws random-mode quotes from the star-weighted alias table."""
+    config[api.SECTION_WEB]['mode'] = 'random'
+    config[api.SECTION_WEB]['random_weighting'] = 'stars'
+    client, quote_file = flask_client
+    quotes = api.read_quotes(_swap_quote_file(quote_file, 'quotes2.txt'))
+    monkeypatch.setattr(api, 'get_star_weighted_choice', lambda quotes: 2)
+    assert client.get('/api').get_json()['quote'] == quotes[2].quote
+
+
+def test_star_table_built_once_per_quote_file(flask_client, config, monkeypatch):
+    """The star-weighted alias table is built on the first request only, until the quote file changes."""
+    config[api.SECTION_WEB]['mode'] = 'random'
+    config[api.SECTION_WEB]['random_weighting'] = 'stars'
+    client, quote_file = flask_client
+    _swap_quote_file(quote_file, 'quotes2.txt')
+    builds = []
+
+    class CountingAliasTable(selection._AliasTable):
+        def __init__(self, weights):
+            builds.append(weights)
+            super().__init__(weights)
+
+    monkeypatch.setattr(selection, '_AliasTable', CountingAliasTable)
+    assert client.get('/api').status_code == 200
+    assert client.get('/api').status_code == 200
+    assert len(builds) == 1
+
+    quote_file = web.app.config['QUOTE_FILE']
+    stat = os.stat(quote_file)
+    os.utime(quote_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert client.get('/api').status_code == 200
+    assert len(builds) == 2
+
+
+def test_rotation_global_cursor(flask_client, config, tmp_path):
+    """Global rotation shows every quote once before repeating and persists its cursor."""
+    config[api.SECTION_WEB]['mode'] = 'rotation'
+    state_file = tmp_path / 'rotation.state'
+    config[api.SECTION_WEB]['rotation_state_file'] = str(state_file)
+    client, quote_file = flask_client
+    quotes = api.read_quotes(_swap_quote_file(quote_file, 'quotes9.txt'))
+
+    shown = [client.get('/api').get_json()['quote'] for _ in quotes]
+    assert sorted(shown) == sorted(quote.quote for quote in quotes)
+    assert state_file.read_text(encoding='utf-8') == str(len(quotes))
+    assert not list(tmp_path.glob('*.tmp'))
+
+    state_file.write_text('3', encoding='utf-8')
+    rv = client.get('/')
+    assert quotes[api.get_rotation_choice(len(quotes), 3)].author.encode() in rv.data
+    assert state_file.read_text(encoding='utf-8') == '4'
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='uses fcntl to hold the lock from the test')
+def test_rotation_global_cursor_waits_for_file_lock(config, tmp_path):
+    """The global cursor update waits while another process holds the rotation lock file."""
+    import fcntl
+
+    state_file = tmp_path / 'rotation.state'
+    state_file.write_text('5', encoding='utf-8')
+    config[api.SECTION_WEB]['rotation_state_file'] = str(state_file)
+    result = []
+
+    with open(str(state_file) + '.lock', 'a+b') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        worker = threading.Thread(target=lambda: result.append(web._next_rotation_cursor(config, 9)))
+        worker.start()
+        worker.join(0.3)
+        assert worker.is_alive()
+        assert state_file.read_text(encoding='utf-8') == '5'
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    worker.join(5)
+
+    assert result == [5]
+    assert state_file.read_text(encoding='utf-8') == '6'
+
+
+def test_rotation_invalid_state_restarts(flask_client, config, tmp_path):
+    """An unreadable cursor restarts the rotation at the beginning."""
+    config[api.SECTION_WEB]['mode'] = 'rotation'
+    state_file = tmp_path / 'rotation.state'
+    state_file.write_text('garbage', encoding='utf-8')
+    config[api.SECTION_WEB]['rotation_state_file'] = str(state_file)
+    client, quote_file = flask_client
+    quotes = api.read_quotes(_swap_quote_file(quote_file, 'quotes9.txt'))
+
+    assert client.get('/api').get_json()['quote'] == quotes[api.get_rotation_choice(len(quotes), 0)].quote
+    assert state_file.read_text(encoding='utf-8') == '1'
+
+
+def test_rotation_client_scope(flask_client, config, tmp_path):
+    """Client rotation keeps the cursor in a cookie or query parameter, not on disk."""
+    config[api.SECTION_WEB]['mode'] = 'rotation'
+    config[api.SECTION_WEB]['rotation_scope'] = 'client'
+    config[api.SECTION_WEB]['rotation_state_file'] = str(tmp_path / 'rotation.state')
+    client, quote_file = flask_client
+    quotes = api.read_quotes(_swap_quote_file(quote_file, 'quotes9.txt'))
+
+    first = client.get('/api').get_json()
+    cursor = first['cursor']
+    assert first['quote'] == quotes[api.get_rotation_choice(len(quotes), cursor - 1)].quote
+    shown = [first['quote']] + [client.get('/api').get_json()['quote'] for _ in quotes[1:]]
+    assert sorted(shown) == sorted(quote.quote for quote in quotes)
+    assert not (tmp_path / 'rotation.state').exists()
+
+    body = client.get('/api?cursor=42').get_json()
+    assert body['cursor'] == 43
+    assert body['quote'] == quotes[api.get_rotation_choice(len(quotes), 42)].quote
+
+
+def test_rotation_client_scope_not_cached(flask_client, config, tmp_path, monkeypatch):
+    """Responses that set the rotation cookie replace public caching headers with private, no-store."""
+    monkeypatch.setattr(web, '_header_fn', _cache_control_provider)
+    monkeypatch.setattr(web, '_header_loaded', True)
+    config[api.SECTION_WEB]['mode'] = 'rotation'
+    config[api.SECTION_WEB]['rotation_state_file'] = str(tmp_path / 'rotation.state')
+    client, quote_file = flask_client
+    assert client.get('/').headers['Cache-Control'].startswith('public, max-age=')
+
+    config[api.SECTION_WEB]['rotation_scope'] = 'client'
+    for path in ['/', '/api']:
+        rv = client.get(path)
+        assert 'jotquote_rotation=' in rv.headers['Set-Cookie']
+        assert rv.headers['Cache-Control'] == 'private, no-store'
+        assert 'Cookie' in rv.headers['Vary']
+
+
+def test_rotation_no_midnight_cap(flask_client, config, tmp_path):
+    """Rotation mode uses expiration_seconds without the midnight cap, like random mode."""
+    config[api.SECTION_WEB]['mode'] = 'rotation'
+    config[api.SECTION_WEB]['rotation_state_file'] = str(tmp_path / 'rotation.state')
+    now = datetime.datetime(2026, 3, 14, 23, 50, 0)
+    expiration_seconds, _ = web._compute_expiration(config, 'rotation', None, now)
+    assert expiration_seconds == 14400